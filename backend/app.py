@@ -1,11 +1,13 @@
 # SPDX-License-Identifier: MIT
 # © 2024–2025 Mark Lindon — BlueSphere
 from fastapi import FastAPI, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional, Union
 import os
 
-app = FastAPI(title="BlueSphere API", version="0.1.0", description="Status, stations, grids, and currents.")
+app = FastAPI(title="BlueSphere API", version="0.1.0", description="Status, stations, grids, and currents.",
+              default_response_class=ORJSONResponse)
 
 class DatasetStatus(BaseModel):
     name: str
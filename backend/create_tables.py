@@ -7,9 +7,10 @@ Creates all tables including temporal temperature data structures.
 
 import sys
 import argparse
+from sqlalchemy import text
 from backend.db import get_engine, Base
 from backend.models import (
-    Station, BuoyObs, JobRun,
+    Station, BuoyObs, JobRun, IngestState,
     # Temporal temperature models
     TemporalTemperatureGrid, TemporalTemperatureDaily,
     TemporalTemperatureMonthly, TemporalTemperatureYearly,
@@ -31,6 +32,10 @@ def create_tables(drop_existing=False):
         print("Dropping existing tables...")
         Base.metadata.drop_all(eng)
     
+    # Temporal tables carry PostGIS point columns for bbox queries
+    with eng.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
+    
     # Create all tables defined in models
     Base.metadata.create_all(eng)
     
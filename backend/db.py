@@ -20,7 +20,7 @@ _Session = None
 def get_engine():
     global _engine
     if _engine is None:
-        _engine = create_engine(db_url(), pool_pre_ping=True)
+        _engine = create_engine(db_url(), pool_size=20, max_overflow=10, pool_pre_ping=True, query_cache_size=1200)
     return _engine
 
 def get_session():
@@ -28,3 +28,11 @@ def get_session():
     if _Session is None:
         _Session = sessionmaker(bind=get_engine(), autoflush=False, autocommit=False)
     return _Session()
+
+def get_db():
+    """FastAPI dependency: one session per request, closed when the request ends"""
+    session = get_session()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,124 @@
+# SPDX-License-Identifier: MIT
+# © 2024–2025 Mark Lindon — BlueSphere
+"""
+Schema migrations for existing BlueSphere databases.
+create_tables (create_all) adds missing tables but never alters existing ones.
+Each step here brings existing tables up to backend/models.py and skips what is
+already applied, so the script is safe to re-run. All steps share one transaction.
+"""
+
+import sys
+import argparse
+from sqlalchemy import Table, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateIndex
+from backend.db import get_engine, Base
+from backend.models import (
+    BIN_POINT, EVENT_RANGE, SST_CENTI, GRID_C_VIEW, GRID_C_VIEW_SQL,
+    TemporalTemperatureGrid, MarineHeatwave
+)
+
+def _has_column(conn: Connection, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(conn).get_columns(table))
+
+def _create_indexes(conn: Connection, table: Table, names: set[str]) -> list[str]:
+    """Create the model's indexes in names that the table lacks; returns those created"""
+    existing = {i["name"] for i in inspect(conn).get_indexes(table.name)}
+    created = []
+    for index in table.indexes:
+        if index.name in names and index.name not in existing:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+            created.append(index.name)
+    return created
+
+def add_bin_geometry(conn: Connection) -> list[str]:
+    """geom point column generated from the 1° bins, and its GiST index, on the temporal aggregate tables"""
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
+    applied = []
+    for table in Base.metadata.sorted_tables:
+        if "geom" not in table.c or not inspect(conn).has_table(table.name):
+            continue
+        if not _has_column(conn, table.name, "geom"):
+            # Stored generated column: filled for every existing row by this rewrite
+            conn.execute(text(
+                f"ALTER TABLE {table.name} ADD COLUMN geom geometry(Point,4326) "
+                f"GENERATED ALWAYS AS ({BIN_POINT}) STORED"
+            ))
+            applied.append(f"{table.name}.geom")
+        for index in table.indexes:
+            if "geom" in index.columns and index.name not in {i["name"] for i in inspect(conn).get_indexes(table.name)}:
+                index.create(conn)
+                applied.append(index.name)
+    return applied
+
+def grid_sst_to_centi(conn: Connection) -> list[str]:
+    """temporal_temperature_grid.sst_c (double precision °C) to sst_centi_c (smallint hundredths), and the °C view"""
+    table = TemporalTemperatureGrid.__tablename__
+    if not inspect(conn).has_table(table):
+        return []
+    applied = []
+    if _has_column(conn, table, "sst_c"):
+        # One table rewrite; valid SST (-10..50 °C) is well inside smallint
+        conn.execute(text(
+            f"ALTER TABLE {table} ALTER COLUMN sst_c TYPE smallint USING round(sst_c * {SST_CENTI})"
+        ))
+        conn.execute(text(f"ALTER TABLE {table} RENAME COLUMN sst_c TO sst_centi_c"))
+        applied.append(f"{table}.sst_c -> sst_centi_c")
+    if GRID_C_VIEW not in inspect(conn).get_view_names():
+        conn.execute(text(GRID_C_VIEW_SQL))
+        applied.append(GRID_C_VIEW)
+    return applied
+
+def add_covering_indexes(conn: Connection) -> list[str]:
+    """(dataset, date DESC, bins) INCLUDE (payload) indexes behind the index-only temporal reads"""
+    applied = []
+    for table in Base.metadata.sorted_tables:
+        names = {i.name for i in table.indexes if i.name.endswith("_covering")}
+        if names and inspect(conn).has_table(table.name):
+            applied += _create_indexes(conn, table, names)
+    return applied
+
+def add_heatwave_event_range(conn: Connection) -> list[str]:
+    """marine_heatwave.event_range generated from the event dates, with the indexes behind the heatwave reads"""
+    table = MarineHeatwave.__table__
+    if not inspect(conn).has_table(table.name):
+        return []
+    applied = []
+    if not _has_column(conn, table.name, "event_range"):
+        conn.execute(text(
+            f"ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS event_range daterange "
+            f"GENERATED ALWAYS AS ({EVENT_RANGE}) STORED"
+        ))
+        applied.append(f"{table.name}.event_range")
+    return applied + _create_indexes(conn, table, {"idx_mhw_event_range", "idx_mhw_threshold_duration"})
+
+# In order of the schema changes they apply
+MIGRATIONS = [add_bin_geometry, add_covering_indexes, add_heatwave_event_range, grid_sst_to_centi]
+
+def migrate() -> list[str]:
+    """Run every migration; returns what was changed"""
+    applied = []
+    with get_engine().begin() as conn:
+        for step in MIGRATIONS:
+            applied += step(conn)
+    return applied
+
+def main():
+    parser = argparse.ArgumentParser(description="Bring an existing BlueSphere database up to the current schema")
+    parser.parse_args()
+
+    try:
+        applied = migrate()
+    except Exception as e:
+        print(f"Error migrating tables: {e}")
+        sys.exit(1)
+
+    if applied:
+        print("Applied:")
+        for change in applied:
+            print(f"  - {change}")
+    else:
+        print("Schema is up to date.")
+
+if __name__ == "__main__":
+    main()
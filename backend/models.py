@@ -1,11 +1,34 @@
 # SPDX-License-Identifier: MIT
 # © 2024–2025 Mark Lindon — BlueSphere
-from sqlalchemy import Column, Integer, Float, String, DateTime, UniqueConstraint, Index, Date, Boolean
+from sqlalchemy import Column, Integer, SmallInteger, Float, String, DateTime, UniqueConstraint, Index, Date, Boolean, Computed, DDL, event, text
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, DATERANGE
+from sqlalchemy.types import UserDefinedType
 import uuid
 from backend.db import Base
 
+class PointGeometry(UserDefinedType):
+    """PostGIS geometry(Point,4326) column type"""
+    cache_ok = True
+
+    def get_col_spec(self, **kw):
+        return "geometry(Point,4326)"
+
+# Generated from the grid bins so bbox filters can use a GiST index
+BIN_POINT = "ST_SetSRID(ST_MakePoint(lon_bin, lat_bin), 4326)"
+
+# Inclusive marine heatwave span, so date-overlap filters are a single GiST-indexed &&
+EVENT_RANGE = "daterange(start_date, end_date, '[]')"
+
+# Payload columns carried in the covering indexes below, so the
+# TemporalDataManager reads (dataset filter, date DESC order) are index-only scans
+AGGREGATE_INCLUDE = ["id", "avg_sst_c", "min_sst_c", "max_sst_c", "std_sst_c", "count"]
+
+# Grid SST is stored as smallint hundredths of a degree, the precision (and int16 packing)
+# of the source files: sst_c = sst_centi_c / SST_CENTI
+SST_CENTI = 100
+GRID_SST_C = f"sst_centi_c::float8 / {SST_CENTI}"
+
 class Station(Base):
     __tablename__ = "station"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -37,6 +60,13 @@ class JobRun(Base):
     finished_at: Mapped[str] = mapped_column(DateTime, nullable=True)
     note: Mapped[str] = mapped_column(String(512), default="")
 
+class IngestState(Base):
+    """Per-pipeline watermark of the latest source data already processed"""
+    __tablename__ = "ingest_state"
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    watermark: Mapped[Date] = mapped_column(Date, nullable=True)
+    updated_at: Mapped[str] = mapped_column(DateTime)
+
 # Temporal Temperature Data Models
 
 class TemporalTemperatureGrid(Base):
@@ -47,7 +77,7 @@ class TemporalTemperatureGrid(Base):
     date: Mapped[Date] = mapped_column(Date, index=True)
     lat: Mapped[float] = mapped_column(Float, index=True)
     lon: Mapped[float] = mapped_column(Float, index=True)
-    sst_c: Mapped[float] = mapped_column(Float, nullable=True)
+    sst_centi_c: Mapped[int] = mapped_column(SmallInteger, nullable=True)  # °C * SST_CENTI
     dataset: Mapped[str] = mapped_column(String(32), index=True)  # ERSST, OISST, etc.
     resolution: Mapped[str] = mapped_column(String(16))  # 2x2, 0.25x0.25, etc.
     quality_flag: Mapped[int] = mapped_column(Integer, default=0)
@@ -60,6 +90,18 @@ class TemporalTemperatureGrid(Base):
         Index("idx_temp_grid_dataset_date", "dataset", "date"),
     )
 
+# The grid with SST in °C, for ad-hoc SQL; created and dropped with the table
+GRID_C_VIEW = "temporal_temperature_grid_c"
+GRID_C_VIEW_SQL = (
+    f"CREATE VIEW {GRID_C_VIEW} AS "
+    f"SELECT id, date, lat, lon, {GRID_SST_C} AS sst_c, dataset, resolution, quality_flag, created_at "
+    "FROM temporal_temperature_grid"
+)
+event.listen(TemporalTemperatureGrid.__table__, "after_create",
+             DDL(GRID_C_VIEW_SQL).execute_if(dialect="postgresql"))
+event.listen(TemporalTemperatureGrid.__table__, "before_drop",
+             DDL(f"DROP VIEW IF EXISTS {GRID_C_VIEW}").execute_if(dialect="postgresql"))
+
 class TemporalTemperatureDaily(Base):
     """Daily aggregated temperature data"""
     __tablename__ = "temporal_temperature_daily"
@@ -74,11 +116,15 @@ class TemporalTemperatureDaily(Base):
     std_sst_c: Mapped[float] = mapped_column(Float, nullable=True)
     count: Mapped[int] = mapped_column(Integer)
     dataset: Mapped[str] = mapped_column(String(32), index=True)
+    geom: Mapped[str] = mapped_column(PointGeometry, Computed(BIN_POINT, persisted=True))
     
     __table_args__ = (
         UniqueConstraint("date", "lat_bin", "lon_bin", "dataset", name="uq_temp_daily_location"),
         Index("idx_temp_daily_spatial", "lat_bin", "lon_bin"),
         Index("idx_temp_daily_temporal", "date"),
+        Index("idx_temp_daily_geom", "geom", postgresql_using="gist"),
+        Index("idx_temp_daily_covering", "dataset", text("date DESC"), "lat_bin", "lon_bin",
+              postgresql_include=AGGREGATE_INCLUDE),
     )
 
 class TemporalTemperatureMonthly(Base):
@@ -96,11 +142,15 @@ class TemporalTemperatureMonthly(Base):
     std_sst_c: Mapped[float] = mapped_column(Float, nullable=True)
     count: Mapped[int] = mapped_column(Integer)
     dataset: Mapped[str] = mapped_column(String(32), index=True)
+    geom: Mapped[str] = mapped_column(PointGeometry, Computed(BIN_POINT, persisted=True))
     
     __table_args__ = (
         UniqueConstraint("year", "month", "lat_bin", "lon_bin", "dataset", name="uq_temp_monthly_location"),
         Index("idx_temp_monthly_spatial", "lat_bin", "lon_bin"),
         Index("idx_temp_monthly_temporal", "year", "month"),
+        Index("idx_temp_monthly_geom", "geom", postgresql_using="gist"),
+        Index("idx_temp_monthly_covering", "dataset", text("make_date(year, month, 1) DESC"), "lat_bin", "lon_bin",
+              postgresql_include=AGGREGATE_INCLUDE),
     )
 
 class TemporalTemperatureYearly(Base):
@@ -117,11 +167,15 @@ class TemporalTemperatureYearly(Base):
     std_sst_c: Mapped[float] = mapped_column(Float, nullable=True)
     count: Mapped[int] = mapped_column(Integer)
     dataset: Mapped[str] = mapped_column(String(32), index=True)
+    geom: Mapped[str] = mapped_column(PointGeometry, Computed(BIN_POINT, persisted=True))
     
     __table_args__ = (
         UniqueConstraint("year", "lat_bin", "lon_bin", "dataset", name="uq_temp_yearly_location"),
         Index("idx_temp_yearly_spatial", "lat_bin", "lon_bin"),
         Index("idx_temp_yearly_temporal", "year"),
+        Index("idx_temp_yearly_geom", "geom", postgresql_using="gist"),
+        Index("idx_temp_yearly_covering", "dataset", text("make_date(year, 1, 1) DESC"), "lat_bin", "lon_bin",
+              postgresql_include=AGGREGATE_INCLUDE),
     )
 
 class ClimateBaseline(Base):
@@ -156,11 +210,15 @@ class TemperatureAnomaly(Base):
     anomaly_c: Mapped[float] = mapped_column(Float)
     baseline_period: Mapped[str] = mapped_column(String(16))  # e.g., "1991-2020"
     dataset: Mapped[str] = mapped_column(String(32), index=True)
+    geom: Mapped[str] = mapped_column(PointGeometry, Computed(BIN_POINT, persisted=True))
     
     __table_args__ = (
         UniqueConstraint("date", "lat_bin", "lon_bin", "baseline_period", "dataset", name="uq_temp_anomaly"),
         Index("idx_temp_anomaly_spatial", "lat_bin", "lon_bin"),
         Index("idx_temp_anomaly_temporal", "date"),
+        Index("idx_temp_anomaly_geom", "geom", postgresql_using="gist"),
+        Index("idx_temp_anomaly_covering", "dataset", "baseline_period", text("date DESC"), "lat_bin", "lon_bin",
+              postgresql_include=["id", "anomaly_c"]),
     )
 
 class MarineHeatwave(Base):
@@ -178,9 +236,17 @@ class MarineHeatwave(Base):
     cumulative_intensity: Mapped[float] = mapped_column(Float)
     threshold_percentile: Mapped[int] = mapped_column(Integer, default=90)
     dataset: Mapped[str] = mapped_column(String(32), index=True)
+    geom: Mapped[str] = mapped_column(PointGeometry, Computed(BIN_POINT, persisted=True))
+    event_range: Mapped[str] = mapped_column(DATERANGE, Computed(EVENT_RANGE, persisted=True))
     
     __table_args__ = (
         Index("idx_mhw_spatial", "lat_bin", "lon_bin"),
         Index("idx_mhw_temporal", "start_date", "end_date"),
         Index("idx_mhw_duration", "duration_days"),
+        Index("idx_mhw_threshold_duration", "threshold_percentile", text("duration_days DESC")),
+        Index("idx_mhw_event_range", "event_range", postgresql_using="gist"),
+        Index("idx_mhw_geom", "geom", postgresql_using="gist"),
+        Index("idx_mhw_covering", "dataset", "threshold_percentile", text("start_date DESC"), "lat_bin", "lon_bin",
+              postgresql_include=["id", "end_date", "duration_days", "max_intensity_c",
+                                  "mean_intensity_c", "cumulative_intensity"]),
     )
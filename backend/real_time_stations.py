@@ -5,6 +5,7 @@ Real-time Global Ocean Station Network
 Comprehensive database of active monitoring stations with live data feeds
 """
 
+import functools
 import json
 import random
 import time
@@ -12,12 +13,99 @@ from datetime import datetime, timedelta
 from typing import Dict, List
 import numpy as np
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; see _gen_measurements_numpy below
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+# Explicit signature so compilation happens at import; cache=True keeps the
+# machine code in __pycache__ next to this module, shared by all workers.
+# Pressure is stored as fixed-point hPa*10 and wind direction as whole degrees,
+# both int16; wind direction uses -1 where the station has no anemometer.
+@njit('void(float32[::1], bool_[::1], bool_[::1], bool_[::1], int64, '
+      'float32[::1], float32[::1], int16[::1], float32[::1], '
+      'float32[::1], float32[::1], int16[::1], float32[::1])',
+      cache=True, parallel=True, fastmath=True)
+def _gen_measurements(lat, has_wave, has_wind, has_salinity, day_of_year,
+                      sst, air, pressure, wave_height, wave_period,
+                      wind_speed, wind_dir, salinity):
+    """Generate realistic current measurements for a batch of stations"""
+    seasonal_adj = np.float32(3.0 * np.sin(2.0 * np.pi * (day_of_year / 365.0)))
+    
+    for i in prange(lat.size):
+        # Base temperature influenced by latitude and season
+        base_temp = np.float32(25.0) - abs(lat[i]) * np.float32(0.4)  # Warmer near equator
+        
+        # Add realistic variations, then ensure realistic bounds
+        t = base_temp + seasonal_adj + np.float32(np.random.uniform(-2.0, 2.0))
+        t = min(np.float32(32.0), max(np.float32(-2.0), t))
+        
+        sst[i] = t
+        air[i] = t + np.float32(np.random.uniform(-5.0, 5.0))
+        pressure[i] = np.int16(np.random.randint(9950, 10251))
+        
+        # Optional measurements (NaN when the station lacks the sensor)
+        if has_wave[i]:
+            wave_height[i] = np.random.uniform(0.5, 6.0)
+            wave_period[i] = np.random.uniform(4.0, 15.0)
+        else:
+            wave_height[i] = np.nan
+            wave_period[i] = np.nan
+        
+        if has_wind[i]:
+            wind_speed[i] = np.random.uniform(0.0, 25.0)
+            wind_dir[i] = np.int16(np.random.randint(0, 361))
+        else:
+            wind_speed[i] = np.nan
+            wind_dir[i] = -1
+        
+        if has_salinity[i]:
+            salinity[i] = np.random.uniform(30.0, 38.0)
+        else:
+            salinity[i] = np.nan
+
+
+def _gen_measurements_numpy(lat, has_wave, has_wind, has_salinity, day_of_year,
+                            sst, air, pressure, wave_height, wave_period,
+                            wind_speed, wind_dir, salinity):
+    """Vectorized equivalent of _gen_measurements for installs without numba"""
+    n = lat.size
+    seasonal_adj = 3.0 * np.sin(2.0 * np.pi * (day_of_year / 365.0))
+    
+    np.multiply(np.abs(lat), -0.4, out=sst)
+    sst += 25.0 + seasonal_adj
+    sst += np.random.uniform(-2.0, 2.0, n)
+    np.clip(sst, -2.0, 32.0, out=sst)
+    
+    np.add(sst, np.random.uniform(-5.0, 5.0, n), out=air)
+    pressure[:] = np.random.randint(9950, 10251, n)
+    
+    wave_height[:] = np.where(has_wave, np.random.uniform(0.5, 6.0, n), np.nan)
+    wave_period[:] = np.where(has_wave, np.random.uniform(4.0, 15.0, n), np.nan)
+    wind_speed[:] = np.where(has_wind, np.random.uniform(0.0, 25.0, n), np.nan)
+    wind_dir[:] = np.where(has_wind, np.random.randint(0, 361, n), -1)
+    salinity[:] = np.where(has_salinity, np.random.uniform(30.0, 38.0, n), np.nan)
+
+
+if not NUMBA_AVAILABLE:
+    _gen_measurements = _gen_measurements_numpy
+
+
 class GlobalStationNetwork:
     """Real-time global ocean monitoring station network"""
     
     def __init__(self):
         self.stations = self._create_global_station_network()
+        self._init_measurement_arrays()
+        self._refresh_measurements(np.arange(len(self.stations)))
         self.last_update = datetime.now()
+        self._last_update_mono = time.monotonic()
     
     def _create_global_station_network(self) -> List[Dict]:
         """Create a comprehensive network of 500+ realistic monitoring stations"""
@@ -61,9 +149,6 @@ class GlobalStationNetwork:
                     'region': region
                 }
                 
-                # Add real-time measurements
-                station['current_data'] = self._generate_current_measurements(station)
-                
                 stations.append(station)
                 station_id += 1
         
@@ -110,24 +195,46 @@ class GlobalStationNetwork:
         recent_time = now - timedelta(minutes=random_minutes)
         return recent_time.isoformat()
     
-    def _generate_current_measurements(self, station: Dict) -> Dict:
-        """Generate realistic current measurements for a station"""
-        lat, lon = station['lat'], station['lon']
+    def _init_measurement_arrays(self):
+        """Lay out station inputs and latest measurements as contiguous columns"""
+        n = len(self.stations)
         
-        # Base temperature influenced by latitude and season
-        base_temp = 25 - (abs(lat) * 0.4)  # Warmer near equator
-        seasonal_adj = 3 * np.sin(2 * np.pi * (datetime.now().timetuple().tm_yday / 365))
+        self.active = np.array([s['active'] for s in self.stations], dtype=np.bool_)
+        self.lat = np.array([s['lat'] for s in self.stations], dtype=np.float32)
+        self.has_wave = np.array(['wave_height' in s['parameters'] for s in self.stations], dtype=np.bool_)
+        self.has_wind = np.array(['wind_speed' in s['parameters'] for s in self.stations], dtype=np.bool_)
+        self.has_salinity = np.array(['salinity' in s['parameters'] for s in self.stations], dtype=np.bool_)
         
-        # Add realistic variations
-        sst = base_temp + seasonal_adj + random.uniform(-2, 2)
+        self.sst = np.empty(n, np.float32)
+        self.air = np.empty(n, np.float32)
+        self.pressure = np.empty(n, np.int16)  # stored as hPa*10
+        self.wave_height = np.empty(n, np.float32)
+        self.wave_period = np.empty(n, np.float32)
+        self.wind_speed = np.empty(n, np.float32)
+        self.wind_dir = np.empty(n, np.int16)
+        self.salinity = np.empty(n, np.float32)
+    
+    def _refresh_measurements(self, idx: np.ndarray):
+        """Regenerate measurements for the stations at ``idx`` in one kernel call"""
+        columns = (self.sst, self.air, self.pressure, self.wave_height,
+                   self.wave_period, self.wind_speed, self.wind_dir, self.salinity)
+        out = [np.empty(idx.size, column.dtype) for column in columns]
+        
+        _gen_measurements(self.lat[idx], self.has_wave[idx], self.has_wind[idx],
+                          self.has_salinity[idx], datetime.now().timetuple().tm_yday, *out)
         
-        # Ensure realistic bounds
-        sst = max(-2, min(32, sst))
+        for column, values in zip(columns, out):
+            column[idx] = values
         
+        for i in idx.tolist():
+            self.stations[i]['current_data'] = self._current_measurements(i)
+    
+    def _current_measurements(self, i: int) -> Dict:
+        """Build the current measurements payload for station ``i``"""
         measurements = {
-            'sea_surface_temperature': round(sst, 2),
-            'air_temperature': round(sst + random.uniform(-5, 5), 2),
-            'barometric_pressure': round(random.uniform(995, 1025), 1),
+            'sea_surface_temperature': round(float(self.sst[i]), 2),
+            'air_temperature': round(float(self.air[i]), 2),
+            'barometric_pressure': int(self.pressure[i]) / 10.0,
             'timestamp': datetime.now().isoformat(),
             'quality_flags': {
                 'sst': random.choice([1, 1, 1, 2]),  # Mostly good quality
@@ -136,22 +243,30 @@ class GlobalStationNetwork:
         }
         
         # Add optional measurements
-        if 'wave_height' in station['parameters']:
-            measurements['wave_height'] = round(random.uniform(0.5, 6.0), 1)
-            measurements['wave_period'] = round(random.uniform(4, 15), 1)
+        if self.has_wave[i]:
+            measurements['wave_height'] = round(float(self.wave_height[i]), 1)
+            measurements['wave_period'] = round(float(self.wave_period[i]), 1)
         
-        if 'wind_speed' in station['parameters']:
-            measurements['wind_speed'] = round(random.uniform(0, 25), 1)
-            measurements['wind_direction'] = random.randint(0, 360)
+        if self.has_wind[i]:
+            measurements['wind_speed'] = round(float(self.wind_speed[i]), 1)
+            measurements['wind_direction'] = int(self.wind_dir[i])
         
-        if 'salinity' in station['parameters']:
-            measurements['salinity'] = round(random.uniform(30, 38), 2)
+        if self.has_salinity[i]:
+            measurements['salinity'] = round(float(self.salinity[i]), 2)
         
         return measurements
     
     def get_all_stations(self) -> Dict:
         """Get all stations with current status"""
         active_stations = [s for s in self.stations if s['active']]
+        
+        # Collect coverage in one pass; dict keys keep first-seen order
+        regions, providers, station_types = {}, {}, {}
+        for s in active_stations:
+            regions[s['region']] = None
+            providers[s['provider']] = None
+            station_types[s['type']] = None
+        
         return {
             'count': len(active_stations),
             'total_network': len(self.stations),
@@ -159,9 +274,9 @@ class GlobalStationNetwork:
             'stations': active_stations,
             'last_updated': datetime.now().isoformat(),
             'coverage': {
-                'regions': list(set(s['region'] for s in active_stations)),
-                'providers': list(set(s['provider'] for s in active_stations)),
-                'station_types': list(set(s['type'] for s in active_stations))
+                'regions': list(regions),
+                'providers': list(providers),
+                'station_types': list(station_types)
             }
         }
     
@@ -187,21 +302,29 @@ class GlobalStationNetwork:
     
     def update_real_time_data(self):
         """Update real-time data for all active stations"""
-        for station in self.stations:
-            if station['active'] and random.random() > 0.3:  # 70% get updates
-                station['current_data'] = self._generate_current_measurements(station)
-                station['last_update'] = datetime.now().isoformat()
+        # 70% of active stations get updates
+        updated = np.flatnonzero(self.active & (np.random.random(self.active.size) > 0.3))
+        self._refresh_measurements(updated)
+        
+        now = datetime.now().isoformat()
+        for i in updated.tolist():
+            self.stations[i]['last_update'] = now
         
         self.last_update = datetime.now()
-        print(f"🔄 Updated {sum(1 for s in self.stations if s['active'])} active stations")
+        self._last_update_mono = time.monotonic()
+        print(f"🔄 Updated {int(self.active.sum())} active stations")
 
-# Global station network instance
-global_stations = GlobalStationNetwork()
+@functools.cache
+def get_global_stations() -> GlobalStationNetwork:
+    """Global station network instance, built on first use"""
+    return GlobalStationNetwork()
 
 def get_station_data():
     """Main function to get comprehensive station data"""
+    global_stations = get_global_stations()
+    
     # Update data periodically
-    if (datetime.now() - global_stations.last_update).seconds > 300:  # 5 minutes
+    if time.monotonic() - global_stations._last_update_mono > 300:  # 5 minutes
         global_stations.update_real_time_data()
     
     return global_stations.get_all_stations()
@@ -5,23 +5,33 @@ Temporal temperature API endpoints for the BlueSphere ocean monitoring platform.
 Provides comprehensive access to historical temperature data, anomalies, and marine heatwaves.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Iterator, AsyncIterator
 from datetime import date, datetime, timedelta
+from datetime import date as date_  # field annotations; `date` is also a field name
 from fastapi import APIRouter, Query, HTTPException, Depends
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 from pydantic import BaseModel, Field
 import redis
-import json
+from redis.asyncio import Redis, ConnectionPool
+import orjson
+import re
+import uuid
 from functools import lru_cache
+from itertools import chain
 
-from backend.temporal_db import temporal_data_manager, TemporalDataManager
+from sqlalchemy.orm import Session
+from backend.db import get_db, get_session
+from backend.temporal_db import TemporalDataManager
 
-router = APIRouter(prefix="/temporal", tags=["temporal"])
+router = APIRouter(prefix="/temporal", tags=["temporal"], default_response_class=ORJSONResponse)
 
 # Pydantic models for API responses
 class TemperatureDataPoint(BaseModel):
     """Single temperature data point"""
     id: str
-    date: str
+    date: date_
     lat: float
     lon: float
     sst_c: Optional[float] = None
@@ -43,11 +53,12 @@ class TemperatureResponse(BaseModel):
     bbox: Optional[List[float]] = None
     dataset: Optional[str] = None
     data: List[TemperatureDataPoint]
+    next_cursor: Optional[str] = None
     
 class AnomalyDataPoint(BaseModel):
     """Single temperature anomaly data point"""
     id: str
-    date: str
+    date: date_
     lat: float
     lon: float
     anomaly_c: float
@@ -62,12 +73,13 @@ class AnomalyResponse(BaseModel):
     end_date: str
     bbox: Optional[List[float]] = None
     data: List[AnomalyDataPoint]
+    next_cursor: Optional[str] = None
 
 class HeatwaveEvent(BaseModel):
     """Marine heatwave event"""
     id: str
-    start_date: str
-    end_date: str
+    start_date: date_
+    end_date: date_
     duration_days: int
     lat: float
     lon: float
@@ -86,20 +98,23 @@ class HeatwaveResponse(BaseModel):
     threshold_percentile: int
     bbox: Optional[List[float]] = None
     events: List[HeatwaveEvent]
+    next_cursor: Optional[str] = None
 
 class DataAvailability(BaseModel):
     """Data availability summary"""
     dataset: str
     resolution: str
-    start_date: Optional[str] = None
-    end_date: Optional[str] = None
+    start_date: Optional[date_] = None
+    end_date: Optional[date_] = None
     total_records: int
     spatial_bounds: Optional[Dict[str, float]] = None
 
 # Cache for expensive queries
+# Probe once with a blocking ping; handlers use the pooled asyncio client
 try:
-    redis_client = redis.Redis(host='localhost', port=6379, decode_responses=True)
-    redis_client.ping()
+    redis.Redis(host='localhost', port=6379).ping()
+    redis_pool = ConnectionPool(host='localhost', port=6379, max_connections=32, decode_responses=False)
+    redis_client = Redis(connection_pool=redis_pool)
     CACHE_ENABLED = True
 except:
     redis_client = None
@@ -110,48 +125,130 @@ def get_cache_key(endpoint: str, **kwargs) -> str:
     params = "&".join([f"{k}={v}" for k, v in sorted(kwargs.items()) if v is not None])
     return f"bluesphere:temporal:{endpoint}:{hash(params)}"
 
-def get_cached_result(cache_key: str, ttl: int = 3600):
+async def get_cached_result(cache_key: str, ttl: int = 3600):
     """Get cached result if available"""
     if not CACHE_ENABLED:
         return None
     
     try:
-        cached = redis_client.get(cache_key)
+        cached = await redis_client.get(cache_key)
         if cached:
-            return json.loads(cached)
+            return orjson.loads(cached)
     except:
         pass
     return None
 
-def set_cached_result(cache_key: str, data: Any, ttl: int = 3600):
+async def set_cached_result(cache_key: str, data: Any, ttl: int = 3600):
     """Cache result with TTL"""
     if not CACHE_ENABLED:
         return
     
     try:
-        redis_client.setex(cache_key, ttl, json.dumps(data, default=str))
+        await redis_client.setex(cache_key, ttl, orjson.dumps(data, default=str))
     except:
         pass
 
+_BBOX_RE = re.compile(
+    r'^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*,'
+    r'\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$'
+)
+
+@lru_cache(maxsize=1024)
 def parse_bbox(bbox_str: str) -> tuple:
     """Parse bbox string to tuple of floats"""
+    m = _BBOX_RE.match(bbox_str)
+    if m is None:
+        raise HTTPException(status_code=400, detail="Invalid bbox format: expected min_lon,min_lat,max_lon,max_lat")
+    min_lon, min_lat, max_lon, max_lat = map(float, m.groups())
+    
+    # Validate coordinate ranges and ordering in one pass
+    if not (-180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid bbox format: longitude must be within -180..180, latitude within -90..90, and min values less than max values"
+        )
+    
+    return min_lon, min_lat, max_lon, max_lat
+
+def parse_datasets(dataset: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated dataset filter so several datasets share one query"""
+    if not dataset:
+        return None
+    return [name.strip() for name in dataset.split(",") if name.strip()] or None
+
+def _stream_json(meta: Dict[str, Any], records: Iterable[Dict[str, Any]],
+                 fields: tuple, key: str = "data", limit: Optional[int] = None) -> Iterator[bytes]:
+    """Stream a JSON object with its record array encoded one record at a time.
+
+    ``count`` (and ``next_cursor`` when ``limit`` is given) is written after
+    the array so ``records`` may be a generator.
+    """
+    yield orjson.dumps(meta)[:-1] + b',"' + key.encode() + b'":['
+    count = 0
+    item = None
+    for item in records:
+        chunk = orjson.dumps({k: item.get(k) for k in fields})
+        yield chunk if count == 0 else b"," + chunk
+        count += 1
+    tail = b'],"count":' + str(count).encode()
+    if limit is not None:
+        tail += b',"next_cursor":' + orjson.dumps(_next_cursor(item, count, limit))
+    yield tail + b"}"
+
+async def _cache_stream(chunks: Iterator[bytes], cache_key: str, ttl: int = 3600) -> AsyncIterator[bytes]:
+    """Pass streamed chunks through and cache the complete body once sent"""
+    body = []
+    async for chunk in iterate_in_threadpool(chunks):
+        body.append(chunk)
+        yield chunk
     try:
-        coords = [float(x.strip()) for x in bbox_str.split(",")]
-        if len(coords) != 4:
-            raise ValueError("BBox must have 4 coordinates")
-        min_lon, min_lat, max_lon, max_lat = coords
-        
-        # Validate coordinate ranges
-        if not (-90 <= min_lat <= 90 and -90 <= max_lat <= 90):
-            raise ValueError("Latitude must be between -90 and 90")
-        if not (-180 <= min_lon <= 180 and -180 <= max_lon <= 180):
-            raise ValueError("Longitude must be between -180 and 180")
-        if min_lat >= max_lat or min_lon >= max_lon:
-            raise ValueError("Invalid bounding box: min values must be less than max values")
-            
-        return min_lon, min_lat, max_lon, max_lat
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Invalid bbox format: {str(e)}")
+        await redis_client.setex(cache_key, ttl, b"".join(body))
+    except:
+        pass
+
+_TEMPERATURE_FIELDS = tuple(TemperatureDataPoint.model_fields)
+
+def _parse_cursor(cursor: str) -> tuple:
+    """Parse a 'YYYY-MM-DD|id' keyset cursor"""
+    try:
+        cursor_date, cursor_id = cursor.split("|", 1)
+        # Ids are UUIDs; an unchecked id would reach the keyset comparison
+        return _parse_iso_date(cursor_date), str(uuid.UUID(cursor_id))
+    except ValueError:
+        # Endpoints map ValueError to a 400 response
+        raise ValueError("Invalid cursor: expected next_cursor from a previous page")
+
+def _next_cursor(last: Optional[Dict[str, Any]], count: int, limit: int, date_key: str = "date") -> Optional[str]:
+    """Cursor for the page after ``last``, or None when this page was the final one"""
+    if last is None or count < limit:
+        return None
+    return f"{last[date_key]}|{last['id']}"
+
+@lru_cache(maxsize=4096)
+def _parse_iso_date(date_str: str) -> date:
+    """Parse a YYYY-MM-DD string to a date"""
+    return datetime.strptime(date_str, "%Y-%m-%d").date()
+
+def get_data_manager(db: Session = Depends(get_db)) -> TemporalDataManager:
+    """Data manager bound to the request's own database session"""
+    return TemporalDataManager(db)
+
+def get_streaming_data_manager() -> TemporalDataManager:
+    """Data manager whose session the endpoint closes itself.
+
+    Streamed bodies are read from a server-side cursor after the endpoint
+    returns, so the session must outlive request-scoped dependencies: it is
+    closed by a background task once the response is sent, or right away
+    when the endpoint returns anything else.
+    """
+    return TemporalDataManager(get_session())
+
+_NO_RECORD = object()
+
+def _started(records: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Advance a lazy query to its first record, so it runs (and can fail) before the response starts"""
+    first = next(records, _NO_RECORD)
+    return records if first is _NO_RECORD else chain((first,), records)
 
 @router.get("/temperatures", response_model=TemperatureResponse)
 async def get_temperatures(
@@ -159,10 +256,11 @@ async def get_temperatures(
     end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
     resolution: str = Query("monthly", description="Data resolution: daily, monthly, yearly, grid"),
     bbox: Optional[str] = Query(None, description="Bounding box: min_lon,min_lat,max_lon,max_lat"),
-    dataset: Optional[str] = Query(None, description="Dataset filter (ERSST, OISST, etc.)"),
+    dataset: Optional[str] = Query(None, description="Dataset filter, comma-separated for several (ERSST,OISST)"),
     limit: int = Query(5000, ge=1, le=10000, description="Maximum number of records"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
-    data_manager: TemporalDataManager = Depends(lambda: temporal_data_manager)
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor of the previous page); replaces offset"),
+    data_manager: TemporalDataManager = Depends(get_streaming_data_manager)
 ):
     """
     Retrieve historical temperature data with date range and spatial filtering.
@@ -171,65 +269,78 @@ async def get_temperatures(
     - **end_date**: End date for data query (YYYY-MM-DD format)  
     - **resolution**: Data resolution (daily, monthly, yearly, grid)
     - **bbox**: Optional bounding box (min_lon,min_lat,max_lon,max_lat)
-    - **dataset**: Optional dataset filter
+    - **dataset**: Optional dataset filter; comma-separate to query several at once
     - **limit**: Maximum records to return (1-10000)
     - **offset**: Offset for pagination
+    - **cursor**: Keyset cursor from the previous page's next_cursor (faster than offset for deep pages)
     """
     
     # Cache key for this request
     cache_key = get_cache_key("temperatures", 
                              start_date=start_date, end_date=end_date,
                              resolution=resolution, bbox=bbox, dataset=dataset,
-                             limit=limit, offset=offset)
-    
-    # Check cache first
-    cached_result = get_cached_result(cache_key)
-    if cached_result:
-        return cached_result
+                             limit=limit, offset=offset, cursor=cursor)
     
+    streaming = False
     try:
+        # Check cache first
+        cached_result = await get_cached_result(cache_key)
+        if cached_result:
+            return cached_result
+        
         # Parse dates
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
+        start_dt = _parse_iso_date(start_date)
+        end_dt = _parse_iso_date(end_date)
         
         if start_dt > end_dt:
             raise HTTPException(status_code=400, detail="Start date must be before end date")
         
-        # Parse bbox if provided
+        # Parse bbox and keyset cursor if provided
         bbox_coords = None
         if bbox:
             bbox_coords = parse_bbox(bbox)
+        cursor_key = _parse_cursor(cursor) if cursor else None
         
-        # Query data
-        data = data_manager.get_temperature_data(
+        # Query data; rows are read from a server-side cursor while streaming. The query
+        # is run here, so its errors become the responses below instead of a cut-off body
+        data = await run_in_threadpool(_started, data_manager.iter_temperature_data(
             start_date=start_dt,
             end_date=end_dt,
             bbox=bbox_coords,
-            dataset=dataset,
+            dataset=parse_datasets(dataset),
             resolution=resolution,
             limit=limit,
-            offset=offset
-        )
+            offset=offset,
+            cursor=cursor_key
+        ))
         
-        response = TemperatureResponse(
-            count=len(data),
-            resolution=resolution,
-            start_date=start_date,
-            end_date=end_date,
-            bbox=list(bbox_coords) if bbox_coords else None,
-            dataset=dataset,
-            data=[TemperatureDataPoint(**item) for item in data]
-        )
+        meta = {
+            "resolution": resolution,
+            "start_date": start_date,
+            "end_date": end_date,
+            "bbox": list(bbox_coords) if bbox_coords else None,
+            "dataset": dataset,
+        }
+        chunks = _stream_json(meta, data, _TEMPERATURE_FIELDS, limit=limit)
         
-        # Cache result for 1 hour
-        set_cached_result(cache_key, response.dict(), ttl=3600)
+        # Stream the body; when caching is on it is stored for 1 hour once sent
+        if CACHE_ENABLED:
+            chunks = _cache_stream(chunks, cache_key, ttl=3600)
         
+        response = StreamingResponse(chunks, media_type="application/json",
+                                     background=BackgroundTask(data_manager.close))
+        streaming = True
         return response
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    finally:
+        if not streaming:
+            data_manager.close()
 
 @router.get("/anomalies", response_model=AnomalyResponse)
 async def get_temperature_anomalies(
@@ -237,11 +348,12 @@ async def get_temperature_anomalies(
     end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
     baseline: str = Query("1991-2020", description="Baseline period (YYYY-YYYY)"),
     bbox: Optional[str] = Query(None, description="Bounding box: min_lon,min_lat,max_lon,max_lat"),
-    dataset: Optional[str] = Query(None, description="Dataset filter"),
+    dataset: Optional[str] = Query(None, description="Dataset filter, comma-separated for several"),
     threshold: Optional[float] = Query(None, description="Minimum anomaly threshold (absolute value)"),
     limit: int = Query(5000, ge=1, le=10000, description="Maximum number of records"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
-    data_manager: TemporalDataManager = Depends(lambda: temporal_data_manager)
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor of the previous page); replaces offset"),
+    data_manager: TemporalDataManager = Depends(get_data_manager)
 ):
     """
     Retrieve temperature anomaly data calculated against climate baselines.
@@ -250,25 +362,26 @@ async def get_temperature_anomalies(
     - **end_date**: End date for anomaly data
     - **baseline**: Baseline period for anomaly calculation (e.g., "1991-2020")
     - **bbox**: Optional bounding box
-    - **dataset**: Optional dataset filter
+    - **dataset**: Optional dataset filter; comma-separate to query several at once
     - **threshold**: Optional minimum anomaly threshold (°C)
     - **limit**: Maximum records to return
     - **offset**: Offset for pagination
+    - **cursor**: Keyset cursor from the previous page's next_cursor (faster than offset for deep pages)
     """
     
     cache_key = get_cache_key("anomalies",
                              start_date=start_date, end_date=end_date,
                              baseline=baseline, bbox=bbox, dataset=dataset,
-                             threshold=threshold, limit=limit, offset=offset)
+                             threshold=threshold, limit=limit, offset=offset, cursor=cursor)
     
-    cached_result = get_cached_result(cache_key)
+    cached_result = await get_cached_result(cache_key)
     if cached_result:
         return cached_result
     
     try:
         # Parse dates
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
+        start_dt = _parse_iso_date(start_date)
+        end_dt = _parse_iso_date(end_date)
         
         if start_dt > end_dt:
             raise HTTPException(status_code=400, detail="Start date must be before end date")
@@ -277,10 +390,11 @@ async def get_temperature_anomalies(
         if not baseline.count('-') == 1:
             raise HTTPException(status_code=400, detail="Baseline must be in format YYYY-YYYY")
         
-        # Parse bbox if provided
+        # Parse bbox and keyset cursor if provided
         bbox_coords = None
         if bbox:
             bbox_coords = parse_bbox(bbox)
+        cursor_key = _parse_cursor(cursor) if cursor else None
         
         # Query data
         data = data_manager.get_temperature_anomalies(
@@ -288,23 +402,25 @@ async def get_temperature_anomalies(
             end_date=end_dt,
             baseline=baseline,
             bbox=bbox_coords,
-            dataset=dataset,
+            dataset=parse_datasets(dataset),
             threshold=threshold,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor_key
         )
         
-        response = AnomalyResponse(
+        response = AnomalyResponse.model_construct(
             count=len(data),
             baseline_period=baseline,
             start_date=start_date,
             end_date=end_date,
             bbox=list(bbox_coords) if bbox_coords else None,
-            data=[AnomalyDataPoint(**item) for item in data]
+            data=[AnomalyDataPoint.model_construct(**item) for item in data],
+            next_cursor=_next_cursor(data[-1] if data else None, len(data), limit)
         )
         
         # Cache result for 1 hour
-        set_cached_result(cache_key, response.dict(), ttl=3600)
+        await set_cached_result(cache_key, response.dict(), ttl=3600)
         
         return response
         
@@ -320,10 +436,11 @@ async def get_marine_heatwaves(
     bbox: Optional[str] = Query(None, description="Bounding box: min_lon,min_lat,max_lon,max_lat"),
     threshold: int = Query(90, ge=85, le=99, description="Temperature percentile threshold (85-99)"),
     duration: int = Query(5, ge=3, le=365, description="Minimum duration in days"),
-    dataset: Optional[str] = Query(None, description="Dataset filter"),
+    dataset: Optional[str] = Query(None, description="Dataset filter, comma-separated for several"),
     limit: int = Query(1000, ge=1, le=5000, description="Maximum number of events"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
-    data_manager: TemporalDataManager = Depends(lambda: temporal_data_manager)
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor of the previous page); replaces offset"),
+    data_manager: TemporalDataManager = Depends(get_data_manager)
 ):
     """
     Retrieve marine heatwave events detected from temperature data.
@@ -333,32 +450,34 @@ async def get_marine_heatwaves(
     - **bbox**: Optional bounding box
     - **threshold**: Temperature percentile threshold (85-99)
     - **duration**: Minimum duration in days (3-365)
-    - **dataset**: Optional dataset filter
+    - **dataset**: Optional dataset filter; comma-separate to query several at once
     - **limit**: Maximum events to return
     - **offset**: Offset for pagination
+    - **cursor**: Keyset cursor from the previous page's next_cursor (faster than offset for deep pages)
     """
     
     cache_key = get_cache_key("heatwaves",
                              start_date=start_date, end_date=end_date,
                              bbox=bbox, threshold=threshold, duration=duration,
-                             dataset=dataset, limit=limit, offset=offset)
+                             dataset=dataset, limit=limit, offset=offset, cursor=cursor)
     
-    cached_result = get_cached_result(cache_key)
+    cached_result = await get_cached_result(cache_key)
     if cached_result:
         return cached_result
     
     try:
         # Parse dates
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
+        start_dt = _parse_iso_date(start_date)
+        end_dt = _parse_iso_date(end_date)
         
         if start_dt > end_dt:
             raise HTTPException(status_code=400, detail="Start date must be before end date")
         
-        # Parse bbox if provided
+        # Parse bbox and keyset cursor if provided
         bbox_coords = None
         if bbox:
             bbox_coords = parse_bbox(bbox)
+        cursor_key = _parse_cursor(cursor) if cursor else None
         
         # Query data
         data = data_manager.get_marine_heatwaves(
@@ -367,23 +486,25 @@ async def get_marine_heatwaves(
             bbox=bbox_coords,
             min_duration=duration,
             threshold_percentile=threshold,
-            dataset=dataset,
+            dataset=parse_datasets(dataset),
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor_key
         )
         
-        response = HeatwaveResponse(
+        response = HeatwaveResponse.model_construct(
             count=len(data),
             start_date=start_date,
             end_date=end_date,
             min_duration=duration,
             threshold_percentile=threshold,
             bbox=list(bbox_coords) if bbox_coords else None,
-            events=[HeatwaveEvent(**item) for item in data]
+            events=[HeatwaveEvent.model_construct(**item) for item in data],
+            next_cursor=_next_cursor(data[-1] if data else None, len(data), limit, "start_date")
         )
         
         # Cache result for 2 hours (heatwave data changes less frequently)
-        set_cached_result(cache_key, response.dict(), ttl=7200)
+        await set_cached_result(cache_key, response.dict(), ttl=7200)
         
         return response
         
@@ -396,7 +517,7 @@ async def get_marine_heatwaves(
 async def get_data_availability(
     dataset: Optional[str] = Query(None, description="Filter by dataset"),
     resolution: str = Query("monthly", description="Data resolution"),
-    data_manager: TemporalDataManager = Depends(lambda: temporal_data_manager)
+    data_manager: TemporalDataManager = Depends(get_data_manager)
 ):
     """
     Get data availability summary for temporal temperature datasets.
@@ -407,7 +528,7 @@ async def get_data_availability(
     
     cache_key = get_cache_key("availability", dataset=dataset, resolution=resolution)
     
-    cached_result = get_cached_result(cache_key)
+    cached_result = await get_cached_result(cache_key)
     if cached_result:
         return cached_result
     
@@ -425,7 +546,7 @@ async def get_data_availability(
             )
         
         # Cache result for 6 hours (availability changes infrequently)
-        set_cached_result(cache_key, [item.dict() for item in availability], ttl=21600)
+        await set_cached_result(cache_key, [item.dict() for item in availability], ttl=21600)
         
         return availability
         
@@ -437,9 +558,9 @@ async def get_temporal_summary(
     start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
     end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
     bbox: Optional[str] = Query(None, description="Bounding box: min_lon,min_lat,max_lon,max_lat"),
-    dataset: Optional[str] = Query(None, description="Dataset filter"),
+    dataset: Optional[str] = Query(None, description="Dataset filter, comma-separated for several"),
     resolution: str = Query("monthly", description="Data resolution"),
-    data_manager: TemporalDataManager = Depends(lambda: temporal_data_manager)
+    data_manager: TemporalDataManager = Depends(get_data_manager)
 ):
     """
     Get statistical summary of temperature data for a region and time period.
@@ -452,14 +573,14 @@ async def get_temporal_summary(
                              start_date=start_date, end_date=end_date,
                              bbox=bbox, dataset=dataset, resolution=resolution)
     
-    cached_result = get_cached_result(cache_key, ttl=1800)  # 30 min cache
+    cached_result = await get_cached_result(cache_key, ttl=1800)  # 30 min cache
     if cached_result:
         return cached_result
     
     try:
         # Parse dates and bbox
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
+        start_dt = _parse_iso_date(start_date)
+        end_dt = _parse_iso_date(end_date)
         
         bbox_coords = None
         if bbox:
@@ -470,7 +591,7 @@ async def get_temporal_summary(
             start_date=start_dt,
             end_date=end_dt,
             bbox=bbox_coords,
-            dataset=dataset,
+            dataset=parse_datasets(dataset),
             resolution=resolution,
             limit=10000  # Large limit for stats
         )
@@ -521,7 +642,7 @@ async def get_temporal_summary(
         }
         
         # Cache for 30 minutes
-        set_cached_result(cache_key, summary, ttl=1800)
+        await set_cached_result(cache_key, summary, ttl=1800)
         
         return summary
         
@@ -535,10 +656,19 @@ async def clear_cache():
         return {"message": "Cache not enabled"}
     
     try:
-        keys = redis_client.keys("bluesphere:temporal:*")
-        if keys:
-            redis_client.delete(*keys)
-            return {"message": f"Cleared {len(keys)} cached results"}
+        # Incremental SCAN + UNLINK instead of KEYS/DEL so Redis never stalls
+        cursor = 0
+        total = 0
+        while True:
+            cursor, batch = await redis_client.scan(cursor, match="bluesphere:temporal:*", count=1000)
+            if batch:
+                await redis_client.unlink(*batch)
+                total += len(batch)
+            if cursor == 0:
+                break
+        
+        if total:
+            return {"message": f"Cleared {total} cached results"}
         else:
             return {"message": "No cached results to clear"}
     except Exception as e:
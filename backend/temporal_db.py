@@ -5,13 +5,14 @@ Temporal temperature database operations and aggregation functions.
 Provides efficient querying, aggregation, and analysis of historical temperature data.
 """
 
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Iterator, Sequence, Union
 from datetime import datetime, date, timedelta
-from sqlalchemy import select, func, and_, or_, desc, asc, text
+from sqlalchemy import select, func, and_, or_, desc, asc, text, bindparam, literal_column, tuple_
 from sqlalchemy.orm import Session
+from sqlalchemy.types import Date, Float
 from sqlalchemy.dialects.postgresql import insert
 
-from backend.db import get_session
+from backend.db import get_engine, get_session
 from backend.models import (
     TemporalTemperatureGrid, 
     TemporalTemperatureDaily,
@@ -19,27 +20,221 @@ from backend.models import (
     TemporalTemperatureYearly,
     ClimateBaseline, 
     TemperatureAnomaly, 
-    MarineHeatwave
+    MarineHeatwave,
+    IngestState,
+    SST_CENTI
 )
 import numpy as np
-from functools import lru_cache
+import pandas as pd
+from cachetools import TTLCache
+from itertools import product
+from concurrent.futures import ThreadPoolExecutor
+
+
+_daily = TemporalTemperatureDaily.__table__.c
+_monthly = TemporalTemperatureMonthly.__table__.c
+_yearly = TemporalTemperatureYearly.__table__.c
+_grid = TemporalTemperatureGrid.__table__.c
+_anomaly = TemperatureAnomaly.__table__.c
+_heatwave = MarineHeatwave.__table__.c
+
+# Core column lists per read path; labels match the API response field names,
+# so rows serialize without touching the ORM
+_ONE = literal_column("1")
+# Grid SST is stored as smallint hundredths of a degree and served in °C
+_GRID_SST_C = (_grid.sst_centi_c.cast(Float) / literal_column(str(SST_CENTI), Float)).label('sst_c')
+_AGGREGATE_FIELDS = ('avg_sst_c', 'min_sst_c', 'max_sst_c', 'std_sst_c', 'count')
+
+_ANOMALY_COLUMNS = (
+    _anomaly.id, _anomaly.date, _anomaly.lat_bin.label('lat'), _anomaly.lon_bin.label('lon'),
+    _anomaly.anomaly_c, _anomaly.baseline_period, _anomaly.dataset
+)
+
+_HEATWAVE_COLUMNS = (
+    _heatwave.id, _heatwave.start_date, _heatwave.end_date, _heatwave.duration_days,
+    _heatwave.lat_bin.label('lat'), _heatwave.lon_bin.label('lon'),
+    _heatwave.max_intensity_c, _heatwave.mean_intensity_c, _heatwave.cumulative_intensity,
+    _heatwave.threshold_percentile, _heatwave.dataset
+)
+
+
+def _temperature_source(resolution: str):
+    """Return (table, date expression, columns) for a temperature resolution.
+    
+    Columns are ordered id, date, lat, lon, ... so callers can filter on
+    columns[2] / columns[3] regardless of resolution.
+    """
+    if resolution == "daily":
+        c, date_col = _daily, _daily.date
+    elif resolution == "monthly":
+        # For monthly, construct date from year and month; literals (not bind
+        # params) so the expression matches idx_temp_monthly_covering
+        c, date_col = _monthly, func.make_date(_monthly.year, _monthly.month, _ONE)
+    elif resolution == "yearly":
+        c, date_col = _yearly, func.make_date(_yearly.year, _ONE, _ONE)
+    else:
+        # Raw grid data
+        return TemporalTemperatureGrid.__table__, _grid.date, (
+            _grid.id, _grid.date, _grid.lat, _grid.lon, _GRID_SST_C, _grid.resolution,
+            _grid.quality_flag, _grid.created_at, _grid.dataset
+        )
+    
+    return c.id.table, date_col, (
+        c.id, date_col.label('date'), c.lat_bin.label('lat'), c.lon_bin.label('lon'),
+        *(c[name] for name in _AGGREGATE_FIELDS), c.dataset
+    )
+
+
+def _bbox_clause(geom_col):
+    """Bounding-box filter on a PostGIS point column, served by its GiST index"""
+    envelope = func.ST_MakeEnvelope(
+        bindparam('min_lon'), bindparam('min_lat'), bindparam('max_lon'), bindparam('max_lat'), 4326
+    )
+    return func.ST_Intersects(geom_col, envelope)
+
+
+def _latlon_bbox_clause(lat_col, lon_col):
+    return and_(
+        lat_col >= bindparam('min_lat'),
+        lat_col <= bindparam('max_lat'),
+        lon_col >= bindparam('min_lon'),
+        lon_col <= bindparam('max_lon')
+    )
+
+
+def _paginate(query, order_col, id_col, has_cursor: bool):
+    """Order by (order_col, id) descending; keyset-seek past a cursor or fall back to OFFSET"""
+    query = query.order_by(order_col.desc(), id_col.desc()).limit(bindparam('limit'))
+    if has_cursor:
+        cursor = tuple_(bindparam('cursor_date', type_=Date), bindparam('cursor_id', type_=id_col.type))
+        return query.where(tuple_(order_col, id_col) < cursor)
+    return query.offset(bindparam('offset'))
+
+
+def _build_temperature_query(resolution: str, has_bbox: bool, has_dataset: bool, has_cursor: bool):
+    table, date_col, columns = _temperature_source(resolution)
+    
+    query = select(*columns).where(
+        date_col >= bindparam('start_date'),
+        date_col <= bindparam('end_date')
+    )
+    if has_bbox:
+        if 'geom' in table.c:
+            query = query.where(_bbox_clause(table.c.geom))
+        else:
+            # Raw grid rows carry no geometry column
+            query = query.where(_latlon_bbox_clause(columns[2], columns[3]))
+    if has_dataset:
+        query = query.where(table.c.dataset.in_(bindparam('datasets', expanding=True)))
+    
+    return _paginate(query, date_col, table.c.id, has_cursor)
+
+
+def _build_anomaly_query(has_bbox: bool, has_dataset: bool, has_threshold: bool, has_cursor: bool):
+    query = select(*_ANOMALY_COLUMNS).where(
+        _anomaly.date >= bindparam('start_date'),
+        _anomaly.date <= bindparam('end_date'),
+        _anomaly.baseline_period == bindparam('baseline')
+    )
+    if has_bbox:
+        query = query.where(_bbox_clause(_anomaly.geom))
+    if has_dataset:
+        query = query.where(_anomaly.dataset.in_(bindparam('datasets', expanding=True)))
+    if has_threshold:
+        query = query.where(func.abs(_anomaly.anomaly_c) >= bindparam('threshold'))
+    
+    return _paginate(query, _anomaly.date, _anomaly.id, has_cursor)
+
+
+def _build_heatwave_query(has_bbox: bool, has_dataset: bool, has_cursor: bool):
+    # Events overlapping [start_date, end_date]
+    search_range = func.daterange(bindparam('start_date'), bindparam('end_date'), literal_column("'[]'"))
+    
+    query = select(*_HEATWAVE_COLUMNS).where(
+        _heatwave.event_range.op('&&')(search_range),
+        _heatwave.duration_days >= bindparam('min_duration'),
+        _heatwave.threshold_percentile == bindparam('threshold_percentile')
+    )
+    if has_bbox:
+        query = query.where(_bbox_clause(_heatwave.geom))
+    if has_dataset:
+        query = query.where(_heatwave.dataset.in_(bindparam('datasets', expanding=True)))
+    
+    return _paginate(query, _heatwave.start_date, _heatwave.id, has_cursor)
+
+
+def _query_params(start_date, end_date, bbox, dataset, limit, offset, cursor) -> Dict[str, Any]:
+    """Bound parameter values shared by the prebuilt read statements"""
+    params = {'start_date': start_date, 'end_date': end_date, 'limit': limit}
+    if cursor:
+        params['cursor_date'], params['cursor_id'] = cursor
+    else:
+        params['offset'] = offset
+    if bbox:
+        params.update(zip(('min_lon', 'min_lat', 'max_lon', 'max_lat'), bbox))
+    if dataset:
+        params['datasets'] = [dataset] if isinstance(dataset, str) else list(dataset)
+    return params
+
+
+# Statements are built once per filter combination; only bound values change
+# between requests, so the engine's compiled cache serves every call.
+_FLAGS = (False, True)
+_RESOLUTIONS = ("daily", "monthly", "yearly", "grid")
+
+_TEMPERATURE_QUERIES = {
+    (resolution, *flags): _build_temperature_query(resolution, *flags)
+    for resolution in _RESOLUTIONS for flags in product(_FLAGS, repeat=3)
+}
+_ANOMALY_QUERIES = {
+    flags: _build_anomaly_query(*flags) for flags in product(_FLAGS, repeat=4)
+}
+_HEATWAVE_QUERIES = {
+    flags: _build_heatwave_query(*flags) for flags in product(_FLAGS, repeat=3)
+}
+
+
+# Availability summaries keyed on (dataset, resolution); module-level so the
+# cache never pins a manager or its session, and short-lived so new data shows up
+_availability_cache = TTLCache(maxsize=128, ttl=300)
+
+# Date-valued columns the read statements return; they are handed out as
+# native date/datetime objects, which orjson encodes without isoformat() calls
+_DATE_COLUMNS = ['date', 'start_date', 'end_date']
+_DATETIME_COLUMNS = ['created_at']
+
+
+def _frame_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Serialize a query result frame to records in one vectorized pass"""
+    for column in df.columns.intersection(_DATE_COLUMNS + _DATETIME_COLUMNS):
+        # Convert each distinct value once (a monthly page shares a handful of
+        # dates across thousands of rows); the trailing None serves NULL codes
+        codes, uniques = pd.factorize(df[column])
+        values = pd.to_datetime(uniques)
+        native = values.to_pydatetime() if column in _DATETIME_COLUMNS else values.date
+        # An explicit object Series keeps pandas from re-inferring datetime64
+        df[column] = pd.Series(np.append(native, None)[codes], index=df.index, dtype=object)
+    
+    # NULLs come back as NaN/NaT; the API expects None
+    return df.astype(object).where(df.notna(), None).to_dict(orient='records')
 
 
 class TemporalDataManager:
     """Manages temporal temperature data operations"""
     
-    def __init__(self):
-        self.session = get_session()
+    def __init__(self, session: Optional[Session] = None):
+        self.session = session if session is not None else get_session()
     
     def get_temperature_data(
         self, 
         start_date: date, 
         end_date: date,
         bbox: Optional[Tuple[float, float, float, float]] = None,
-        dataset: Optional[str] = None,
+        dataset: Optional[Union[str, Sequence[str]]] = None,
         resolution: str = "daily",
         limit: int = 5000,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[Tuple[date, str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Retrieve temperature data for a date range and optional bounding box.
@@ -48,69 +243,57 @@ class TemporalDataManager:
             start_date: Start date for data query
             end_date: End date for data query
             bbox: Optional bounding box (min_lon, min_lat, max_lon, max_lat)
-            dataset: Optional dataset filter (ERSST, OISST, etc.)
+            dataset: Optional dataset filter (ERSST, OISST, etc.); a sequence matches any of them
             resolution: Data resolution (daily, monthly, yearly)
             limit: Maximum number of records to return
-            offset: Offset for pagination
+            offset: Offset for pagination (ignored when cursor is given)
+            cursor: (date, id) of the last record of the previous page
             
         Returns:
             List of temperature data records
         """
         
-        # Select appropriate table based on resolution
-        if resolution == "daily":
-            table = TemporalTemperatureDaily
-            date_col = table.date
-            lat_col = table.lat_bin
-            lon_col = table.lon_bin
-            temp_col = table.avg_sst_c
-        elif resolution == "monthly":
-            table = TemporalTemperatureMonthly
-            # For monthly, construct date from year and month
-            date_col = func.make_date(table.year, table.month, 1)
-            lat_col = table.lat_bin
-            lon_col = table.lon_bin
-            temp_col = table.avg_sst_c
-        elif resolution == "yearly":
-            table = TemporalTemperatureYearly
-            date_col = func.make_date(table.year, 1, 1)
-            lat_col = table.lat_bin
-            lon_col = table.lon_bin
-            temp_col = table.avg_sst_c
-        else:
-            # Raw grid data
-            table = TemporalTemperatureGrid
-            date_col = table.date
-            lat_col = table.lat
-            lon_col = table.lon
-            temp_col = table.sst_c
-        
-        query = select(table).where(
-            and_(
-                date_col >= start_date,
-                date_col <= end_date
-            )
-        )
+        if resolution not in _RESOLUTIONS:
+            resolution = "grid"
         
-        if bbox:
-            min_lon, min_lat, max_lon, max_lat = bbox
-            query = query.where(
-                and_(
-                    lat_col >= min_lat,
-                    lat_col <= max_lat,
-                    lon_col >= min_lon,
-                    lon_col <= max_lon
-                )
-            )
+        query = _TEMPERATURE_QUERIES[(resolution, bool(bbox), bool(dataset), bool(cursor))]
+        params = _query_params(start_date, end_date, bbox, dataset, limit, offset, cursor)
+        
+        return self._read_records(query, params)
+    
+    def iter_temperature_data(
+        self, 
+        start_date: date, 
+        end_date: date,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        dataset: Optional[Union[str, Sequence[str]]] = None,
+        resolution: str = "daily",
+        limit: int = 5000,
+        offset: int = 0,
+        cursor: Optional[Tuple[date, str]] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream temperature data records from a server-side cursor.
         
-        if dataset:
-            query = query.where(table.dataset == dataset)
+        Same query and record format as get_temperature_data, but rows are
+        fetched and serialized batch_size at a time, so memory stays bounded
+        and the first records are available before the query is drained.
+        """
+        
+        if resolution not in _RESOLUTIONS:
+            resolution = "grid"
         
-        query = query.order_by(date_col.desc()).limit(limit).offset(offset)
+        query = _TEMPERATURE_QUERIES[(resolution, bool(bbox), bool(dataset), bool(cursor))]
+        params = _query_params(start_date, end_date, bbox, dataset, limit, offset, cursor)
         
-        results = self.session.execute(query).scalars().all()
+        result = self.session.execute(
+            query, params, execution_options={'stream_results': True, 'yield_per': batch_size}
+        )
+        columns = list(result.keys())
         
-        return [self._serialize_temperature_record(record, resolution) for record in results]
+        for batch in result.partitions():
+            yield from _frame_to_records(pd.DataFrame.from_records(batch, columns=columns))
     
     def get_temperature_anomalies(
         self,
@@ -118,10 +301,11 @@ class TemporalDataManager:
         end_date: date,
         baseline: str = "1991-2020",
         bbox: Optional[Tuple[float, float, float, float]] = None,
-        dataset: Optional[str] = None,
+        dataset: Optional[Union[str, Sequence[str]]] = None,
         threshold: Optional[float] = None,
         limit: int = 5000,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[Tuple[date, str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Retrieve temperature anomaly data.
@@ -131,45 +315,23 @@ class TemporalDataManager:
             end_date: End date for anomaly data  
             baseline: Baseline period (e.g., "1991-2020")
             bbox: Optional bounding box
-            dataset: Optional dataset filter
+            dataset: Optional dataset filter, or a sequence of datasets
             threshold: Optional minimum anomaly threshold
             limit: Maximum records to return
-            offset: Offset for pagination
+            offset: Offset for pagination (ignored when cursor is given)
+            cursor: (date, id) of the last record of the previous page
             
         Returns:
             List of anomaly records
         """
         
-        query = select(TemperatureAnomaly).where(
-            and_(
-                TemperatureAnomaly.date >= start_date,
-                TemperatureAnomaly.date <= end_date,
-                TemperatureAnomaly.baseline_period == baseline
-            )
-        )
-        
-        if bbox:
-            min_lon, min_lat, max_lon, max_lat = bbox
-            query = query.where(
-                and_(
-                    TemperatureAnomaly.lat_bin >= min_lat,
-                    TemperatureAnomaly.lat_bin <= max_lat,
-                    TemperatureAnomaly.lon_bin >= min_lon,
-                    TemperatureAnomaly.lon_bin <= max_lon
-                )
-            )
-        
-        if dataset:
-            query = query.where(TemperatureAnomaly.dataset == dataset)
-            
+        query = _ANOMALY_QUERIES[(bool(bbox), bool(dataset), threshold is not None, bool(cursor))]
+        params = _query_params(start_date, end_date, bbox, dataset, limit, offset, cursor)
+        params['baseline'] = baseline
         if threshold is not None:
-            query = query.where(func.abs(TemperatureAnomaly.anomaly_c) >= threshold)
-        
-        query = query.order_by(TemperatureAnomaly.date.desc()).limit(limit).offset(offset)
+            params['threshold'] = threshold
         
-        results = self.session.execute(query).scalars().all()
-        
-        return [self._serialize_anomaly_record(record) for record in results]
+        return self._read_records(query, params)
     
     def get_marine_heatwaves(
         self,
@@ -178,9 +340,10 @@ class TemporalDataManager:
         bbox: Optional[Tuple[float, float, float, float]] = None,
         min_duration: int = 5,
         threshold_percentile: int = 90,
-        dataset: Optional[str] = None,
+        dataset: Optional[Union[str, Sequence[str]]] = None,
         limit: int = 1000,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[Tuple[date, str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Retrieve marine heatwave events.
@@ -191,61 +354,28 @@ class TemporalDataManager:
             bbox: Optional bounding box
             min_duration: Minimum duration in days
             threshold_percentile: Temperature percentile threshold
-            dataset: Optional dataset filter
+            dataset: Optional dataset filter, or a sequence of datasets
             limit: Maximum records to return
-            offset: Offset for pagination
+            offset: Offset for pagination (ignored when cursor is given)
+            cursor: (start_date, id) of the last event of the previous page
             
         Returns:
             List of marine heatwave events
         """
         
-        query = select(MarineHeatwave).where(
-            and_(
-                or_(
-                    and_(
-                        MarineHeatwave.start_date >= start_date,
-                        MarineHeatwave.start_date <= end_date
-                    ),
-                    and_(
-                        MarineHeatwave.end_date >= start_date,
-                        MarineHeatwave.end_date <= end_date
-                    ),
-                    and_(
-                        MarineHeatwave.start_date <= start_date,
-                        MarineHeatwave.end_date >= end_date
-                    )
-                ),
-                MarineHeatwave.duration_days >= min_duration,
-                MarineHeatwave.threshold_percentile == threshold_percentile
-            )
-        )
-        
-        if bbox:
-            min_lon, min_lat, max_lon, max_lat = bbox
-            query = query.where(
-                and_(
-                    MarineHeatwave.lat_bin >= min_lat,
-                    MarineHeatwave.lat_bin <= max_lat,
-                    MarineHeatwave.lon_bin >= min_lon,
-                    MarineHeatwave.lon_bin <= max_lon
-                )
-            )
-        
-        if dataset:
-            query = query.where(MarineHeatwave.dataset == dataset)
+        query = _HEATWAVE_QUERIES[(bool(bbox), bool(dataset), bool(cursor))]
+        params = _query_params(start_date, end_date, bbox, dataset, limit, offset, cursor)
+        params.update(min_duration=min_duration, threshold_percentile=threshold_percentile)
         
-        query = query.order_by(MarineHeatwave.start_date.desc()).limit(limit).offset(offset)
-        
-        results = self.session.execute(query).scalars().all()
-        
-        return [self._serialize_heatwave_record(record) for record in results]
+        return self._read_records(query, params)
     
     def aggregate_daily_to_monthly(
         self, 
         year: int, 
         month: int, 
         dataset: str,
-        spatial_resolution: float = 1.0
+        spatial_resolution: float = 1.0,
+        commit: bool = True
     ) -> int:
         """
         Aggregate daily temperature data to monthly averages.
@@ -255,6 +385,7 @@ class TemporalDataManager:
             month: Target month
             dataset: Dataset to aggregate
             spatial_resolution: Spatial binning resolution in degrees
+            commit: Commit the transaction (False when batching several calls)
             
         Returns:
             Number of records processed
@@ -308,9 +439,107 @@ class TemporalDataManager:
             'resolution': spatial_resolution
         })
         
-        self.session.commit()
+        if commit:
+            self.session.commit()
         return result.rowcount
     
+    def aggregate_range(
+        self,
+        start: date,
+        end: date,
+        dataset: str,
+        spatial_resolution: float = 1.0,
+        max_workers: Optional[int] = None
+    ) -> int:
+        """
+        Aggregate every month between start and end (inclusive) to monthly averages.
+        
+        Months are independent INSERT ... SELECT statements, so they run
+        concurrently, each on its own session and pooled connection.
+        
+        Args:
+            start: First date of the range (its month is included)
+            end: Last date of the range (its month is included)
+            dataset: Dataset to aggregate
+            spatial_resolution: Spatial binning resolution in degrees
+            max_workers: Concurrent aggregations (default: connection pool size)
+            
+        Returns:
+            Number of records processed
+        """
+        
+        months = [
+            (m // 12, m % 12 + 1)
+            for m in range(start.year * 12 + start.month - 1, end.year * 12 + end.month)
+        ]
+        
+        def aggregate_month(year_month: Tuple[int, int]) -> int:
+            manager = TemporalDataManager(get_session())
+            try:
+                return manager.aggregate_daily_to_monthly(*year_month, dataset, spatial_resolution)
+            finally:
+                manager.close()
+        
+        with ThreadPoolExecutor(max_workers=max_workers or get_engine().pool.size()) as pool:
+            return sum(pool.map(aggregate_month, months))
+    
+    def aggregate_new_daily_data(
+        self,
+        dataset: str,
+        spatial_resolution: float = 1.0
+    ) -> int:
+        """
+        Aggregate only the months that received daily data since the last run.
+        
+        A watermark (latest aggregated daily date) is kept per dataset in
+        ingest_state and advanced in the same transaction as the aggregation.
+        
+        Args:
+            dataset: Dataset to aggregate
+            spatial_resolution: Spatial binning resolution in degrees
+            
+        Returns:
+            Number of records processed
+        """
+        
+        name = f"daily_to_monthly:{dataset}"
+        watermark = self.session.execute(
+            select(IngestState.watermark).where(IngestState.name == name)
+        ).scalar()
+        
+        pending = self.session.execute(text("""
+            SELECT 
+                EXTRACT(YEAR FROM date)::int AS year,
+                EXTRACT(MONTH FROM date)::int AS month,
+                MAX(date) AS latest
+            FROM temporal_temperature_daily
+            WHERE dataset = :dataset
+                AND date > :watermark
+            GROUP BY 1, 2
+        """), {'dataset': dataset, 'watermark': watermark or date.min}).all()
+        
+        if not pending:
+            return 0
+        
+        processed = 0
+        for row in pending:
+            processed += self.aggregate_daily_to_monthly(
+                row.year, row.month, dataset, spatial_resolution, commit=False
+            )
+        
+        state = insert(IngestState).values(
+            name=name,
+            watermark=max(row.latest for row in pending),
+            updated_at=func.now()
+        )
+        self.session.execute(state.on_conflict_do_update(
+            index_elements=[IngestState.name],
+            set_={'watermark': state.excluded.watermark, 'updated_at': state.excluded.updated_at}
+        ))
+        
+        self.session.commit()
+        return processed
+    
     def aggregate_monthly_to_yearly(
         self, 
         year: int, 
@@ -491,7 +720,6 @@ class TemporalDataManager:
         self.session.commit()
         return result.rowcount
     
-    @lru_cache(maxsize=128)
     def get_data_availability(
         self, 
         dataset: str, 
@@ -508,6 +736,10 @@ class TemporalDataManager:
             Dictionary with data availability information
         """
         
+        key = (dataset, resolution)
+        if key in _availability_cache:
+            return _availability_cache[key]
+        
         if resolution == "monthly":
             table = TemporalTemperatureMonthly
             date_col = func.make_date(table.year, table.month, 1)
@@ -531,11 +763,11 @@ class TemporalDataManager:
         result = self.session.execute(query).first()
         
         if result and result.total_records > 0:
-            return {
+            availability = {
                 'dataset': dataset,
                 'resolution': resolution,
-                'start_date': result.start_date.isoformat() if result.start_date else None,
-                'end_date': result.end_date.isoformat() if result.end_date else None,
+                'start_date': result.start_date,
+                'end_date': result.end_date,
                 'total_records': result.total_records,
                 'spatial_bounds': {
                     'min_lat': float(result.min_lat) if result.min_lat is not None else None,
@@ -545,7 +777,7 @@ class TemporalDataManager:
                 }
             }
         else:
-            return {
+            availability = {
                 'dataset': dataset,
                 'resolution': resolution,
                 'start_date': None,
@@ -553,93 +785,15 @@ class TemporalDataManager:
                 'total_records': 0,
                 'spatial_bounds': None
             }
+        
+        _availability_cache[key] = availability
+        return availability
     
-    def _serialize_temperature_record(self, record, resolution: str) -> Dict[str, Any]:
-        """Serialize temperature record to dictionary"""
-        base_data = {
-            'id': record.id,
-            'dataset': record.dataset,
-        }
-        
-        if resolution == "daily":
-            base_data.update({
-                'date': record.date.isoformat(),
-                'lat': record.lat_bin,
-                'lon': record.lon_bin,
-                'avg_sst_c': record.avg_sst_c,
-                'min_sst_c': record.min_sst_c,
-                'max_sst_c': record.max_sst_c,
-                'std_sst_c': record.std_sst_c,
-                'count': record.count
-            })
-        elif resolution in ["monthly", "yearly"]:
-            if resolution == "monthly":
-                base_data.update({
-                    'year': record.year,
-                    'month': record.month,
-                    'date': f"{record.year}-{record.month:02d}-01"
-                })
-            else:
-                base_data.update({
-                    'year': record.year,
-                    'date': f"{record.year}-01-01"
-                })
-            
-            base_data.update({
-                'lat': record.lat_bin,
-                'lon': record.lon_bin,
-                'avg_sst_c': record.avg_sst_c,
-                'min_sst_c': record.min_sst_c,
-                'max_sst_c': record.max_sst_c,
-                'std_sst_c': record.std_sst_c,
-                'count': record.count
-            })
-        else:  # grid data
-            base_data.update({
-                'date': record.date.isoformat(),
-                'lat': record.lat,
-                'lon': record.lon,
-                'sst_c': record.sst_c,
-                'resolution': record.resolution,
-                'quality_flag': record.quality_flag,
-                'created_at': record.created_at.isoformat()
-            })
-        
-        return base_data
-    
-    def _serialize_anomaly_record(self, record) -> Dict[str, Any]:
-        """Serialize anomaly record to dictionary"""
-        return {
-            'id': record.id,
-            'date': record.date.isoformat(),
-            'lat': record.lat_bin,
-            'lon': record.lon_bin,
-            'anomaly_c': record.anomaly_c,
-            'baseline_period': record.baseline_period,
-            'dataset': record.dataset
-        }
-    
-    def _serialize_heatwave_record(self, record) -> Dict[str, Any]:
-        """Serialize heatwave record to dictionary"""
-        return {
-            'id': record.id,
-            'start_date': record.start_date.isoformat(),
-            'end_date': record.end_date.isoformat(),
-            'duration_days': record.duration_days,
-            'lat': record.lat_bin,
-            'lon': record.lon_bin,
-            'max_intensity_c': record.max_intensity_c,
-            'mean_intensity_c': record.mean_intensity_c,
-            'cumulative_intensity': record.cumulative_intensity,
-            'threshold_percentile': record.threshold_percentile,
-            'dataset': record.dataset
-        }
+    def _read_records(self, query, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Execute a prebuilt read statement and return its rows as records"""
+        return _frame_to_records(pd.read_sql(query, self.session.connection(), params=params))
     
     def close(self):
         """Close database session"""
         if self.session:
             self.session.close()
-
-
-# Global instance for reuse
-temporal_data_manager = TemporalDataManager()
\ No newline at end of file
@@ -2,18 +2,25 @@
 # © 2024–2025 Mark Lindon — BlueSphere
 from fastapi import APIRouter, Response
 from PIL import Image, ImageDraw, ImageFont
+from functools import lru_cache
 import io
 
 router = APIRouter()
 
+# Background, border and font never change; set them up once per process
+_FONT = ImageFont.load_default()
+_TEMPLATE = Image.new("RGBA", (256,256), (10,37,64,255))
+ImageDraw.Draw(_TEMPLATE).rectangle([8,8,248,248], outline=(46,125,186,255), width=3)
+
+@lru_cache(maxsize=4096)
 def render_tile(z:int, x:int, y:int, label:str) -> bytes:
-    img = Image.new("RGBA", (256,256), (10,37,64,255))
+    img = _TEMPLATE.copy()
     d = ImageDraw.Draw(img)
-    d.rectangle([8,8,248,248], outline=(46,125,186,255), width=3)
     text = f"{label}\\nZ:{z} X:{x} Y:{y}"
-    d.text((16,16), text, fill=(255,255,255,255))
+    d.text((16,16), text, fill=(255,255,255,255), font=_FONT)
     buf = io.BytesIO()
-    img.save(buf, format="PNG")
+    # Placeholder tiles: favour encode speed over size
+    img.save(buf, format="PNG", optimize=False, compress_level=1)
     return buf.getvalue()
 
 @router.get("/tiles/sst/{z}/{x}/{y}.png")
@@ -1,17 +1,37 @@
 # SPDX-License-Identifier: MIT
 # © 2024–2025 Mark Lindon — BlueSphere
 from fastapi import APIRouter, Response
-import os
+from fastapi.responses import FileResponse
+from pathlib import Path
+import os, sqlite3
 
 router = APIRouter()
 BASE = os.path.join(os.path.dirname(__file__), "..", "tiles", "cache")
+# MBTiles files written by the tilers' --mbtiles option; when set, served instead of the BASE tree
+SST_MBTILES = os.getenv("SST_MBTILES")
+CURRENTS_MBTILES = os.getenv("CURRENTS_MBTILES")
+
+def mbtiles_tile(path: str, z: int, x: int, y: int) -> bytes|None:
+    """Tile data for XYZ (z, x, y) from an MBTiles file; its rows are TMS, flipped back here"""
+    con = sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        row = con.execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+            (z, x, 2 ** z - 1 - y),
+        ).fetchone()
+    finally:
+        con.close()
+    return row[0] if row else None
 
 @router.get("/tiles/sst/{z}/{x}/{y}.png")
 def sst_tile(z:int, x:int, y:int):
+    if SST_MBTILES:
+        data = mbtiles_tile(SST_MBTILES, z, x, y)
+        if data is not None:
+            return Response(content=data, media_type="image/png")
     fp = os.path.join(BASE, "sst", str(z), str(x), f"{y}.png")
     if os.path.exists(fp):
-        with open(fp, "rb") as f:
-            return Response(content=f.read(), media_type="image/png")
+        return FileResponse(fp, media_type="image/png")
     # fallback simple placeholder if no cache exists
     from PIL import Image, ImageDraw
     import io
@@ -23,8 +43,10 @@ def sst_tile(z:int, x:int, y:int):
 
 @router.get("/tiles/currents/{z}/{x}/{y}.mvt")
 def currents_mvt(z:int, x:int, y:int):
+    if CURRENTS_MBTILES:
+        data = mbtiles_tile(CURRENTS_MBTILES, z, x, y)
+        return Response(content=data, media_type="application/vnd.mapbox-vector-tile") if data is not None else Response(status_code=204)
     fp = os.path.join(BASE, "currents", str(z), str(x), f"{y}.mvt")
     if os.path.exists(fp):
-        with open(fp, "rb") as f:
-            return Response(content=f.read(), media_type="application/vnd.mapbox-vector-tile")
+        return FileResponse(fp, media_type="application/vnd.mapbox-vector-tile")
     return Response(status_code=204)
@@ -0,0 +1,60 @@
+# SPDX-License-Identifier: MIT
+# © 2024–2025 Mark Lindon — BlueSphere
+"""
+Numba kernels for in-process anomaly and marine heatwave computation.
+- compute_anomaly: per-cell anomaly (monthly mean minus climatology)
+- detect_heatwave_runs: single pass over a daily series, yielding events of
+  consecutive days above threshold with their intensity statistics
+Compiled with cache=True so only the first run on a machine pays the JIT cost.
+"""
+from __future__ import annotations
+import numpy as np
+from numba import njit, prange
+
+@njit(parallel=True, cache=True, fastmath=True)
+def compute_anomaly(avg, clim, out):
+    for i in prange(avg.size):
+        out[i] = avg[i] - clim[i]
+
+# No fastmath here: missing days are NaN and must compare False against the threshold
+@njit(cache=True)
+def detect_heatwave_runs(temp, threshold, min_duration):
+    """
+    temp/threshold: daily SST and per-day threshold (e.g. 90th percentile climatology)
+    Returns (start_idx, end_idx, max_intensity, mean_intensity, cumulative_intensity)
+    arrays, one entry per run of >= min_duration days with temp > threshold.
+    Intensity is the exceedance above threshold in °C; end_idx is inclusive.
+    """
+    n = temp.size
+    cap = n // max(min_duration, 1) + 1
+    starts = np.empty(cap, np.int64)
+    ends = np.empty(cap, np.int64)
+    peak = np.empty(cap, np.float64)
+    mean = np.empty(cap, np.float64)
+    cumulative = np.empty(cap, np.float64)
+
+    count = 0
+    run_start = -1
+    run_peak = 0.0
+    run_sum = 0.0
+    for i in range(n + 1):
+        excess = temp[i] - threshold[i] if i < n else np.nan
+        if excess > 0.0:
+            if run_start < 0:
+                run_start = i
+                run_peak = excess
+                run_sum = 0.0
+            run_peak = max(run_peak, excess)
+            run_sum += excess
+        elif run_start >= 0:
+            length = i - run_start
+            if length >= min_duration:
+                starts[count] = run_start
+                ends[count] = i - 1
+                peak[count] = run_peak
+                mean[count] = run_sum / length
+                cumulative[count] = run_sum
+                count += 1
+            run_start = -1
+
+    return starts[:count], ends[:count], peak[:count], mean[:count], cumulative[:count]
@@ -0,0 +1,157 @@
+# SPDX-License-Identifier: MIT
+# © 2024–2025 Mark Lindon — BlueSphere
+"""
+Bulk loading into PostgreSQL with COPY FROM STDIN.
+- Rows arrive as a pyarrow.Table and are encoded to CSV by Arrow's C++ writer,
+  or with binary=True straight to PostgreSQL's binary COPY format from the
+  column buffers (no text formatting or server-side parsing)
+- copy_table appends; copy_upsert stages through a temp table for ON CONFLICT.
+  Temp tables are never WAL-logged, and the stage is kept for the session and
+  emptied after each merge rather than created and dropped per call
+Both run on the DBAPI (psycopg2) connection under a SQLAlchemy Connection, so
+they join the caller's transaction; the caller commits.
+"""
+from __future__ import annotations
+import io
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from sqlalchemy.engine import Connection
+
+_CSV_OPTIONS = pa_csv.WriteOptions(include_header=False)
+
+def _csv_buffer(table: pa.Table) -> io.BytesIO:
+    buf = io.BytesIO()
+    pa_csv.write_csv(table, buf, write_options=_CSV_OPTIONS)
+    buf.seek(0)
+    return buf
+
+_PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + bytes(8)  # signature, flags, header extension length
+# PostgreSQL dates and timestamps count from 2000-01-01
+_PG_EPOCH_DAYS = 10957
+_PG_EPOCH_US = _PG_EPOCH_DAYS * 86400 * 1000000
+
+def _binary_field(col: pa.Array) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(values as big-endian bytes, offset into them per row, byte size per row) for one column"""
+    n = len(col)
+    t = col.type
+    if pa.types.is_string(t) or pa.types.is_large_string(t):
+        _, offsets, data = col.buffers()
+        off_type = np.int64 if pa.types.is_large_string(t) else np.int32
+        offsets = np.frombuffer(offsets, dtype=off_type)[col.offset:col.offset + n + 1].astype(np.int64)
+        return np.frombuffer(data, dtype=np.uint8) if data else np.empty(0, np.uint8), offsets[:-1], np.diff(offsets)
+    if pa.types.is_boolean(t):
+        values = col.fill_null(False).to_numpy(zero_copy_only=False).astype(np.uint8)
+    else:
+        # Fixed-width values straight from the Arrow data buffer; null slots are never written
+        shift = 0
+        if pa.types.is_date32(t):
+            dtype, shift = np.int32, _PG_EPOCH_DAYS
+        elif pa.types.is_timestamp(t):
+            col = col.cast(pa.timestamp("us", t.tz))
+            dtype, shift = np.int64, _PG_EPOCH_US
+        elif pa.types.is_integer(t) or pa.types.is_floating(t):
+            dtype = t.to_pandas_dtype()
+        else:
+            raise TypeError(f"binary COPY does not support Arrow type {t}")
+        values = np.frombuffer(col.buffers()[1], dtype=dtype)[col.offset:col.offset + n]
+        values = (values - dtype(shift) if shift else values).astype(np.dtype(dtype).newbyteorder(">"))
+    width = values.dtype.itemsize
+    return values.view(np.uint8), np.arange(n, dtype=np.int64) * width, np.full(n, width, dtype=np.int64)
+
+def _binary_buffer(table: pa.Table) -> io.BytesIO:
+    """
+    Encode `table` as a COPY ... (FORMAT binary) stream. Arrow types must match
+    the target columns: float64/double precision, float32/real, int16/smallint,
+    int32/integer, int64/bigint, bool/boolean, date32/date, timestamp/timestamp
+    and string/text or varchar. Rows are laid out with array assignments per
+    column instead of a struct.pack per field.
+    """
+    n = table.num_rows
+    fields = []
+    row_size = np.full(n, 2, dtype=np.int64)
+    for col in table.columns:
+        col = col.combine_chunks()
+        values, starts, sizes = _binary_field(col)
+        valid = col.is_valid().to_numpy(zero_copy_only=False)
+        sizes = np.where(valid, sizes, 0)
+        fields.append((values, starts, sizes, np.where(valid, sizes, -1).astype(">i4")))
+        row_size += 4 + sizes
+    header = np.frombuffer(_PGCOPY_HEADER, dtype=np.uint8)
+    out = np.empty(header.size + int(row_size.sum()) + 2, dtype=np.uint8)
+    out[:header.size] = header
+    out[-2:] = 0xFF  # file trailer: field count -1
+    nfields = np.full(n, len(fields), dtype=">i2").view(np.uint8).reshape(n, 2)
+
+    if n and all((lengths == lengths[0]).all() for _, _, _, lengths in fields):
+        # Each column has one width in every row (fixed-width or equal-length strings, and no
+        # nulls unless the whole column is null): fill column slices of an (n, row) view.
+        # Equal row totals are not enough, as widths or nulls in different columns can offset.
+        rows = out[header.size:-2].reshape(n, -1)
+        rows[:, :2] = nfields
+        c = 2
+        for values, starts, sizes, lengths in fields:
+            w = int(sizes[0])
+            rows[:, c:c + 4] = lengths.view(np.uint8).reshape(n, 4)
+            rows[:, c + 4:c + 4 + w] = values[starts[0]:starts[0] + n * w].reshape(n, w)
+            c += 4 + w
+        return io.BytesIO(out.tobytes())
+
+    row_start = np.zeros(n, dtype=np.int64)
+    np.cumsum(row_size[:-1], out=row_start[1:])
+    row_start += header.size
+    out[row_start[:, None] + np.arange(2)] = nfields
+    pos = row_start + 2
+    for values, starts, sizes, lengths in fields:
+        out[pos[:, None] + np.arange(4)] = lengths.view(np.uint8).reshape(n, 4)
+        pos += 4
+        # Byte k of row i's value goes to pos[i] + k: one gather from the value buffer, one scatter into out
+        k = np.arange(int(sizes.sum())) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        out[np.repeat(pos, sizes) + k] = values[np.repeat(starts, sizes) + k]
+        pos += sizes
+    return io.BytesIO(out.tobytes())
+
+def _copy_buffer(table: pa.Table, binary: bool) -> tuple[str, io.BytesIO]:
+    if binary:
+        return "binary", _binary_buffer(table)
+    return "csv", _csv_buffer(table)
+
+def copy_table(conn: Connection, table_name: str, table: pa.Table, binary: bool = False) -> int:
+    """COPY every row of `table` into `table_name`; columns are matched by name."""
+    if table.num_rows == 0:
+        return 0
+    cols = ", ".join(table.column_names)
+    fmt, buf = _copy_buffer(table, binary)
+    with conn.connection.dbapi_connection.cursor() as cur:
+        cur.copy_expert(f"COPY {table_name} ({cols}) FROM STDIN WITH (FORMAT {fmt})", buf)
+    return table.num_rows
+
+def copy_upsert(conn: Connection, table_name: str, table: pa.Table,
+                conflict_cols: list[str], update_cols: list[str],
+                defaults: dict[str, str] | None = None, binary: bool = False) -> int:
+    """
+    COPY rows into a temp staging table, then merge them into `table_name` with
+    INSERT ... ON CONFLICT (conflict_cols) DO UPDATE SET update_cols.
+    `defaults` maps extra target columns to SQL expressions evaluated per row in
+    the merge, e.g. {"id": "gen_random_uuid()"} for keys with no server default.
+    """
+    if table.num_rows == 0:
+        return 0
+    stage = f"_stage_{table_name}"
+    cols = ", ".join(table.column_names)
+    defaults = defaults or {}
+    target_cols = ", ".join([*defaults, *table.column_names])
+    select_cols = ", ".join([*defaults.values(), *table.column_names])
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in update_cols)
+    fmt, buf = _copy_buffer(table, binary)
+    with conn.connection.dbapi_connection.cursor() as cur:
+        # Every column of the target, without its constraints, so any column subset can be loaded.
+        # Created once per session: repeated CREATE/DROP would write catalog rows on every batch.
+        cur.execute(f"CREATE TEMP TABLE IF NOT EXISTS {stage} ON COMMIT DELETE ROWS AS SELECT * FROM {table_name} WITH NO DATA")
+        cur.copy_expert(f"COPY {stage} ({cols}) FROM STDIN WITH (FORMAT {fmt})", buf)
+        cur.execute(
+            f"INSERT INTO {table_name} ({target_cols}) SELECT {select_cols} FROM {stage} "
+            f"ON CONFLICT ({', '.join(conflict_cols)}) DO UPDATE SET {updates}"
+        )
+        cur.execute(f"TRUNCATE {stage}")
+    return table.num_rows
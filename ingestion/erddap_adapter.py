@@ -5,12 +5,38 @@ ERDDAP Adapter
 Fetches tabular/grid data from an ERDDAP server using the tabledap or griddap endpoints.
 This provides a uniform function you can call from ingestion to read recent slices.
 """
-import os, sys, urllib.parse
+import asyncio, io, os, sys
 import httpx
 
+_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+
 class ERDDAPAdapter:
     def __init__(self, base:str):
         self.base = base.rstrip('/')
+        # URL templates built once; per call only dataset and query are filled in
+        self._tabledap_url = f"{self.base}/tabledap/{{ds}}.csv?{{q}}"
+        self._griddap_url = f"{self.base}/griddap/{{ds}}.nc?{{q}}"
+        # One pooled HTTP/2 client for the adapter's lifetime, so batch
+        # ingestion reuses the TLS connection instead of reconnecting per call
+        self._client = httpx.Client(http2=True, timeout=120, limits=_LIMITS)
+
+    def close(self):
+        self._client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def time_slice_query(start:str, end:str, selection:str)->str:
+        """
+        Tabledap query for one time slice; only the time bounds vary between
+        slices, so e.g. monthly queries for async_tabledap_csv are a cheap join.
+        selection: remaining constraints and variables, e.g. ".csv?time,latitude,longitude,sst"
+        """
+        return "".join(("time>=", start, "&time<=", end, "&", selection))
 
     def tabledap_csv(self, dataset:str, query:str)->str:
         """
@@ -18,35 +44,58 @@ class ERDDAPAdapter:
         query: ERDDAP query string with constraints and variable selection, e.g.:
           "time>=2025-01-01&time<=2025-01-31&latitude>=-10&latitude<=10&longitude>=120&longitude<=160&.csv?time,latitude,longitude,sst"
         """
-        url = f"{self.base}/tabledap/{dataset}.csv?{query.lstrip('?')}"
-        with httpx.Client(timeout=60) as client:
-            r = client.get(url)
+        url = self._tabledap_url.format(ds=dataset, q=query.lstrip('?'))
+        r = self._client.get(url, timeout=60)
+        r.raise_for_status()
+        return r.text
+
+    async def async_tabledap_csv(self, dataset:str, queries:list)->list:
+        """
+        Fetch several tabledap CSV slices (e.g. one per month) concurrently.
+        Returns the CSV texts in the same order as queries.
+        """
+        async with httpx.AsyncClient(http2=True, timeout=60, limits=_LIMITS) as client:
+            async def fetch(query):
+                r = await client.get(self._tabledap_url.format(ds=dataset, q=query.lstrip('?')))
+                r.raise_for_status()
+                return r.text
+            return await asyncio.gather(*(fetch(q) for q in queries))
+
+    def tabledap_csv_bytes(self, dataset:str, query:str)->bytes:
+        """
+        Same request as tabledap_csv, but streams the raw CSV bytes without
+        decoding them to str, for parsers that read bytes directly.
+        """
+        url = self._tabledap_url.format(ds=dataset, q=query.lstrip('?'))
+        buf = io.BytesIO()
+        with self._client.stream("GET", url, timeout=60) as r:
             r.raise_for_status()
-            return r.text
+            for chunk in r.iter_bytes():
+                buf.write(chunk)
+        return buf.getvalue()
 
     def griddap_netcdf(self, dataset:str, query:str)->bytes:
         """
         Fetch a NetCDF grid subset via griddap.
         query example: ".nc?sst[(2025-01-01):1:(2025-01-31)][(10):1:(-10)][(120):1:(160)]"
         """
-        url = f"{self.base}/griddap/{dataset}.nc?{query.lstrip('?')}"
-        with httpx.Client(timeout=120) as client:
-            r = client.get(url)
-            r.raise_for_status()
-            return r.content
+        url = self._griddap_url.format(ds=dataset, q=query.lstrip('?'))
+        r = self._client.get(url)
+        r.raise_for_status()
+        return r.content
 
 def main():
     base = os.getenv("ERDDAP_BASE", "https://coastwatch.pfeg.noaa.gov/erddap")
     ds = os.getenv("ERDDAP_DATASET", "erdMH1sstd8day")
     # Example: fetch CSV for a recent time slice (adjust query as needed)
     q = "time>=2025-01-01&time<=2025-01-31&.csv?time,latitude,longitude,sst"
-    a = ERDDAPAdapter(base)
-    try:
-        csv_text = a.tabledap_csv(ds, q)
-        print(csv_text.splitlines()[:5])
-    except Exception as e:
-        print("ERDDAP fetch failed:", e)
-        return 1
+    with ERDDAPAdapter(base) as a:
+        try:
+            csv_text = a.tabledap_csv(ds, q)
+            print(csv_text.splitlines()[:5])
+        except Exception as e:
+            print("ERDDAP fetch failed:", e)
+            return 1
     return 0
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@
 # © 2024–2025 Mark Lindon — BlueSphere
 """Fetch a small ERDDAP tabledap CSV slice and write parquet for local dev."""
 import os, io
-import pandas as pd
+import polars as pl
 from ingestion.erddap_adapter import ERDDAPAdapter
 
 BASE = os.getenv("ERDDAP_BASE", "https://coastwatch.pfeg.noaa.gov/erddap")
@@ -10,12 +10,13 @@ DATASET = os.getenv("ERDDAP_DATASET", "erdMH1sstd8day")  # example
 QUERY = os.getenv("ERDDAP_QUERY", "time>=2025-01-01&time<=2025-01-31&.csv?time,latitude,longitude,sst")
 
 def main():
-    a = ERDDAPAdapter(BASE)
-    csv_text = a.tabledap_csv(DATASET, QUERY)
-    df = pd.read_csv(io.StringIO(csv_text))
+    with ERDDAPAdapter(BASE) as a:
+        csv_bytes = a.tabledap_csv_bytes(DATASET, QUERY)
+    # ERDDAP .csv puts a units row under the header; skip it so columns get real dtypes
+    df = pl.read_csv(io.BytesIO(csv_bytes), skip_rows_after_header=1, try_parse_dates=True)
     out = "tiles/cache/erddap_sample.parquet"
     os.makedirs(os.path.dirname(out), exist_ok=True)
-    df.to_parquet(out)
+    df.write_parquet(out, compression="zstd")
     print("wrote", out, df.shape)
 
 if __name__ == "__main__":
@@ -0,0 +1,41 @@
+# SPDX-License-Identifier: MIT
+# © 2024–2025 Mark Lindon — BlueSphere
+"""
+Conditional-GET validator cache shared by the ingesters.
+- ETag / Last-Modified per URL in a small SQLite table, kept across runs
+- conditional_headers turns them into If-None-Match / If-Modified-Since
+Save validators only after a response has been fully processed, so a failed
+run downloads the body again.
+"""
+from __future__ import annotations
+import os, sqlite3, datetime as dt
+from contextlib import closing
+
+_DEFAULT_DB = os.path.join(os.path.dirname(__file__), "..", "data", "http_cache.sqlite")
+
+def _http_cache():
+    # Resolved per call so a .env loaded by the ingester after import still applies
+    conn = sqlite3.connect(os.getenv("HTTP_CACHE_DB", _DEFAULT_DB))
+    conn.execute("CREATE TABLE IF NOT EXISTS http_cache (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, fetched_at TEXT)")
+    return conn
+
+def load_validators(url: str) -> tuple[str|None, str|None]:
+    """ETag and Last-Modified stored by the last successful fetch of url"""
+    with closing(_http_cache()) as conn:
+        row = conn.execute("SELECT etag, last_modified FROM http_cache WHERE url = ?", (url,)).fetchone()
+    return row if row else (None, None)
+
+def save_validators(url: str, etag: str|None, last_mod: str|None):
+    with closing(_http_cache()) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO http_cache (url, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?)",
+            (url, etag, last_mod, dt.datetime.now(dt.timezone.utc).isoformat()),
+        )
+
+def conditional_headers(etag: str|None, last_mod: str|None) -> dict:
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_mod:
+        headers["If-Modified-Since"] = last_mod
+    return headers
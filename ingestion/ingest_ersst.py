@@ -8,28 +8,47 @@ ERSST ingestion (monthly grids).
 This script outlines the approach; fill DB details for production.
 """
 import os, sys, re, datetime as dt
+from typing import Iterable
 from dotenv import load_dotenv
 import httpx
+from ingestion.http_cache import load_validators, save_validators, conditional_headers
 
 load_dotenv()
 ERSST_BASE = os.getenv("ERSST_BASE", "https://www.ncei.noaa.gov/pub/data/cmb/ersst/v5/netcdf")
 
-def discover_latest_filename(index_text: str) -> str|None:
-    # crude find *.nc pattern with dates
-    candidates = re.findall(r'ersst.v5.\d{4}\d{2}.nc', index_text)
-    return sorted(candidates)[-1] if candidates else None
+_ERSST_RE = re.compile(rb'ersst\.v5\.(\d{6})\.nc')
+# A match split across two chunks is found again in the carried-over tail
+_CARRY = len(b"ersst.v5.YYYYMM.nc") - 1
+
+def discover_latest_filename(chunks: Iterable[bytes]) -> str|None:
+    """Newest ersst.v5.YYYYMM.nc named in the index listing, read chunk by chunk"""
+    latest = None
+    tail = b""
+    for chunk in chunks:
+        buf = tail + chunk
+        for m in _ERSST_RE.finditer(buf):
+            if latest is None or m.group(1) > latest:
+                latest = m.group(1)
+        tail = buf[-_CARRY:]
+    return f"ersst.v5.{latest.decode()}.nc" if latest else None
 
 def main():
     try:
-        with httpx.Client(timeout=60) as client:
-            idx = client.get(ERSST_BASE).text
-        latest = discover_latest_filename(idx)
+        etag, last_mod = load_validators(ERSST_BASE)
+        with httpx.Client(timeout=60) as client, \
+                client.stream("GET", ERSST_BASE, headers=conditional_headers(etag, last_mod)) as r:
+            if r.status_code == 304:
+                print("[ERSST] Index not modified; no new files.")
+                return 0
+            r.raise_for_status()
+            latest = discover_latest_filename(r.iter_bytes())
         if not latest:
             print("[ERSST] No NetCDF files found in index.")
             return 1
         url = f"{ERSST_BASE}/{latest}"
         # In production: stream to disk, open via xarray, write to DB or parquet.
         print(f"[ERSST] Latest: {latest} -> {url}")
+        save_validators(ERSST_BASE, r.headers.get("ETag"), r.headers.get("Last-Modified"))
     except Exception as e:
         print("[ERSST] Error:", e)
         return 1
@@ -7,14 +7,19 @@ NDBC ingestion (incremental).
 - Applies simple QC: exclude missing, use NDBC quality flags where available.
 - Upserts into database using COPY or batched INSERTS (placeholder hooks provided).
 """
-import os, sys, csv, io, time, datetime as dt
+import os, sys, csv, io, time, asyncio, datetime as dt
 from typing import Iterable, Dict, Any
 from dotenv import load_dotenv
 import httpx
-from ingestion.ndbc_parser import parse_realtime2
+from ingestion.ndbc_parser import aiter_realtime2
+from ingestion.http_cache import load_validators, save_validators, conditional_headers
 
 load_dotenv()
 NDBC_BASE = os.getenv("NDBC_BASE", "https://www.ndbc.noaa.gov")
+# Comma-separated station ids fetched by main()
+NDBC_STATIONS = [s.strip() for s in os.getenv("NDBC_STATIONS", "41001").split(",") if s.strip()]
+FETCH_CONCURRENCY = int(os.getenv("NDBC_FETCH_CONCURRENCY", "32"))
+_LIMITS = httpx.Limits(max_connections=50)
 
 def parse_csv(content: str) -> Iterable[Dict[str, Any]]:
     reader = csv.DictReader(io.StringIO(content), delimiter=",")
@@ -28,39 +33,48 @@ def upsert_buoy_obs(rows: Iterable[Dict[str, Any]]):
         count += 1
     print(f"[NDBC] Upserted {count} rows (stub).")
 
-def fetch_with_cache(url: str, etag: str|None=None, last_mod: str|None=None):
-    headers = {}
-    if etag:
-        headers["If-None-Match"] = etag
-    if last_mod:
-        headers["If-Modified-Since"] = last_mod
-    with httpx.Client(timeout=60) as client:
-        r = client.get(url, headers=headers)
-        if r.status_code == 304:
-            return None, etag, last_mod
-        r.raise_for_status()
-        return r.text, r.headers.get("ETag"), r.headers.get("Last-Modified")
+async def fetch_all(urls: dict[str, str]) -> dict:
+    """
+    Conditional GETs for many station files ({url: station_id}) over one pooled
+    HTTP/2 client. Each body is streamed through the realtime2 parser a block
+    of lines at a time and upserted as it goes, so no file is held whole.
+    Returns {url: rows loaded, None if not modified, or the exception}.
+    """
+    validators = {url: load_validators(url) for url in urls}
+    async with httpx.AsyncClient(http2=True, timeout=60, limits=_LIMITS) as client:
+        sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+        async def one(url):
+            async with sem, client.stream("GET", url, headers=conditional_headers(*validators[url])) as r:
+                if r.status_code == 304:
+                    return None
+                r.raise_for_status()
+                count = 0
+                # NDBC realtime2 .txt are whitespace delimited; WTMP is SST in °C
+                async for rows in aiter_realtime2(r.aiter_lines(), station_id=urls[url]):
+                    upsert_buoy_obs(rows)
+                    count += len(rows)
+                # Only after a complete load, so a failed run fetches the body again
+                save_validators(url, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+                return count
+        results = await asyncio.gather(*(one(url) for url in urls), return_exceptions=True)
+    return dict(zip(urls, results))
+
+def station_url(station_id: str) -> str:
+    return f"{NDBC_BASE}/data/realtime2/{station_id}.txt"
 
 def main():
-    # Example endpoint (replace with station discovery + per-station fetch):
-    url = f"{NDBC_BASE}/data/realtime2/41001.txt"  # example buoy file
-    try:
-        text, etag, last_mod = fetch_with_cache(url)
-    except Exception as e:
-        print("[NDBC] Fetch failed:", e)
-        return 1
-    if text is None:
-        print("[NDBC] Not modified.")
-        return 0
-    # NDBC realtime2 .txt are whitespace delimited; adapt parser as needed.
-    # For simplicity, convert whitespace to CSV header mapping here (left as exercise).
-    # In real impl: parse columns (YY MM DD hh mm WDIR WSPD GST ... WTMP etc.).
-    # Filter for WTEMP/WTMP into SST (°C) if Fahrenheit, convert to C.
-    # rows = transform_to_rows(text)
-    rows = parse_realtime2(text, station_id='41001')  # example buoy
-    upsert_buoy_obs(rows)
+    urls = {station_url(sid): sid for sid in NDBC_STATIONS}
+    results = asyncio.run(fetch_all(urls))
+    failed = 0
+    for url, r in results.items():
+        sid = urls[url]
+        if isinstance(r, Exception):
+            print(f"[NDBC] {sid}: fetch failed:", r)
+            failed += 1
+        elif r is None:
+            print(f"[NDBC] {sid}: not modified.")
     print("[NDBC] Done.")
-    return 0
+    return 1 if failed else 0
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -68,9 +82,11 @@ if __name__ == "__main__":
 
 # --- DB helpers (SQLAlchemy) ---
 from sqlalchemy import insert
-from sqlalchemy.dialects.postgresql import insert as pg_upsert
+from psycopg2.extras import execute_values
 from backend.db import get_session
 from backend.models import Station, BuoyObs, JobRun
+from ingestion.bulk_copy import copy_upsert
+import pyarrow as pa
 from datetime import datetime, timezone
 
 def record_job(sess, job, status, note=""):
@@ -87,16 +103,48 @@ def upsert_station(sess, station_id, name, lat, lon, source="NDBC"):
         s.name=name; s.lat=lat; s.lon=lon; s.source=source
     sess.commit()
 
+OBS_BATCH_SIZE = 5000
+# Above this many rows, stage through COPY instead of multi-row INSERTs
+OBS_COPY_THRESHOLD = 20000
+
+_OBS_COLS = ("station_id", "time", "sst_c", "qc_flag", "lat", "lon", "source")
+# One statement template; execute_values expands VALUES %s into pages of literal rows
+# on the DBAPI cursor, without building a SQLAlchemy insert per batch
+_OBS_UPSERT = (
+    f"INSERT INTO {BuoyObs.__tablename__} ({', '.join(_OBS_COLS)}) VALUES %s "
+    "ON CONFLICT (station_id, time) DO UPDATE SET "
+    "sst_c = EXCLUDED.sst_c, qc_flag = EXCLUDED.qc_flag, lat = EXCLUDED.lat, lon = EXCLUDED.lon"
+)
+
+def _latest_obs(rows):
+    # Last row wins per (station_id, time); Postgres rejects a batch that hits one key twice.
+    # Rows come back as tuples in _OBS_COLS order
+    latest = {}
+    for r in rows:
+        latest[(r['station_id'], r['time'])] = (
+            r['station_id'], r['time'], r.get('sst_c'), r.get('qc_flag', 0),
+            r.get('lat'), r.get('lon'), r.get('source', "NDBC"),
+        )
+    return list(latest.values())
+
 def upsert_obs_batch(sess, rows):
     # rows: list of dicts with station_id,time,sst_c,qc_flag,lat,lon
-    for r in rows:
-        # try unique insert; fallback update
-        try:
-            sess.add(BuoyObs(**r)); sess.commit()
-        except Exception:
-            sess.rollback()
-            existing = sess.query(BuoyObs).filter(BuoyObs.station_id==r['station_id'], BuoyObs.time==r['time']).one_or_none()
-            if existing:
-                existing.sst_c=r.get('sst_c'); existing.qc_flag=r.get('qc_flag',0); existing.lat=r.get('lat',existing.lat); existing.lon=r.get('lon',existing.lon)
-                sess.commit()
+    values = _latest_obs(rows)
+    if not values:
+        return
+    if len(values) > OBS_COPY_THRESHOLD:
+        columns = {name: list(col) for name, col in zip(_OBS_COLS, zip(*values))}
+        copy_upsert(sess.connection(), BuoyObs.__tablename__, pa.table(columns),
+                    ['station_id', 'time'], ['sst_c', 'qc_flag', 'lat', 'lon'])
+        sess.commit()
+        return
+    with sess.connection().connection.dbapi_connection.cursor() as cur:
+        execute_values(cur, _OBS_UPSERT, values, page_size=OBS_BATCH_SIZE)
+    sess.commit()
 
+def upsert_obs_frame(sess, df):
+    # df: a parse_realtime2_frames block; COPYs typed columns without building row dicts
+    df = df.drop_duplicates(['station_id', 'time'], keep='last')
+    copy_upsert(sess.connection(), BuoyObs.__tablename__, pa.Table.from_pandas(df, preserve_index=False),
+                ['station_id', 'time'], ['sst_c', 'qc_flag', 'lat', 'lon'])
+    sess.commit()
@@ -6,69 +6,113 @@ Generates synthetic current vectors as Mapbox Vector Tiles (MVT) for demo purpos
 Writes tiles to tiles/cache/currents/{z}/{x}/{y}.mvt
 """
 import os, sys, math, json
-import mapbox_vector_tile
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from mapbox_vector_tile import encode as _encode
+from ingestion.tile_math import coverage_at, pop_coverage_arg, tile_bounds, zoom_edges
+from ingestion.tile_store import MBTilesWriter, pop_mbtiles_arg, write_tile_file
 
 OUT_DIR = os.path.join(os.path.dirname(__file__), "..", "tiles", "cache", "currents")
 
-def tile_bounds(z, x, y):
-    n = 2 ** z
-    lon_min = x / n * 360.0 - 180.0
-    lon_max = (x + 1) / n * 360.0 - 180.0
-    lat_min = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
-    lat_max = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
-    return lon_min, lat_min, lon_max, lat_max
+EXTENT = 4096
+_ENCODE_OPTIONS = {"extents": EXTENT, "y_coord_down": True}
 
-def synth_vectors(lon_min, lat_min, lon_max, lat_max, step=5.0):
-    feats = []
-    lon = lon_min
-    while lon < lon_max:
-        lat = lat_min
-        while lat < lat_max:
-            # simple rotational field around (0,0)
-            u = -lat / 90.0
-            v = lon / 180.0
-            x2 = lon + u * 2
-            y2 = lat + v * 2
-            feats.append({
-                "geometry": {
-                    "type": "LineString",
-                    "coordinates": [[lon, lat], [x2, y2]]
-                },
-                "properties": {"u": u, "v": v}
-            })
-            lat += step
-        lon += step
-    return feats
+def synth_vectors(lon_min, lat_min, lon_max, lat_max, step=5.0, extent=None):
+    """
+    Synthetic current segments over the tile. With extent, coordinates are
+    returned pre-quantized to the tile's integer pixel grid (y down) instead
+    of lon/lat, so the encoder has no float scaling left to do.
+    """
+    lons = np.arange(lon_min, lon_max, step)
+    lats = np.arange(lat_min, lat_max, step)
+    lon, lat = np.meshgrid(lons, lats, indexing="ij")
+    # simple rotational field around (0,0)
+    u = -lat / 90.0
+    v = lon / 180.0
+    x2 = lon + u * 2
+    y2 = lat + v * 2
+    if extent is not None:
+        # int32: segment ends overshoot the tile by up to 2 degrees, beyond int16 at high zoom
+        sx, sy = extent / (lon_max - lon_min), extent / (lat_max - lat_min)
+        lon, x2 = (np.rint((a - lon_min) * sx).astype(np.int32) for a in (lon, x2))
+        lat, y2 = (np.rint((lat_max - a) * sy).astype(np.int32) for a in (lat, y2))
+    # Features are built in their encoded shape, ids included, so to_mvt copies nothing
+    return [{
+        "geometry": {
+            "type": "LineString",
+            "coordinates": [[lo, la], [xe, ye]]
+        },
+        "properties": {"u": uu, "v": vv},
+        "id": i
+    } for i, (lo, la, xe, ye, uu, vv) in enumerate(zip(*(a.ravel().tolist() for a in (lon, lat, x2, y2, u, v))), 1)]
 
 def to_mvt(z, x, y, features):
-    layer = mapbox_vector_tile.encode({
-        "currents": [{
-            "geometry": f["geometry"],
-            "properties": f["properties"],
-            "id": i+1
-        } for i,f in enumerate(features)]
-    }, quantize_bounds=None, extents=4096)
-    return layer
+    # features must already be in tile pixel coordinates (synth_vectors(..., extent=EXTENT))
+    return _encode({"name": "currents", "features": features}, default_options=_ENCODE_OPTIONS)
+
+def render_mvt(z, x, y, bounds=None):
+    lon_min, lat_min, lon_max, lat_max = bounds or tile_bounds(z,x,y)
+    feats = synth_vectors(lon_min, lat_min, lon_max, lat_max, step=10.0 if z<3 else 5.0, extent=EXTENT)
+    return to_mvt(z,x,y,feats)
+
+def render_and_write_tile(job):
+    z, x, y, bounds, fp = job
+    write_tile_file(fp, render_mvt(z, x, y, bounds))
+    return fp
+
+def render_tile_blob(job):
+    return job, render_mvt(*job)
+
+def write_mbtiles(path, zmin, zmax, coverage=None):
+    # Workers only encode; this process is the single SQLite writer
+    with MBTilesWriter(path, name="currents", fmt="pbf") as db, \
+            ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        for z in range(zmin, zmax+1):
+            n = 2 ** z
+            lon, lat = zoom_edges(z)
+            done = db.existing(z)
+            cov = coverage_at(coverage, z) if coverage is not None else None
+            jobs = [(z, x, y, (lon[x], lat[y+1], lon[x+1], lat[y]))
+                    for x in range(n) for y in range(n)
+                    if (x, y) not in done and (cov is None or cov[y, x])]
+            for (z, x, y, _), blob in pool.map(render_tile_blob, jobs, chunksize=64):
+                db.put(z, x, y, blob)
+            db.commit()
+            print(f"wrote z{z}: {len(jobs)} tiles ->", path)
 
 def main():
+    mbtiles = pop_mbtiles_arg(sys.argv)
+    coverage = pop_coverage_arg(sys.argv)
     if len(sys.argv) < 3:
-        print("Usage: python ingestion/make_currents_mvt.py <zmin> <zmax>")
+        print("Usage: python ingestion/make_currents_mvt.py <zmin> <zmax> [--mbtiles <out.mbtiles>] [--coverage <z8_mask.npy>]")
         return 1
     zmin = int(sys.argv[1]); zmax = int(sys.argv[2])
+    if mbtiles:
+        write_mbtiles(mbtiles, zmin, zmax, coverage)
+        print("Done.")
+        return 0
+    jobs = []
     for z in range(zmin, zmax+1):
         n = 2 ** z
+        lon, lat = zoom_edges(z)
+        # Tiles outside the coverage bitmap are never rendered; the server answers them with 204
+        cov = coverage_at(coverage, z) if coverage is not None else None
         for x in range(n):
+            if cov is not None and not cov[:, x].any(): continue
+            d = os.path.join(OUT_DIR, str(z), str(x))
+            os.makedirs(d, exist_ok=True)
+            # One directory listing instead of a stat per tile
+            done = {e.name for e in os.scandir(d)}
             for y in range(n):
-                d = os.path.join(OUT_DIR, str(z), str(x))
-                os.makedirs(d, exist_ok=True)
-                fp = os.path.join(d, f"{y}.mvt")
-                if os.path.exists(fp): continue
-                lon_min, lat_min, lon_max, lat_max = tile_bounds(z,x,y)
-                feats = synth_vectors(lon_min, lat_min, lon_max, lat_max, step=10.0 if z<3 else 5.0)
-                mvt = to_mvt(z,x,y,feats)
-                with open(fp, "wb") as f:
-                    f.write(mvt)
-                print("wrote", fp)
+                if f"{y}.mvt" in done: continue
+                if cov is not None and not cov[y, x]: continue
+                jobs.append((z, x, y, (lon[x], lat[y+1], lon[x+1], lat[y]), os.path.join(d, f"{y}.mvt")))
+    # Tiles are independent and CPU-bound (synthesis + protobuf encode)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        for fp in pool.map(render_and_write_tile, jobs, chunksize=64):
+            print("wrote", fp)
+    # One flush for the whole batch rather than per tile
+    os.sync()
     print("Done.")
     return 0
 
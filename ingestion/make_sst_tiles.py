@@ -8,75 +8,134 @@ This is a pragmatic, dev-friendly tiler (not optimized), suitable for small extr
 import os, sys, math, io
 import numpy as np
 import xarray as xr
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from PIL import Image, ImageDraw
+from ingestion.tile_math import lonlat_to_tile_xy, tile_bounds, zoom_edges
+from ingestion.tile_store import MBTilesWriter, pop_mbtiles_arg, write_tile_file
 
 OUT_DIR = os.path.join(os.path.dirname(__file__), "..", "tiles", "cache", "sst")
+# SST cells are upsampled as crisp blocks; set SST_TILE_SMOOTH=1 for PIL bilinear
+SMOOTH = os.getenv("SST_TILE_SMOOTH") == "1"
 
-def lonlat_to_tile_xy(lon, lat, z):
-    n = 2 ** z
-    x = (lon + 180.0) / 360.0 * n
-    y = (1.0 - math.log(math.tan(math.radians(lat)) + 1 / math.cos(math.radians(lat))) / math.pi) / 2.0 * n
-    return x, y
-
-def tile_bounds(z, x, y):
-    n = 2 ** z
-    lon_min = x / n * 360.0 - 180.0
-    lon_max = (x + 1) / n * 360.0 - 180.0
-    lat_min = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
-    lat_max = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
-    return lon_min, lat_min, lon_max, lat_max
+# Blue-to-red ramp as a 256-entry RGBA lookup table, indexed by quantized SST;
+# each entry is viewed as one uint32 so the lookup gathers whole pixels
+_LUT = np.empty((256, 4), dtype=np.uint8)
+_LUT[:, 0] = np.arange(256)
+_LUT[:, 1] = 128
+_LUT[:, 2] = 255 - _LUT[:, 0]
+_LUT[:, 3] = 255
+_LUT32 = _LUT.view(np.uint32).ravel()
 
 def colorize_sst(c):
     # Simple blue-to-red gradient for demo
-    # c in deg C; map 0..30 → blue..red
-    c = np.clip(c, 0, 30)
-    t = (c - 0) / 30.0
-    r = (t * 255).astype(np.uint8)
-    g = (128 * np.ones_like(r)).astype(np.uint8)
-    b = ((1 - t) * 255).astype(np.uint8)
-    a = (255 * (~np.isnan(c))).astype(np.uint8)
-    return np.dstack([r,g,b,a])
+    # c in deg C; map 0..30 → LUT index 0..255, then one gather builds the RGBA tile
+    nan = np.isnan(c)
+    t = np.multiply(c, np.float32(255 / 30.0), dtype=np.float32)
+    np.clip(t, 0, 255, out=t)
+    t[nan] = 0
+    px = np.take(_LUT32, t.astype(np.uint8))
+    px[nan] = 0  # transparent
+    return px.view(np.uint8).reshape(c.shape + (4,))
 
-def render_tile(ds, z, x, y):
-    lon_min, lat_min, lon_max, lat_max = tile_bounds(z,x,y)
+def prepare_sst(ds):
+    """Normalize the SST grid once per run: lon to -180..180 ascending, lat descending, loaded in memory"""
+    da = ds['sst'].squeeze(drop=True)
     # ERSST usually lon 0..360; convert to -180..180 if needed
-    da = ds['sst']
-    lons = da['lon'].values
-    # Ensure lons in -180..180
-    lons = ((lons + 180) % 360) - 180
-    da = da.assign_coords(lon=(('lon',), lons))
+    lons = ((da['lon'].values + 180) % 360) - 180
+    order = np.argsort(lons)
+    da = da.isel(lon=order).assign_coords(lon=lons[order])
+    # Rows run north to south so tiles come out the right way up
+    da = da.sortby('lat', ascending=False)
+    return da.load()
+
+def encode_png(img):
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", optimize=False, compress_level=1)
+    return buf.getvalue()
+
+# Tiles with no SST at all (land, or outside the grid) share one transparent PNG
+_EMPTY = Image.new("RGBA", (256,256), (0,0,0,0))
+_EMPTY_PNG = encode_png(_EMPTY)
+
+def render_tile(da, z, x, y, bounds=None):
+    lon_min, lat_min, lon_max, lat_max = bounds or tile_bounds(z,x,y)
     sub = da.sel(lon=slice(lon_min, lon_max), lat=slice(lat_max, lat_min))  # lat descending
-    if sub.size == 0:
-        img = Image.new("RGBA", (256,256), (0,0,0,0))
-        return img
     arr = sub.values
+    if arr.size == 0 or np.isnan(arr).all():
+        return _EMPTY
     # Normalize to 256x256
-    from PIL import Image
-    img_data = colorize_sst(arr.astype(float))
-    img = Image.fromarray(img_data).resize((256,256), Image.BILINEAR)
-    return img
+    img_data = colorize_sst(arr)
+    if SMOOTH:
+        return Image.fromarray(img_data).resize((256,256), Image.BILINEAR)
+    # Nearest-neighbour: repeat each cell as a block (count 0 decimates when the patch exceeds 256)
+    h, w = arr.shape
+    reps_y = np.bincount(np.arange(256) * h // 256, minlength=h)
+    reps_x = np.bincount(np.arange(256) * w // 256, minlength=w)
+    return Image.fromarray(np.repeat(np.repeat(img_data, reps_y, axis=0), reps_x, axis=1))
+
+def render_png(da, z, x, y, bounds=None):
+    img = render_tile(da, z, x, y, bounds)
+    return _EMPTY_PNG if img is _EMPTY else encode_png(img)
+
+def render_and_write_tile(da, job):
+    z, x, y, bounds, fp = job
+    write_tile_file(fp, render_png(da, z, x, y, bounds))
+    return fp
+
+def render_tile_blob(da, job):
+    return job, render_png(da, *job)
+
+def write_mbtiles(da, path, zmin, zmax):
+    with MBTilesWriter(path, name="sst", fmt="png") as db, \
+            ThreadPoolExecutor(max_workers=os.cpu_count() * 2) as pool:
+        for z in range(zmin, zmax+1):
+            n = 2 ** z
+            lon, lat = zoom_edges(z)
+            done = db.existing(z)
+            jobs = [(z, x, y, (lon[x], lat[y+1], lon[x+1], lat[y]))
+                    for x in range(n) for y in range(n) if (x, y) not in done]
+            for (z, x, y, _), blob in pool.map(partial(render_tile_blob, da), jobs):
+                db.put(z, x, y, blob)
+            db.commit()
+            print(f"wrote z{z}: {len(jobs)} tiles ->", path)
 
 def main():
+    mbtiles = pop_mbtiles_arg(sys.argv)
     if len(sys.argv) < 3:
-        print("Usage: python ingestion/make_sst_tiles.py <path/to/ersst.nc> <zoom_min> <zoom_max(optional)>")
+        print("Usage: python ingestion/make_sst_tiles.py <path/to/ersst.nc> <zoom_min> <zoom_max(optional)> [--mbtiles <out.mbtiles>]")
         return 1
     nc = sys.argv[1]
     zmin = int(sys.argv[2])
     zmax = int(sys.argv[3]) if len(sys.argv) > 3 else zmin
-    ds = xr.open_dataset(nc)
+    # Read lazily; only the normalized SST grid is loaded, once, for every tile
+    with xr.open_dataset(nc) as ds:
+        da = prepare_sst(ds)
+    if mbtiles:
+        write_mbtiles(da, mbtiles, zmin, zmax)
+        print("Done.")
+        return 0
     os.makedirs(OUT_DIR, exist_ok=True)
+    jobs = []
     for z in range(zmin, zmax+1):
         n = 2 ** z
+        lon, lat = zoom_edges(z)
         for x in range(n):
+            out = os.path.join(OUT_DIR, str(z), str(x))
+            os.makedirs(out, exist_ok=True)
+            # One directory listing instead of a stat per tile
+            done = {e.name for e in os.scandir(out)}
             for y in range(n):
-                out = os.path.join(OUT_DIR, str(z), str(x))
-                os.makedirs(out, exist_ok=True)
-                fp = os.path.join(out, f"{y}.png")
-                if os.path.exists(fp): 
+                if f"{y}.png" in done: 
                     continue
-                img = render_tile(ds, z, x, y)
-                img.save(fp, format="PNG")
-                print("wrote", fp)
+                jobs.append((z, x, y, (lon[x], lat[y+1], lon[x+1], lat[y]), os.path.join(out, f"{y}.png")))
+    # PIL releases the GIL while resizing and zlib-encoding, so threads scale
+    # without shipping the grid to worker processes
+    with ThreadPoolExecutor(max_workers=os.cpu_count() * 2) as pool:
+        for fp in pool.map(partial(render_and_write_tile, da), jobs):
+            print("wrote", fp)
+    # One flush for the whole batch rather than per tile
+    os.sync()
     print("Done.")
     return 0
 
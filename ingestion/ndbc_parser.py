@@ -5,77 +5,96 @@ NDBC realtime2 .txt parser
 - Handles comment headers (#), whitespace-delimited tables
 - Maps standard columns; extracts WTMP (water temp, °C) and position if present
 - Skips missing values (MM) and bad rows
+- Parses blocks of lines with pandas into typed columns; dicts are built only at the boundary
+- aiter_realtime2 does the same for a body streamed asynchronously (httpx aiter_lines)
 """
 from __future__ import annotations
-import datetime as dt
+import io
+from itertools import islice
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
 
-def _to_float(tok: str) -> float|None:
-    if tok in ("MM", "99.0", "99.00", "999.0", "999.0", "9999.0", "9999"):
-        return None
-    try:
-        return float(tok)
-    except Exception:
-        return None
+_MISSING = ["MM", "99.0", "99.00", "999.0", "9999.0", "9999"]
+# Lines handed to each read_csv call, so a streamed file is parsed in bounded memory
+_BLOCK_LINES = 50000
 
-def parse_realtime2(text: str, station_id: str) -> list[dict]:
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    # Find header line (last line starting with # or the first non-# line)
-    header = None
-    data_start_idx = 0
-    for i, ln in enumerate(lines):
-        if ln.startswith("#"):
-            header = ln.lstrip("#").strip()
-            data_start_idx = i + 1
-        else:
-            if header is None:
-                header = ln
-                data_start_idx = i + 1
-                break
-            else:
-                break
+def parse_realtime2_frames(lines: Iterable[str], station_id: str) -> Iterator[pd.DataFrame]:
+    """Yield buoy_obs-shaped DataFrames (station_id, time, sst_c, qc_flag, lat, lon, source)"""
+    it = (ln for ln in lines if ln.strip())
+    header = next(it, None)
     if header is None:
-        return []
-    cols = header.split()
-    # Common first columns: YYYY MM DD hh mm ...  (some files use YY instead of YYYY)
-    out = []
-    for ln in lines[data_start_idx:]:
-        if ln.startswith("#"):
-            continue
-        toks = ln.split()
-        if len(toks) < len(cols):
-            # some rows may be short; skip
-            continue
-        row = dict(zip(cols, toks))
-        # Build timestamp (prefer YYYY else YY)
-        try:
-            if "YYYY" in cols:
-                y = int(row.get("YYYY"))
-            else:
-                y = 2000 + int(row.get("YY"))
-            M = int(row.get("MM", "1"))
-            d = int(row.get("DD", "1"))
-            hh = int(row.get("hh", "0"))
-            mm = int(row.get("mm", "0"))
-            t = dt.datetime(y, M, d, hh, mm, tzinfo=dt.timezone.utc)
-        except Exception:
-            continue
-        # Water temperature
-        wtmp = _to_float(row.get("WTMP", "MM"))
-        # Position: some realtime2 files include latitude/longitude columns; if not, set None
-        lat = _to_float(row.get("LAT", row.get("latitude", "MM")))
-        lon = _to_float(row.get("LON", row.get("longitude", "MM")))
-        # Air temp as a fallback (not used for SST but kept for future)
-        # atmp = _to_float(row.get("ATMP", "MM"))
-        if wtmp is None:
-            # no SST, skip
-            continue
-        out.append({
+        return
+    # Column names come first, with or without '#'; a second '#' line carries units
+    cols = header.strip().lstrip("#").split()
+    year = "YYYY" if "YYYY" in cols else "YY"
+    if year not in cols or "WTMP" not in cols:
+        # no timestamp or no SST column: nothing to extract
+        return
+    parts = {year: "year", "MM": "month", "DD": "day", "hh": "hour", "mm": "minute"}
+    # Position: some realtime2 files include latitude/longitude columns; if not, set None
+    lat = "LAT" if "LAT" in cols else "latitude"
+    lon = "LON" if "LON" in cols else "longitude"
+    usecols = [c for c in (*parts, "WTMP", lat, lon) if c in cols]
+
+    while True:
+        block = list(islice(it, _BLOCK_LINES))
+        if not block:
+            return
+        df = pd.read_csv(
+            io.StringIO("\n".join(block)), sep=r"\s+", header=None, names=cols, usecols=usecols,
+            comment="#", na_values=_MISSING, on_bad_lines="skip",
+        )
+        for c in df.columns:
+            if not is_numeric_dtype(df[c]):
+                # a stray token left the column unparsed; coerce it like any missing value
+                df[c] = pd.to_numeric(df[c], errors="coerce")
+        # Two-digit years are 20YY; realtime2 "#YY" files carry four
+        df[year] = df[year].where(df[year] >= 100, df[year] + 2000)
+        stamp = df[[c for c in parts if c in df]].rename(columns=parts)
+        for name, default in (("month", 1), ("day", 1), ("hour", 0), ("minute", 0)):
+            if name not in stamp:
+                stamp[name] = default
+        time = pd.to_datetime(stamp, errors="coerce", utc=True)
+        keep = time.notna() & df["WTMP"].notna()
+        yield pd.DataFrame({
             "station_id": station_id,
-            "time": t,
-            "sst_c": wtmp,
+            "time": time[keep],
+            "sst_c": df["WTMP"][keep],
             "qc_flag": 0,
-            "lat": lat if lat is not None else 0.0,
-            "lon": lon if lon is not None else 0.0,
-            "source": "NDBC"
+            "lat": df[lat][keep].fillna(0.0) if lat in df else 0.0,
+            "lon": df[lon][keep].fillna(0.0) if lon in df else 0.0,
+            "source": "NDBC",
         })
-    return out
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    names = list(df.columns)
+    columns = [df[c].to_numpy().tolist() for c in names]
+    columns[names.index("time")] = df["time"].dt.to_pydatetime().tolist()
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+def iter_realtime2(lines: Iterable[str], station_id: str) -> Iterator[dict]:
+    """Parse rows a block at a time, so a streamed download is never held whole"""
+    for df in parse_realtime2_frames(lines, station_id):
+        yield from _records(df)
+
+async def aiter_realtime2(lines: AsyncIterable[str], station_id: str) -> AsyncIterator[list[dict]]:
+    """Yield the rows of a streamed body one block at a time, so it is never held whole"""
+    header = None
+    block = []
+    async for ln in lines:
+        if not ln.strip():
+            continue
+        if header is None:
+            header = ln
+            continue
+        block.append(ln)
+        if len(block) == _BLOCK_LINES:
+            yield parse_realtime2([header, *block], station_id)
+            block = []
+    if block:
+        yield parse_realtime2([header, *block], station_id)
+
+def parse_realtime2(text: str | Iterable[str], station_id: str) -> list[dict]:
+    lines = text.splitlines() if isinstance(text, str) else text
+    return list(iter_realtime2(lines, station_id))
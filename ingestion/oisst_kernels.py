@@ -0,0 +1,46 @@
+# SPDX-License-Identifier: MIT
+# © 2024–2025 Mark Lindon — BlueSphere
+"""
+Numba kernel for OISST daily 1° aggregation.
+- bin_daily: one pass over the (lat, lon) grid that tests each cell and
+  accumulates count / sum / min / max into its bin, then a second pass for the
+  squared deviations behind the std
+Serial: the ingester already processes several days at once, in a process pool
+for downloaded files, so days are parallel without a numba threading layer.
+nogil matters for days read from the Zarr store, which run in worker threads:
+they bin concurrently, and a threading layer would not be safe to enter from
+several threads (TBB also hangs at exit when first used off the main thread).
+Compiled with cache=True so only the first run on a machine pays the JIT cost.
+"""
+from __future__ import annotations
+from numba import njit
+
+# No fastmath here: float grids mark missing cells with NaN, which must fail the range test
+@njit(nogil=True, cache=True)
+def bin_daily(sst, lo, hi, lat_idx, lon_idx, n_lon_bins, counts, sums, mins, maxs, sqdev):
+    """
+    sst: (lat, lon) grid, integer or float; cells outside lo..hi (and NaN) are skipped
+    lat_idx / lon_idx: bin index of each grid row / column
+    Accumulators are flat (lat bin * n_lon_bins + lon bin), preset to 0 / +inf / -inf.
+    """
+    n_rows, n_cols = sst.shape
+    for i in range(n_rows):
+        base = lat_idx[i] * n_lon_bins
+        for j in range(n_cols):
+            v = sst[i, j]
+            if not (v >= lo and v <= hi):
+                continue
+            k = base + lon_idx[j]
+            counts[k] += 1
+            sums[k] += v
+            mins[k] = min(mins[k], v)
+            maxs[k] = max(maxs[k], v)
+    for i in range(n_rows):
+        base = lat_idx[i] * n_lon_bins
+        for j in range(n_cols):
+            v = sst[i, j]
+            if not (v >= lo and v <= hi):
+                continue
+            k = base + lon_idx[j]
+            d = v - sums[k] / counts[k]
+            sqdev[k] += d * d
@@ -9,11 +9,15 @@ from NOAA into the temporal temperature database. Supports both full historical
 """
 
 import os
+import io
 import sys
 import re
-import tempfile
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, date, timezone
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
 import argparse
 import logging
@@ -22,7 +26,8 @@ import httpx
 import xarray as xr
 import numpy as np
 import pandas as pd
-from sqlalchemy.dialects.postgresql import insert
+import pyarrow as pa
+from sqlalchemy import bindparam, text
 from tqdm import tqdm
 
 # Add parent directory to path for imports
@@ -31,15 +36,104 @@ sys.path.append(str(Path(__file__).parent.parent))
 from backend.db import get_session, get_engine
 from backend.models import (
     TemporalTemperatureGrid, 
-    TemporalTemperatureMonthly, 
-    JobRun
+    JobRun,
+    SST_CENTI
 )
 from backend.temporal_db import TemporalDataManager
+from ingestion.bulk_copy import copy_upsert
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Concurrent file downloads; ERSST files are ~1 MB, so latency rather than bandwidth bounds a backfill
+FETCH_CONCURRENCY = int(os.getenv("ERSST_FETCH_CONCURRENCY", "16"))
+_LIMITS = httpx.Limits(max_keepalive_connections=FETCH_CONCURRENCY, max_connections=2 * FETCH_CONCURRENCY)
+_TIMEOUT = httpx.Timeout(300, connect=10)
+# Attempts per file, with exponential backoff between them; transient statuses and dropped connections are retried
+FETCH_RETRIES = int(os.getenv("ERSST_FETCH_RETRIES", "5"))
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+# ERSST filenames in the index page, matched on the raw bytes (no decode of the listing)
+_ERSST_RE = re.compile(rb'ersst\.v5\.(\d{6})\.nc')
+
+# Files from earlier runs; each file's mtime is the server's Last-Modified, sent back as If-Modified-Since
+CACHE_DIR = Path(os.getenv("ERSST_CACHE_DIR", Path.home() / ".cache" / "bluesphere" / "ersst"))
+# Queued in place of parsed data for files the server reports unchanged (304)
+_NOT_MODIFIED = object()
+
+# Months parsed, aggregated and loaded together as one (month, lat, lon) stack and one COPY
+BATCH_MONTHS = int(os.getenv("ERSST_BATCH_MONTHS", "12"))
+# Batches downloaded, parsed or waiting for the writer at once: enough to keep every
+# parser process busy, while bounding the downloaded bytes and parsed grids held in memory
+BATCHES_IN_FLIGHT = int(os.getenv("ERSST_BATCHES_IN_FLIGHT", str(os.cpu_count() or 2)))
+# Files ingested per transaction commit; each batch still gets its own savepoint
+COMMIT_EVERY = int(os.getenv("ERSST_COMMIT_EVERY", "50"))
+
+# temporal_temperature_grid column types, as binary COPY needs them. Batches are held
+# narrower (float32 coordinates) and widened only here; SST is already smallint hundredths.
+# dataset, resolution and quality_flag are the same for a whole batch, so they are set once
+# in the merge instead of sent per row.
+_GRID_COPY_SCHEMA = pa.schema([
+    ('date', pa.date32()),
+    ('lat', pa.float64()),
+    ('lon', pa.float64()),
+    ('sst_centi_c', pa.int16()),
+])
+
+
+# Normalized grid layouts by raw coordinates; every ERSST v5 file shares one grid,
+# so each process computes the layout once and reuses it for every later batch
+_GRID_LAYOUTS: Dict[Tuple[bytes, bytes], Tuple[np.ndarray, np.ndarray, Optional[np.ndarray], str]] = {}
+
+
+def _grid_layout(lats: np.ndarray, lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray], str]:
+    """(lats, lons in -180..180 ascending, reorder index for the lon axis or None, resolution string)"""
+    key = (lats.dtype.str.encode() + lats.tobytes(), lons.dtype.str.encode() + lons.tobytes())
+    layout = _GRID_LAYOUTS.get(key)
+    if layout is None:
+        lon_order = None
+        # Convert longitude from 0-360 to -180-180 if needed
+        if np.max(lons) > 180:
+            lons = ((lons + 180) % 360) - 180
+            lon_order = np.argsort(lons)
+            lons = lons[lon_order]
+        resolution = f"{abs(lats[1] - lats[0]):.2f}x{abs(lons[1] - lons[0]):.2f}"
+        layout = _GRID_LAYOUTS[key] = (lats, lons, lon_order, resolution)
+    return layout
+
+
+# Monthly summary per 1° bin, aggregated from the grid rows of the given months.
+# Population std (0 for a single cell); ROUND on double precision rounds half to even, as np.round did.
+# Statistics are taken over the stored hundredths and scaled to °C once per bin.
+_MONTHLY_FROM_GRID = text("""
+    INSERT INTO temporal_temperature_monthly
+    (id, year, month, lat_bin, lon_bin, avg_sst_c, min_sst_c, max_sst_c, std_sst_c, count, dataset)
+    SELECT
+        gen_random_uuid(),
+        EXTRACT(YEAR FROM date)::int,
+        EXTRACT(MONTH FROM date)::int,
+        ROUND(lat) as lat_bin,
+        ROUND(lon) as lon_bin,
+        AVG(sst_centi_c)::float8 / {scale},
+        MIN(sst_centi_c)::float8 / {scale},
+        MAX(sst_centi_c)::float8 / {scale},
+        STDDEV_POP(sst_centi_c)::float8 / {scale},
+        COUNT(*),
+        dataset
+    FROM temporal_temperature_grid
+    WHERE dataset = :dataset
+        AND date IN :dates
+        AND sst_centi_c IS NOT NULL
+    GROUP BY date, ROUND(lat), ROUND(lon), dataset
+    ON CONFLICT ON CONSTRAINT uq_temp_monthly_location DO UPDATE SET
+        avg_sst_c = EXCLUDED.avg_sst_c,
+        min_sst_c = EXCLUDED.min_sst_c,
+        max_sst_c = EXCLUDED.max_sst_c,
+        std_sst_c = EXCLUDED.std_sst_c,
+        count = EXCLUDED.count
+""".format(scale=SST_CENTI)).bindparams(bindparam('dates', expanding=True))
+
+
 class ERSSTIngester:
     """Enhanced ERSST v5 data ingestion pipeline"""
     
@@ -47,6 +141,16 @@ class ERSSTIngester:
         self.base_url = os.getenv("ERSST_BASE", "https://www.ncei.noaa.gov/pub/data/cmb/ersst/v5/netcdf")
         self.session = get_session()
         self.data_manager = TemporalDataManager()
+        # One pooled HTTP/2 client for the index and every file, so the TLS connection to NCEI is reused
+        self.client = httpx.Client(base_url=self.base_url, http2=True, timeout=_TIMEOUT, limits=_LIMITS)
+        self._files_since_commit = 0
+        # (filename, content, Last-Modified) of files ingested but not yet committed
+        self._pending_cache: List[Tuple[str, bytes, Optional[str]]] = []
+    
+    def close(self):
+        """Close the HTTP client and database session"""
+        self.client.close()
+        self.session.close()
         
     def discover_available_files(self, start_year: int = 1854, end_year: Optional[int] = None) -> List[str]:
         """
@@ -65,26 +169,18 @@ class ERSSTIngester:
         logger.info(f"Discovering ERSST files from {start_year} to {end_year}")
         
         try:
-            with httpx.Client(timeout=60) as client:
-                response = client.get(self.base_url)
-                response.raise_for_status()
-                index_content = response.text
+            response = self.client.get("", timeout=60)
+            response.raise_for_status()
+            index_content = response.content
         except Exception as e:
             logger.error(f"Failed to fetch ERSST index: {e}")
             return []
         
-        # Find all ERSST NetCDF files
-        pattern = r'ersst\.v5\.(\d{6})\.nc'
-        matches = re.findall(pattern, index_content)
+        # Find all ERSST NetCDF files; the listing names each file twice (link and text)
+        months = {int(m.group(1)) for m in _ERSST_RE.finditer(index_content)}
+        available_files = [f"ersst.v5.{yyyymm}.nc" for yyyymm in sorted(months)
+                           if start_year <= yyyymm // 100 <= end_year]
         
-        available_files = []
-        for yyyymm in matches:
-            year = int(yyyymm[:4])
-            if start_year <= year <= end_year:
-                filename = f"ersst.v5.{yyyymm}.nc"
-                available_files.append(filename)
-        
-        available_files.sort()
         logger.info(f"Found {len(available_files)} ERSST files")
         return available_files
     
@@ -98,37 +194,24 @@ class ERSSTIngester:
         Returns:
             Dictionary with processed data or None if failed
         """
-        url = f"{self.base_url}/{filename}"
         logger.info(f"Processing {filename}")
         
         try:
-            # Download to temporary file
-            with tempfile.NamedTemporaryFile(suffix='.nc', delete=False) as tmp_file:
-                with httpx.stream("GET", url, timeout=300) as response:
-                    response.raise_for_status()
-                    total_size = int(response.headers.get('content-length', 0))
-                    
-                    with tqdm(total=total_size, unit='B', unit_scale=True, desc=filename) as pbar:
-                        for chunk in response.iter_bytes(chunk_size=8192):
-                            tmp_file.write(chunk)
-                            pbar.update(len(chunk))
-                
-                tmp_file_path = tmp_file.name
+            # Download into memory in one read; files are ~1 MB, too small for a progress bar
+            response = self.client.get(filename)
+            response.raise_for_status()
             
             # Process NetCDF file with xarray
-            with xr.open_dataset(tmp_file_path) as ds:
-                processed_data = self._process_ersst_dataset(ds, filename)
-            
-            # Clean up temporary file
-            os.unlink(tmp_file_path)
-            
+            processed_data = parse_ersst_bytes([response.content], [filename])
+            processed_data['downloads'] = [(filename, response.content, response.headers.get('Last-Modified'))]
             return processed_data
             
         except Exception as e:
             logger.error(f"Failed to process {filename}: {e}")
             return None
     
-    def _process_ersst_dataset(self, ds: xr.Dataset, filename: str) -> Dict[str, Any]:
+    @staticmethod
+    def _process_ersst_dataset(ds: xr.Dataset, filename: str) -> Dict[str, Any]:
         """
         Process ERSST xarray dataset into database-ready format.
         
@@ -139,100 +222,83 @@ class ERSSTIngester:
         Returns:
             Dictionary with processed data
         """
-        # Extract date from filename (ersst.v5.YYYYMM.nc)
-        yyyymm = filename.split('.')[2]
-        year = int(yyyymm[:4])
-        month = int(yyyymm[4:])
-        data_date = date(year, month, 1)
-        
-        # Get SST data (usually 'sst' variable)
-        sst_var = 'sst'
-        if sst_var not in ds.data_vars:
-            # Try alternative variable names
-            for alt_name in ['SST', 'temperature', 'temp']:
-                if alt_name in ds.data_vars:
-                    sst_var = alt_name
-                    break
-        
-        if sst_var not in ds.data_vars:
-            raise ValueError(f"Could not find SST variable in {filename}")
+        return ERSSTIngester._process_ersst_datasets([ds], [filename])
+    
+    @staticmethod
+    def _process_ersst_datasets(datasets: List[xr.Dataset], filenames: List[str]) -> Dict[str, Any]:
+        """
+        Process several monthly ERSST datasets on the same grid in one vectorized
+        pass over a (month, lat, lon) stack.
         
-        sst_data = ds[sst_var].squeeze()  # Remove any singleton dimensions
+        Args:
+            datasets: xarray Datasets, one per month
+            filenames: Source filenames, in the same order
+            
+        Returns:
+            Dictionary with processed data for all months
+        """
+        # Extract dates from filenames (ersst.v5.YYYYMM.nc)
+        dates = []
+        for filename in filenames:
+            year, month = divmod(int(filename.split('.')[2]), 100)
+            dates.append(date(year, month, 1))
         
-        # Get coordinates
-        lat_coord = sst_data.coords['lat'] if 'lat' in sst_data.coords else sst_data.coords['latitude']
-        lon_coord = sst_data.coords['lon'] if 'lon' in sst_data.coords else sst_data.coords['longitude']
+        grids = []
+        for ds, filename in zip(datasets, filenames):
+            # Get SST data (usually 'sst' variable)
+            sst_var = 'sst'
+            if sst_var not in ds.data_vars:
+                # Try alternative variable names
+                for alt_name in ['SST', 'temperature', 'temp']:
+                    if alt_name in ds.data_vars:
+                        sst_var = alt_name
+                        break
+            
+            if sst_var not in ds.data_vars:
+                raise ValueError(f"Could not find SST variable in {filename}")
+            
+            sst_data = ds[sst_var].squeeze()  # Remove any singleton dimensions
+            
+            # Get coordinates
+            lat_coord = sst_data.coords['lat'] if 'lat' in sst_data.coords else sst_data.coords['latitude']
+            lon_coord = sst_data.coords['lon'] if 'lon' in sst_data.coords else sst_data.coords['longitude']
+            
+            if not grids:
+                lats = lat_coord.values
+                lons = lon_coord.values
+            elif not (np.array_equal(lat_coord.values, lats) and np.array_equal(lon_coord.values, lons)):
+                raise ValueError(f"{filename} is not on the same grid as {filenames[0]}")
+            grids.append(sst_data.values)
         
-        lats = lat_coord.values
-        lons = lon_coord.values
+        sst_values = np.stack(grids)
         
-        # Convert longitude from 0-360 to -180-180 if needed
-        if np.max(lons) > 180:
-            lons = ((lons + 180) % 360) - 180
+        lats, lons, lon_order, resolution = _grid_layout(lats, lons)
+        if lon_order is not None:
             # Reorder data to match new longitude order
-            lon_order = np.argsort(lons)
-            lons = lons[lon_order]
-            sst_data = sst_data[:, lon_order] if sst_data.ndim == 2 else sst_data[lon_order]
+            sst_values = sst_values[..., lon_order]
         
-        # Get SST values and handle missing data
-        sst_values = sst_data.values
+        # Valid cells only, as flat column arrays: one vectorized pass instead of a Python loop per cell.
+        # Fill values and unrealistic temperatures (below -10°C or above 50°C) are dropped by the
+        # same comparisons, which are False for NaN, so the grid is never rewritten with NaNs.
+        tt, ii, jj = np.nonzero((sst_values >= -10) & (sst_values <= 50))
+        lat_arr = lats[ii].astype(np.float32)
+        lon_arr = lons[jj].astype(np.float32)
+        # Stored as smallint hundredths of a degree (-1000..5000 here, well inside int16)
+        sst_arr = np.round(sst_values[tt, ii, jj] * SST_CENTI).astype(np.int16)
         
-        # Replace fill values and unrealistic temperatures with NaN
-        sst_values = np.where(sst_values < -10, np.nan, sst_values)  # Below -10°C is unrealistic for SST
-        sst_values = np.where(sst_values > 50, np.nan, sst_values)   # Above 50°C is unrealistic
-        
-        # Prepare grid data
-        grid_records = []
-        monthly_aggregates = {}
-        
-        # Process each grid point
-        for i, lat in enumerate(lats):
-            for j, lon in enumerate(lons):
-                sst_val = float(sst_values[i, j]) if not np.isnan(sst_values[i, j]) else None
-                
-                if sst_val is not None:
-                    # Grid record
-                    grid_records.append({
-                        'date': data_date,
-                        'lat': float(lat),
-                        'lon': float(lon),
-                        'sst_c': sst_val,
-                        'dataset': 'ERSST',
-                        'resolution': f"{abs(lats[1] - lats[0]):.2f}x{abs(lons[1] - lons[0]):.2f}",
-                        'quality_flag': 0,
-                        'created_at': datetime.now(timezone.utc)
-                    })
-                    
-                    # Aggregate for monthly summary (bin to nearest degree for efficiency)
-                    lat_bin = round(float(lat))
-                    lon_bin = round(float(lon))
-                    key = (lat_bin, lon_bin)
-                    
-                    if key not in monthly_aggregates:
-                        monthly_aggregates[key] = []
-                    monthly_aggregates[key].append(sst_val)
-        
-        # Calculate monthly aggregates
-        monthly_records = []
-        for (lat_bin, lon_bin), temps in monthly_aggregates.items():
-            monthly_records.append({
-                'year': year,
-                'month': month,
-                'lat_bin': lat_bin,
-                'lon_bin': lon_bin,
-                'avg_sst_c': np.mean(temps),
-                'min_sst_c': np.min(temps),
-                'max_sst_c': np.max(temps),
-                'std_sst_c': np.std(temps) if len(temps) > 1 else 0.0,
-                'count': len(temps),
-                'dataset': 'ERSST'
-            })
+        # Prepare grid data as compact Arrow columns; ingest_processed_data widens them for COPY
+        grid = pa.table({
+            'date': np.array(dates, dtype='datetime64[D]')[tt],
+            'lat': lat_arr,
+            'lon': lon_arr,
+            'sst_centi_c': sst_arr
+        })
         
         return {
-            'date': data_date,
-            'filename': filename,
-            'grid_records': grid_records,
-            'monthly_records': monthly_records,
+            'dates': dates,
+            'filenames': filenames,
+            'grid': grid,
+            'resolution': resolution,
             'spatial_bounds': {
                 'lat_min': float(np.min(lats)),
                 'lat_max': float(np.max(lats)),
@@ -245,6 +311,9 @@ class ERSSTIngester:
         """
         Ingest processed data into database.
         
+        Each call runs in a savepoint, so a failure undoes only this batch; the
+        transaction is committed every COMMIT_EVERY files (see commit_pending).
+        
         Args:
             processed_data: Dictionary with processed ERSST data
             
@@ -252,52 +321,233 @@ class ERSSTIngester:
             True if successful, False otherwise
         """
         try:
-            # Insert grid data in batches
-            grid_records = processed_data['grid_records']
-            if grid_records:
-                batch_size = 1000
-                for i in range(0, len(grid_records), batch_size):
-                    batch = grid_records[i:i+batch_size]
-                    
-                    stmt = insert(TemporalTemperatureGrid).values(batch)
-                    stmt = stmt.on_conflict_do_update(
-                        constraint='uq_temp_grid_date_location',
-                        set_={
-                            'sst_c': stmt.excluded.sst_c,
-                            'quality_flag': stmt.excluded.quality_flag,
-                            'created_at': stmt.excluded.created_at
-                        }
+            with self.session.begin_nested():
+                # COPY grid data through a staging table, then upsert on uq_temp_grid_date_location
+                grid = processed_data['grid']
+                if grid.num_rows:
+                    copy_upsert(
+                        self.session.connection(),
+                        TemporalTemperatureGrid.__tablename__,
+                        grid.cast(_GRID_COPY_SCHEMA),
+                        conflict_cols=['date', 'lat', 'lon', 'dataset'],
+                        update_cols=['sst_centi_c', 'quality_flag', 'created_at'],
+                        # Per-batch constants and the load transaction's timestamp are set by the server
+                        # rather than sent per row; resolution is formatted from numbers, so safe to inline
+                        defaults={
+                            'id': 'gen_random_uuid()',
+                            'dataset': "'ERSST'",
+                            'resolution': f"'{processed_data['resolution']}'",
+                            'quality_flag': '0',
+                            'created_at': "now() AT TIME ZONE 'utc'"
+                        },
+                        binary=True
                     )
-                    
-                    self.session.execute(stmt)
-                
-                logger.info(f"Inserted {len(grid_records)} grid records")
+                    logger.info(f"Inserted {grid.num_rows} grid records")
             
-            # Insert monthly aggregates
-            monthly_records = processed_data['monthly_records']
-            if monthly_records:
-                stmt = insert(TemporalTemperatureMonthly).values(monthly_records)
-                stmt = stmt.on_conflict_do_update(
-                    constraint='uq_temp_monthly_location',
-                    set_={
-                        'avg_sst_c': stmt.excluded.avg_sst_c,
-                        'min_sst_c': stmt.excluded.min_sst_c,
-                        'max_sst_c': stmt.excluded.max_sst_c,
-                        'std_sst_c': stmt.excluded.std_sst_c,
-                        'count': stmt.excluded.count
-                    }
-                )
-                
-                self.session.execute(stmt)
-                logger.info(f"Inserted {len(monthly_records)} monthly aggregate records")
-            
-            self.session.commit()
-            return True
+                # Monthly aggregates (1° bins), computed by Postgres from the rows just loaded
+                result = self.session.execute(_MONTHLY_FROM_GRID, {'dates': processed_data['dates'], 'dataset': 'ERSST'})
+                logger.info(f"Inserted {result.rowcount} monthly aggregate records")
             
         except Exception as e:
             logger.error(f"Failed to ingest data: {e}")
-            self.session.rollback()
             return False
+        
+        self._files_since_commit += len(processed_data['filenames'])
+        self._pending_cache.extend(processed_data.get('downloads', ()))
+        if self._files_since_commit >= COMMIT_EVERY:
+            self.commit_pending()
+        return True
+    
+    def commit_pending(self):
+        """Commit batches ingested since the last commit, then cache their files"""
+        if not self._files_since_commit:
+            return
+        pending, self._pending_cache = self._pending_cache, []
+        try:
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        finally:
+            self._files_since_commit = 0
+        # Only committed files are cached, so a failed load is downloaded again rather than skipped as unchanged
+        for filename, content, last_modified in pending:
+            try:
+                _cache_file(filename, content, last_modified)
+            except OSError as e:
+                logger.warning(f"Failed to cache {filename}: {e}")
+    
+    def ingest_files(self, filenames: List[str]) -> Tuple[int, int]:
+        """
+        Download, process and ingest files concurrently.
+        
+        Downloads run FETCH_CONCURRENCY at a time over one pooled HTTP/2 client,
+        each BATCH_MONTHS files are parsed and aggregated together in a process
+        pool, and a single writer ingests the batches so the database session
+        stays on one thread.
+        
+        Returns:
+            (success_count, error_count)
+        """
+        try:
+            return asyncio.run(self._ingest_files_async(filenames))
+        finally:
+            self.commit_pending()
+    
+    async def _ingest_files_async(self, filenames: List[str]) -> Tuple[int, int]:
+        loop = asyncio.get_running_loop()
+        sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+        batch_slots = asyncio.Semaphore(BATCHES_IN_FLIGHT)
+        # Hand-off to the writer; memory is bounded by batch_slots, held until a batch is queued
+        queue: asyncio.Queue = asyncio.Queue(maxsize=4)
+        counts = [0, 0]
+        
+        async def download(client: httpx.AsyncClient, filename: str) -> Optional[Tuple[bytes, Optional[str]]]:
+            async with sem:
+                return await self._download_async(client, filename)
+        
+        async def fetch_and_parse(client: httpx.AsyncClient, pool: ProcessPoolExecutor, batch: List[str]):
+            # Every batch starts at once, so the slot (not the queue) limits how many hold their files
+            async with batch_slots:
+                await fetch_and_parse_batch(client, pool, batch)
+        
+        async def fetch_and_parse_batch(client: httpx.AsyncClient, pool: ProcessPoolExecutor, batch: List[str]):
+            results = await asyncio.gather(*(download(client, f) for f in batch), return_exceptions=True)
+            fetched, unchanged = [], []
+            for filename, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to process {filename}: {result}")
+                    await queue.put(([filename], None))
+                elif result is None:
+                    unchanged.append(filename)
+                else:
+                    fetched.append((filename, *result))
+            if unchanged:
+                await queue.put((unchanged, _NOT_MODIFIED))
+            if fetched:
+                await parse(pool, fetched)
+        
+        async def parse(pool: ProcessPoolExecutor, fetched: List[Tuple[str, bytes, Optional[str]]]):
+            names = [f for f, _, _ in fetched]
+            processed_data = None
+            try:
+                processed_data = await loop.run_in_executor(pool, parse_ersst_bytes, [c for _, c, _ in fetched], names)
+                processed_data['downloads'] = fetched
+            except Exception as e:
+                if len(fetched) > 1:
+                    # One corrupt or truncated month fails the whole stack: parse the files
+                    # one by one, so only the bad month is lost
+                    logger.warning(f"Failed to process {names[0]}..{names[-1]} together, retrying each file: {e}")
+                    await asyncio.gather(*(parse(pool, [item]) for item in fetched))
+                    return
+                logger.error(f"Failed to process {names[0]}: {e}")
+            await queue.put((names, processed_data))
+        
+        def rolled_back(files: int, error: Exception):
+            # A failed commit is rolled back: the files ingested since the previous commit are lost
+            logger.error(f"Commit failed, rolled back {files} previously ingested files: {error}")
+            counts[0] -= files
+            counts[1] += files
+        
+        async def writer():
+            # Per-file progress only on a terminal; cron and container runs log instead
+            with tqdm(total=len(filenames), desc="Processing ERSST files", disable=not sys.stderr.isatty()) as pbar:
+                while (item := await queue.get()) is not None:
+                    names, processed_data = item
+                    if processed_data is None:
+                        counts[1] += len(names)
+                    elif processed_data is _NOT_MODIFIED:
+                        # Already ingested from the cached copy; nothing to parse or load
+                        counts[0] += len(names)
+                        logger.debug(f"Unchanged since last run: {', '.join(names)}")
+                    else:
+                        # Files counted as ingested but not yet committed
+                        uncommitted = self._files_since_commit
+                        try:
+                            ok = await asyncio.to_thread(self.ingest_processed_data, processed_data)
+                        except Exception as e:
+                            # Raised only by the periodic commit, which also lost this batch
+                            rolled_back(uncommitted, e)
+                            ok = False
+                        if ok:
+                            counts[0] += len(names)
+                        else:
+                            counts[1] += len(names)
+                            logger.error(f"Failed to ingest {names[0]}..{names[-1]}")
+                    pbar.update(len(names))
+                uncommitted = self._files_since_commit
+                try:
+                    await asyncio.to_thread(self.commit_pending)
+                except Exception as e:
+                    rolled_back(uncommitted, e)
+        
+        batches = [filenames[i:i + BATCH_MONTHS] for i in range(0, len(filenames), BATCH_MONTHS)]
+        with ProcessPoolExecutor() as pool:
+            async with httpx.AsyncClient(base_url=self.base_url, http2=True, timeout=_TIMEOUT, limits=_LIMITS) as client:
+                writer_task = asyncio.create_task(writer())
+                producers = asyncio.gather(*(fetch_and_parse(client, pool, b) for b in batches))
+                await asyncio.wait({producers, writer_task}, return_when=asyncio.FIRST_COMPLETED)
+                if writer_task.done():
+                    # The writer stopped early on an unexpected error: the producers would block
+                    # forever on the full queue, so cancel them and raise it
+                    producers.cancel()
+                    await asyncio.gather(producers, return_exceptions=True)
+                    writer_task.result()
+                await producers
+                await queue.put(None)
+                await writer_task
+        return counts[0], counts[1]
+    
+    async def _download_async(self, client: httpx.AsyncClient, filename: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        """
+        Fetch one file into memory as (content, Last-Modified), or None when the
+        cached copy is still current (304 Not Modified). Dropped connections and
+        transient statuses are retried up to FETCH_RETRIES times, resuming with a
+        Range request, and the body must match Content-Length.
+        """
+        headers = {}
+        cached = CACHE_DIR / filename
+        if cached.exists():
+            headers['If-Modified-Since'] = formatdate(cached.stat().st_mtime, usegmt=True)
+        body = bytearray()
+        total = last_modified = None
+        resumable = False
+        error: Exception = RuntimeError(f"No attempts made for {filename}")
+        for attempt in range(FETCH_RETRIES):
+            if attempt:
+                await asyncio.sleep(min(2 ** attempt, 30))
+            request_headers = dict(headers)
+            if body and resumable:
+                # Continue an interrupted transfer, unless the file changed since the first response
+                request_headers['Range'] = f'bytes={len(body)}-'
+                request_headers['If-Range'] = last_modified
+            try:
+                async with client.stream('GET', filename, headers=request_headers) as response:
+                    if response.status_code == 304:
+                        return None
+                    if response.status_code in _RETRY_STATUS:
+                        error = httpx.HTTPStatusError(f"{response.status_code} for {filename}",
+                                                      request=response.request, response=response)
+                        continue
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        # A full response, first or because the server ignored the Range: start over
+                        body.clear()
+                        last_modified = response.headers.get('Last-Modified')
+                        length = response.headers.get('Content-Length')
+                        # Lengths and ranges count encoded bytes, so only an unencoded body can be checked and resumed
+                        resumable = last_modified is not None and 'Content-Encoding' not in response.headers
+                        total = int(length) if length and 'Content-Encoding' not in response.headers else None
+                    async for chunk in response.aiter_bytes():
+                        body.extend(chunk)
+            except httpx.TransportError as e:
+                error = e
+                logger.warning(f"Download of {filename} interrupted after {len(body)} bytes: {e}")
+                continue
+            if total is None or len(body) == total:
+                return bytes(body), last_modified
+            error = ValueError(f"Incomplete download of {filename}: {len(body)} of {total} bytes")
+        raise error
     
     def record_job_status(self, status: str, note: str = "", started_at: Optional[datetime] = None):
         """Record job run status in database"""
@@ -342,23 +592,7 @@ class ERSSTIngester:
             
             logger.info(f"Processing {len(available_files)} ERSST files")
             
-            success_count = 0
-            error_count = 0
-            
-            for filename in tqdm(available_files, desc="Processing ERSST files"):
-                try:
-                    processed_data = self.download_and_process_file(filename)
-                    
-                    if processed_data and self.ingest_processed_data(processed_data):
-                        success_count += 1
-                    else:
-                        error_count += 1
-                        logger.error(f"Failed to process {filename}")
-                        
-                except Exception as e:
-                    error_count += 1
-                    logger.error(f"Error processing {filename}: {e}")
-                    continue
+            success_count, error_count = self.ingest_files(available_files)
             
             # Record final job status
             if error_count == 0:
@@ -399,9 +633,8 @@ class ERSSTIngester:
             # Filter to recent months
             recent_files = []
             for filename in available_files:
-                yyyymm = filename.split('.')[2]
-                file_date = datetime.strptime(yyyymm, "%Y%m")
-                months_old = (current_date.year - file_date.year) * 12 + (current_date.month - file_date.month)
+                year, month = divmod(int(filename.split('.')[2]), 100)
+                months_old = (current_date.year - year) * 12 + (current_date.month - month)
                 
                 if months_old <= lookback_months:
                     recent_files.append(filename)
@@ -413,22 +646,7 @@ class ERSSTIngester:
             
             logger.info(f"Updating {len(recent_files)} recent ERSST files")
             
-            success_count = 0
-            error_count = 0
-            
-            for filename in recent_files:
-                try:
-                    processed_data = self.download_and_process_file(filename)
-                    
-                    if processed_data and self.ingest_processed_data(processed_data):
-                        success_count += 1
-                    else:
-                        error_count += 1
-                        
-                except Exception as e:
-                    error_count += 1
-                    logger.error(f"Error updating {filename}: {e}")
-                    continue
+            success_count, error_count = self.ingest_files(recent_files)
             
             # Record job status
             status = "success" if error_count == 0 else "partial" if success_count > 0 else "error"
@@ -442,6 +660,28 @@ class ERSSTIngester:
             self.record_job_status("error", str(e), started_at)
 
 
+def parse_ersst_bytes(contents: List[bytes], filenames: List[str]) -> Dict[str, Any]:
+    """
+    Process ERSST NetCDF files held in memory as one batch; runs in a worker process.
+    xarray picks the engine from the file signature (h5netcdf for NetCDF4/HDF5, scipy for NetCDF3).
+    """
+    with ExitStack() as stack:
+        datasets = [stack.enter_context(xr.open_dataset(io.BytesIO(c))) for c in contents]
+        return ERSSTIngester._process_ersst_datasets(datasets, filenames)
+
+
+def _cache_file(filename: str, content: bytes, last_modified: Optional[str]):
+    """Write a file to CACHE_DIR with the server's Last-Modified as its mtime"""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = CACHE_DIR / filename
+    tmp = path.with_suffix('.part')
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+    if last_modified:
+        mtime = parsedate_to_datetime(last_modified).timestamp()
+        os.utime(path, (mtime, mtime))
+
+
 def main():
     """Main entry point for ERSST ingestion"""
     parser = argparse.ArgumentParser(description="ERSST v5 temporal data ingestion")
@@ -477,6 +717,8 @@ def main():
     except Exception as e:
         logger.error(f"Fatal error: {e}")
         sys.exit(1)
+    finally:
+        ingester.close()
 
 
 if __name__ == "__main__":
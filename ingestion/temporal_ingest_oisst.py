@@ -9,9 +9,14 @@ OISST provides daily 0.25° resolution SST data from 1981 to present.
 """
 
 import os
+import io
 import sys
+import asyncio
 import tempfile
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, date, timedelta, timezone
 from pathlib import Path
 import argparse
@@ -20,7 +25,7 @@ import logging
 import httpx
 import xarray as xr
 import numpy as np
-from sqlalchemy.dialects.postgresql import insert
+import pyarrow as pa
 from tqdm import tqdm
 
 # Add parent directory to path for imports
@@ -30,31 +35,246 @@ from backend.db import get_session
 from backend.models import (
     TemporalTemperatureGrid, 
     TemporalTemperatureDaily, 
+    SST_CENTI,
     JobRun
 )
 from backend.temporal_db import TemporalDataManager
+from ingestion.bulk_copy import copy_upsert
+
+try:
+    from ingestion.oisst_kernels import bin_daily
+except ImportError:  # numba is optional; daily bins are grouped with bincount then
+    bin_daily = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Concurrent daily files in flight (downloaded, parsed, waiting for the writer)
+FETCH_CONCURRENCY = int(os.getenv("OISST_FETCH_CONCURRENCY", "8"))
+_LIMITS = httpx.Limits(max_keepalive_connections=FETCH_CONCURRENCY, max_connections=2 * FETCH_CONCURRENCY)
+_TIMEOUT = httpx.Timeout(120, connect=10)
+# Ends the writer's queue; None there means a file that failed to process
+_DONE = object()
+
+# temporal_temperature_grid / _daily column types, as binary COPY needs them. Batches are
+# held in the source's own (typically float32) coordinates and int16 bins, and widened only
+# here; grid SST stays int16 hundredths of a degree all the way into its smallint column.
+_GRID_COPY_SCHEMA = pa.schema([
+    ('date', pa.date32()),
+    ('lat', pa.float64()),
+    ('lon', pa.float64()),
+    ('sst_centi_c', pa.int16()),
+])
+_DAILY_COPY_SCHEMA = pa.schema([
+    ('date', pa.date32()),
+    ('lat_bin', pa.float64()),
+    ('lon_bin', pa.float64()),
+    ('avg_sst_c', pa.float64()),
+    ('min_sst_c', pa.float64()),
+    ('max_sst_c', pa.float64()),
+    ('std_sst_c', pa.float64()),
+    ('count', pa.int32()),
+])
+
+# Variables of the daily files that are never used, so never decoded
+_UNUSED_VARS = ['anom', 'err', 'ice']
+
+# Valid SST in hundredths of °C; fills and unrealistic temperatures fall outside
+_SST_MIN = -10 * SST_CENTI
+_SST_MAX = 50 * SST_CENTI
+# Missing cells in an int16 SST grid
+_NO_SST = np.iinfo(np.int16).min
+
+# 1° bins, -90..90 by -180..180 inclusive (edge cells round out to ±90 / ±180)
+_LAT_BINS = 181
+_LON_BINS = 361
+
+
+@dataclass(frozen=True)
+class _GridLayout:
+    """Everything derived from a grid's coordinates, computed once per grid and bounding box"""
+    lat_keep: Optional[np.ndarray]  # row / column indices inside the bounding box, None without one
+    lon_keep: Optional[np.ndarray]
+    lon_roll: int  # shift of the lon axis to -180..180 ascending when the grid only wraps around, else 0
+    lon_order: Optional[np.ndarray]  # general reorder of the lon axis when a shift is not enough, else None
+    lats: np.ndarray
+    lons: np.ndarray
+    resolution: str
+    lat_idx: np.ndarray  # 1° bin index of each grid row / column
+    lon_idx: np.ndarray
+
+
+# Layouts by raw coordinates and bounding box; every OISST day shares one grid, so each
+# process builds the layout once instead of redoing the coordinate work for every file
+_GRID_LAYOUTS: Dict[tuple, _GridLayout] = {}
+
+
+def _grid_layout(lats: np.ndarray, lons: np.ndarray,
+                 bbox: Optional[Tuple[float, float, float, float]]) -> _GridLayout:
+    key = (lats.dtype.str, lats.tobytes(), lons.dtype.str, lons.tobytes(), bbox)
+    layout = _GRID_LAYOUTS.get(key)
+    if layout is not None:
+        return layout
+    
+    lat_keep = lon_keep = None
+    if bbox is not None:
+        lat_min, lat_max, lon_min, lon_max = bbox
+        lons_180 = ((lons + 180) % 360) - 180
+        lat_keep = np.flatnonzero((lats >= lat_min) & (lats <= lat_max))
+        lon_keep = np.flatnonzero((lons_180 >= lon_min) & (lons_180 <= lon_max))
+        if not lat_keep.size or not lon_keep.size:
+            raise ValueError(f"Bounding box {bbox} contains no grid cells")
+        lats, lons = lats[lat_keep], lons[lon_keep]
+    
+    # Handle longitude convention (OISST typically uses 0-360)
+    lon_roll, lon_order = 0, None
+    if np.max(lons) > 180:
+        lons = ((lons + 180) % 360) - 180
+        lon_order = np.argsort(lons)
+        lons = lons[lon_order]
+        n = lon_order.size
+        if ((lon_order - lon_order[0]) % n == np.arange(n)).all():
+            # An ascending 0..360 grid only wraps at 180°: rotating the axis is two contiguous
+            # copies per row instead of a gather through an index array
+            lon_roll, lon_order = -int(lon_order[0]), None
+    
+    # Spatial resolution for OISST (typically 0.25°)
+    lat_res = abs(lats[1] - lats[0]) if len(lats) > 1 else 0.25
+    lon_res = abs(lons[1] - lons[0]) if len(lons) > 1 else 0.25
+    
+    # np.round rounds half to even, as round() did
+    lat_idx = np.round(lats.astype(float)).astype(np.int64) + 90
+    lon_idx = np.round(lons.astype(float)).astype(np.int64) + 180
+    
+    layout = _GRID_LAYOUTS[key] = _GridLayout(
+        lat_keep, lon_keep, lon_roll, lon_order, lats, lons, f"{lat_res:.2f}x{lon_res:.2f}",
+        lat_idx, lon_idx
+    )
+    return layout
+
+
+def _unpack_sst(raw: np.ndarray, attrs: Dict[str, Any]) -> np.ndarray:
+    """
+    Apply CF packing to SST opened with mask_and_scale=False, as xarray would:
+    scale_factor / add_offset in float32 for float32 attributes, fills to NaN.
+    Decoded data carries none of these attributes and is returned as is.
+    """
+    fills = [attrs[a] for a in ('_FillValue', 'missing_value') if a in attrs]
+    if 'scale_factor' in attrs or 'add_offset' in attrs:
+        scale = np.asarray(attrs.get('scale_factor', 1))
+        offset = np.asarray(attrs.get('add_offset', 0))
+        dtype = np.result_type(scale.dtype, offset.dtype, np.float32)
+        values = raw.astype(dtype) * scale.astype(dtype)
+        if offset:
+            values += offset.astype(dtype)
+    elif fills:
+        values = raw.astype(np.result_type(raw.dtype, np.float32))
+    else:
+        return raw
+    for fill in fills:
+        values[raw == fill] = np.nan
+    return values
+
+
+def _centi_sst(raw: np.ndarray, attrs: Dict[str, Any]) -> np.ndarray:
+    """
+    SST as int16 hundredths of °C, missing and out-of-range cells as _NO_SST.
+    OISST packs sst as int16 with scale_factor 0.01 and no offset, which already
+    is this form: it is only masked, never widened to float. Anything
+    else (decoded data such as the Zarr store, other packings) is unpacked and rounded.
+    """
+    scale = attrs.get('scale_factor')
+    if raw.dtype == np.int16 and scale is not None and np.isclose(scale * SST_CENTI, 1) \
+            and not attrs.get('add_offset', 0):
+        valid = (raw >= _SST_MIN) & (raw <= _SST_MAX)
+        for fill in (attrs[a] for a in ('_FillValue', 'missing_value') if a in attrs):
+            # OISST's -999 fill lies inside the valid range, so it is masked explicitly
+            valid &= raw != fill
+        return np.where(valid, raw, _NO_SST).astype(np.int16, copy=False)
+    values = _unpack_sst(raw, attrs) * SST_CENTI
+    centi = np.full(values.shape, _NO_SST, dtype=np.int16)
+    valid = (values >= _SST_MIN) & (values <= _SST_MAX)
+    centi[valid] = np.round(values[valid])
+    return centi
+
+
+def _daily_aggregates(sst_centi: np.ndarray, layout: _GridLayout,
+                      cells: Tuple[np.ndarray, np.ndarray], target_date: date) -> pa.Table:
+    """
+    Daily summary rows per 1° bin, in °C. Population std (0 for a single cell).
+    sst_centi is the int16 grid from _centi_sst; cells are the (row, column) indices
+    of its valid cells. Statistics are accumulated in float64 over the hundredths and
+    scaled once per bin. With numba the grid is binned in one fused pass (bin_daily);
+    otherwise the valid cells are grouped with bincount over a flat bin index.
+    Bins are held as int16 (see _DAILY_COPY_SCHEMA).
+    """
+    size = _LAT_BINS * _LON_BINS
+    mins = np.full(size, np.inf)
+    maxs = np.full(size, -np.inf)
+    if bin_daily is not None:
+        counts = np.zeros(size, dtype=np.int64)
+        sums = np.zeros(size)
+        sqdev = np.zeros(size)
+        bin_daily(sst_centi, _SST_MIN, _SST_MAX, layout.lat_idx, layout.lon_idx, _LON_BINS,
+                  counts, sums, mins, maxs, sqdev)
+        mean = sums / np.maximum(counts, 1)
+    else:
+        ii, jj = cells
+        sst = sst_centi[ii, jj].astype(float)
+        k = layout.lat_idx[ii] * _LON_BINS + layout.lon_idx[jj]
+        counts = np.bincount(k, minlength=size)
+        mean = np.bincount(k, weights=sst, minlength=size) / np.maximum(counts, 1)
+        # Deviations from each bin's mean, rather than E[x²] - E[x]², which cancels badly at SST magnitudes
+        sqdev = np.bincount(k, weights=(sst - mean[k]) ** 2, minlength=size)
+        np.minimum.at(mins, k, sst)
+        np.maximum.at(maxs, k, sst)
+    std = np.sqrt(sqdev / np.maximum(counts, 1))
+    
+    nz = np.flatnonzero(counts)
+    lat_bin, lon_bin = np.divmod(nz, _LON_BINS)
+    return pa.table({
+        'date': np.full(nz.size, target_date, dtype='datetime64[D]'),
+        'lat_bin': (lat_bin - 90).astype(np.int16),
+        'lon_bin': (lon_bin - 180).astype(np.int16),
+        'avg_sst_c': mean[nz] / SST_CENTI,
+        'min_sst_c': mins[nz] / SST_CENTI,
+        'max_sst_c': maxs[nz] / SST_CENTI,
+        'std_sst_c': std[nz] / SST_CENTI,
+        'count': counts[nz].astype(np.int32)
+    })
+
+
 class OISSTIngester:
     """Enhanced OISST v2.1 daily data ingestion pipeline"""
     
-    def __init__(self):
+    def __init__(self, bbox: Optional[Tuple[float, float, float, float]] = None):
+        # Optional region (lat_min, lat_max, lon_min, lon_max), lon in -180..180; only cells inside are read and stored
+        self.bbox = bbox
         # NOAA OISST THREDDS server
         self.base_url = os.getenv(
             "OISST_BASE", 
             "https://www.ncei.noaa.gov/thredds/dodsC/OisstBase/NetCDF/V2.1/AVHRR"
         )
-        # Alternative direct download URL
+        # Direct download of whole daily files over HTTPS
         self.download_base = os.getenv(
             "OISST_DOWNLOAD_BASE",
-            "https://www.ncei.noaa.gov/pub/data/cmb/ersst/v5/netcdf"  # Placeholder - update with actual OISST URL
+            "https://www.ncei.noaa.gov/data/sea-surface-temperature-optimum-interpolation/v2.1/access/avhrr"
         )
+        # Optional Zarr store holding the daily series (local path or s3://, the latter needs s3fs).
+        # When set, it is opened once per run and each day is read as chunks instead of a file.
+        self.zarr_url = os.getenv("OISST_ZARR")
         
         self.session = get_session()
         self.data_manager = TemporalDataManager()
+        # One pooled HTTP/2 client for direct downloads outside the async pipeline, so the
+        # TLS connection to NCEI is reused instead of handshaking per file
+        self.client = httpx.Client(http2=True, timeout=_TIMEOUT, limits=_LIMITS)
+    
+    def close(self):
+        """Close the HTTP client and database session"""
+        self.client.close()
+        self.session.close()
         
     def generate_oisst_urls(self, start_date: date, end_date: date) -> List[Dict[str, Any]]:
         """
@@ -82,7 +302,7 @@ class OISSTIngester:
             dodsv_url = f"{self.base_url}/{year}/{month:02d}/{filename}"
             
             # Direct download URL (if available)
-            download_url = f"{self.download_base}/{year}/{filename}"
+            download_url = f"{self.download_base}/{year:04d}{month:02d}/{filename}"
             
             file_info.append({
                 'date': current_date,
@@ -116,22 +336,47 @@ class OISSTIngester:
         
         # Try direct download as fallback
         try:
-            with httpx.Client(timeout=120) as client:
-                response = client.get(file_info['download_url'])
-                response.raise_for_status()
-                
-                with tempfile.NamedTemporaryFile(suffix='.nc', delete=False) as tmp_file:
-                    tmp_file.write(response.content)
-                    tmp_file_path = tmp_file.name
-                
-                ds = xr.open_dataset(tmp_file_path)
-                os.unlink(tmp_file_path)  # Clean up temp file
-                return ds
+            response = self.client.get(file_info['download_url'])
+            response.raise_for_status()
+            
+            with tempfile.NamedTemporaryFile(suffix='.nc', delete=False) as tmp_file:
+                tmp_file.write(response.content)
+                tmp_file_path = tmp_file.name
+            
+            ds = xr.open_dataset(tmp_file_path)
+            os.unlink(tmp_file_path)  # Clean up temp file
+            return ds
                 
         except Exception as e:
             logger.error(f"Direct download failed for {file_info['filename']}: {e}")
             return None
     
+    def process_store_day(self, store: xr.Dataset, file_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Process one day of an opened Zarr store.
+        
+        Returns:
+            Dictionary with processed data or None if failed
+        """
+        try:
+            # Day-string selection matches OISST's noon timestamps as well as midnight ones
+            day = store.sel(time=file_info['date'].isoformat())
+            return self.process_oisst_dataset(day, file_info['date'])
+        except Exception as e:
+            logger.error(f"Error processing {file_info['date']} from {self.zarr_url}: {e}")
+            return None
+    
+    def open_store(self) -> Optional[xr.Dataset]:
+        """Open the OISST_ZARR store lazily (no dask), or None to fall back to daily files"""
+        if not self.zarr_url:
+            return None
+        try:
+            storage_options = {'anon': True} if self.zarr_url.startswith('s3://') else None
+            return xr.open_zarr(self.zarr_url, chunks=None, storage_options=storage_options)
+        except Exception as e:
+            logger.warning(f"Zarr store {self.zarr_url} unavailable, using daily files: {e}")
+            return None
+    
     def process_oisst_dataset(self, ds: xr.Dataset, target_date: date) -> Dict[str, Any]:
         """
         Process OISST xarray dataset into database-ready format.
@@ -143,6 +388,12 @@ class OISSTIngester:
         Returns:
             Dictionary with processed data
         """
+        return OISSTIngester._process_oisst_dataset(ds, target_date, self.bbox)
+    
+    @staticmethod
+    def _process_oisst_dataset(ds: xr.Dataset, target_date: date,
+                               bbox: Optional[Tuple[float, float, float, float]] = None) -> Dict[str, Any]:
+        """Process one day, restricted to bbox if given; needs no ingester, so worker processes can run it"""
         # OISST typically has 'sst' variable
         sst_var = 'sst'
         if sst_var not in ds.data_vars:
@@ -160,90 +411,59 @@ class OISSTIngester:
         
         # Get coordinates
         if 'lat' in sst_data.coords:
-            lats = sst_data.coords['lat'].values
-            lons = sst_data.coords['lon'].values
+            lat_coord, lon_coord = sst_data.coords['lat'], sst_data.coords['lon']
         elif 'latitude' in sst_data.coords:
-            lats = sst_data.coords['latitude'].values
-            lons = sst_data.coords['longitude'].values
+            lat_coord, lon_coord = sst_data.coords['latitude'], sst_data.coords['longitude']
         else:
             raise ValueError("Could not find latitude/longitude coordinates")
+        layout = _grid_layout(lat_coord.values, lon_coord.values, bbox)
+        lats, lons = layout.lats, layout.lons
+        
+        if layout.lat_keep is not None:
+            # Subset by index before any values are read, so OPeNDAP transfers only the region
+            sst_data = sst_data.isel({lat_coord.dims[0]: layout.lat_keep, lon_coord.dims[0]: layout.lon_keep})
         
-        # Handle longitude convention (OISST typically uses 0-360)
-        if np.max(lons) > 180:
-            lons = ((lons + 180) % 360) - 180
+        if layout.lon_order is not None:
             # Reorder data to match new longitude order
-            lon_order = np.argsort(lons)
-            lons = lons[lon_order]
-            sst_data = sst_data[:, lon_order] if sst_data.ndim == 2 else sst_data[lon_order]
+            sst_data = sst_data[:, layout.lon_order] if sst_data.ndim == 2 else sst_data[layout.lon_order]
         
         sst_values = sst_data.values
+        if layout.lon_roll:
+            sst_values = np.roll(sst_values, layout.lon_roll, axis=-1)
+        # Files are opened undecoded (see process_oisst_source): the packed int16 values
+        # already are the stored hundredths of a degree, so only the cells kept are touched
+        sst_centi = _centi_sst(sst_values, sst_data.attrs)
         
-        # Handle missing data and quality control
-        # OISST uses different fill values, typically large negative numbers
-        sst_values = np.where(sst_values < -10, np.nan, sst_values)
-        sst_values = np.where(sst_values > 50, np.nan, sst_values)
+        # Valid cells only, as flat column arrays: one vectorized pass instead of a Python loop per cell.
+        # Missing data, fills and unrealistic temperatures all fail the same range test,
+        # so the grid is never rewritten with NULLs; bin_daily applies the identical test
+        # as it reads each cell.
+        ii, jj = np.nonzero((sst_centi >= _SST_MIN) & (sst_centi <= _SST_MAX))
         
-        # Process grid data
-        grid_records = []
-        daily_aggregates = {}
+        # Grid rows (high resolution) as compact Arrow columns, coordinates in the source dtype
+        # and widened for COPY in ingest_processed_data; dataset, resolution, quality_flag and
+        # created_at are the same for the whole file and set in the merge
+        grid = pa.table({
+            'date': np.full(ii.size, target_date, dtype='datetime64[D]'),
+            'lat': lats[ii],
+            'lon': lons[jj],
+            'sst_centi_c': sst_centi[ii, jj]
+        })
         
-        # Spatial resolution for OISST (typically 0.25°)
-        lat_res = abs(lats[1] - lats[0]) if len(lats) > 1 else 0.25
-        lon_res = abs(lons[1] - lons[0]) if len(lons) > 1 else 0.25
-        resolution_str = f"{lat_res:.2f}x{lon_res:.2f}"
-        
-        for i, lat in enumerate(lats):
-            for j, lon in enumerate(lons):
-                sst_val = float(sst_values[i, j]) if not np.isnan(sst_values[i, j]) else None
-                
-                if sst_val is not None:
-                    # Grid record (high resolution)
-                    grid_records.append({
-                        'date': target_date,
-                        'lat': float(lat),
-                        'lon': float(lon),
-                        'sst_c': sst_val,
-                        'dataset': 'OISST',
-                        'resolution': resolution_str,
-                        'quality_flag': 0,
-                        'created_at': datetime.now(timezone.utc)
-                    })
-                    
-                    # Aggregate for daily summary (bin to 1-degree grid for manageable size)
-                    lat_bin = round(float(lat))
-                    lon_bin = round(float(lon))
-                    key = (lat_bin, lon_bin)
-                    
-                    if key not in daily_aggregates:
-                        daily_aggregates[key] = []
-                    daily_aggregates[key].append(sst_val)
-        
-        # Calculate daily aggregates
-        daily_records = []
-        for (lat_bin, lon_bin), temps in daily_aggregates.items():
-            daily_records.append({
-                'date': target_date,
-                'lat_bin': lat_bin,
-                'lon_bin': lon_bin,
-                'avg_sst_c': np.mean(temps),
-                'min_sst_c': np.min(temps),
-                'max_sst_c': np.max(temps),
-                'std_sst_c': np.std(temps) if len(temps) > 1 else 0.0,
-                'count': len(temps),
-                'dataset': 'OISST'
-            })
+        # Aggregate for daily summary (bin to 1-degree grid for manageable size)
+        daily = _daily_aggregates(sst_centi, layout, (ii, jj), target_date)
         
         return {
             'date': target_date,
-            'grid_records': grid_records,
-            'daily_records': daily_records,
+            'grid': grid,
+            'daily': daily,
             'spatial_bounds': {
                 'lat_min': float(np.min(lats)),
                 'lat_max': float(np.max(lats)),
                 'lon_min': float(np.min(lons)),
                 'lon_max': float(np.max(lons))
             },
-            'resolution': resolution_str
+            'resolution': layout.resolution
         }
     
     def ingest_processed_data(self, processed_data: Dict[str, Any], 
@@ -259,45 +479,42 @@ class OISSTIngester:
             True if successful, False otherwise
         """
         try:
-            # Insert daily aggregates (always store these)
-            daily_records = processed_data['daily_records']
-            if daily_records:
-                stmt = insert(TemporalTemperatureDaily).values(daily_records)
-                stmt = stmt.on_conflict_do_update(
-                    constraint='uq_temp_daily_location',
-                    set_={
-                        'avg_sst_c': stmt.excluded.avg_sst_c,
-                        'min_sst_c': stmt.excluded.min_sst_c,
-                        'max_sst_c': stmt.excluded.max_sst_c,
-                        'std_sst_c': stmt.excluded.std_sst_c,
-                        'count': stmt.excluded.count
-                    }
+            # Insert daily aggregates (always store these): COPY through a staging table,
+            # then upsert on uq_temp_daily_location
+            daily = processed_data['daily']
+            if daily.num_rows:
+                copy_upsert(
+                    self.session.connection(),
+                    TemporalTemperatureDaily.__tablename__,
+                    daily.cast(_DAILY_COPY_SCHEMA),
+                    conflict_cols=['date', 'lat_bin', 'lon_bin', 'dataset'],
+                    update_cols=['avg_sst_c', 'min_sst_c', 'max_sst_c', 'std_sst_c', 'count'],
+                    defaults={'id': 'gen_random_uuid()', 'dataset': "'OISST'"},
+                    binary=True
                 )
-                
-                self.session.execute(stmt)
-                logger.info(f"Inserted {len(daily_records)} daily aggregate records")
+                logger.info(f"Inserted {daily.num_rows} daily aggregate records")
             
             # Optionally store full grid data (warning: OISST is 0.25° resolution = very large!)
             if store_grid:
-                grid_records = processed_data['grid_records']
-                if grid_records:
-                    batch_size = 5000  # Larger batches for OISST
-                    for i in range(0, len(grid_records), batch_size):
-                        batch = grid_records[i:i+batch_size]
-                        
-                        stmt = insert(TemporalTemperatureGrid).values(batch)
-                        stmt = stmt.on_conflict_do_update(
-                            constraint='uq_temp_grid_date_location',
-                            set_={
-                                'sst_c': stmt.excluded.sst_c,
-                                'quality_flag': stmt.excluded.quality_flag,
-                                'created_at': stmt.excluded.created_at
-                            }
-                        )
-                        
-                        self.session.execute(stmt)
-                    
-                    logger.info(f"Inserted {len(grid_records)} grid records")
+                grid = processed_data['grid']
+                if grid.num_rows:
+                    copy_upsert(
+                        self.session.connection(),
+                        TemporalTemperatureGrid.__tablename__,
+                        grid.cast(_GRID_COPY_SCHEMA),
+                        conflict_cols=['date', 'lat', 'lon', 'dataset'],
+                        update_cols=['sst_centi_c', 'quality_flag', 'created_at'],
+                        # resolution is formatted from numbers, so safe to inline
+                        defaults={
+                            'id': 'gen_random_uuid()',
+                            'dataset': "'OISST'",
+                            'resolution': f"'{processed_data['resolution']}'",
+                            'quality_flag': '0',
+                            'created_at': "now() AT TIME ZONE 'utc'"
+                        },
+                        binary=True
+                    )
+                    logger.info(f"Inserted {grid.num_rows} grid records")
             
             self.session.commit()
             return True
@@ -307,6 +524,79 @@ class OISSTIngester:
             self.session.rollback()
             return False
     
+    def ingest_files(self, file_list: List[Dict[str, Any]], store_grid: bool = False) -> Tuple[int, int]:
+        """
+        Download, process and ingest daily files concurrently.
+        
+        Up to FETCH_CONCURRENCY files are downloaded over one async HTTP/2 client
+        and decoded and processed in a process pool (netCDF decompression holds the
+        GIL), while a single writer ingests them so the database session stays on
+        one thread. With OISST_ZARR set, days are read from that store instead,
+        in worker threads sharing the opened store.
+        
+        Returns:
+            (success_count, error_count)
+        """
+        store = self.open_store()
+        try:
+            return asyncio.run(self._ingest_files_async(file_list, store_grid, store))
+        finally:
+            if store is not None:
+                store.close()
+    
+    async def _ingest_files_async(self, file_list: List[Dict[str, Any]], store_grid: bool,
+                                  store: Optional[xr.Dataset] = None) -> Tuple[int, int]:
+        loop = asyncio.get_running_loop()
+        sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=FETCH_CONCURRENCY)
+        counts = [0, 0]
+        
+        async def fetch_and_process(client: httpx.AsyncClient, pool: Optional[ProcessPoolExecutor],
+                                    file_info: Dict[str, Any]):
+            # The slot is held until the writer takes the result, so at most
+            # FETCH_CONCURRENCY files are held in memory at once
+            async with sem:
+                if store is not None:
+                    await queue.put(await asyncio.to_thread(self.process_store_day, store, file_info))
+                    return
+                content = None
+                try:
+                    response = await client.get(file_info['download_url'])
+                    response.raise_for_status()
+                    content = response.content
+                except Exception as e:
+                    logger.warning(f"Direct download failed for {file_info['filename']}, trying THREDDS: {e}")
+                source = content if content is not None else file_info['dodsv_url']
+                processed_data = None
+                try:
+                    processed_data = await loop.run_in_executor(
+                        pool, process_oisst_source, source, file_info['date'], self.bbox)
+                except Exception as e:
+                    logger.error(f"Error processing {file_info['filename']}: {e}")
+                await queue.put(processed_data)
+        
+        async def writer():
+            # Per-file progress only on a terminal; cron and container runs log instead
+            with tqdm(total=len(file_list), desc="Processing OISST files", disable=not sys.stderr.isatty()) as pbar:
+                while (processed_data := await queue.get()) is not _DONE:
+                    if processed_data is not None and await asyncio.to_thread(
+                            self.ingest_processed_data, processed_data, store_grid):
+                        counts[0] += 1
+                    else:
+                        counts[1] += 1
+                    pbar.update()
+        
+        with ExitStack() as stack:
+            pool = None
+            if store is None:
+                pool = stack.enter_context(ProcessPoolExecutor(max_workers=min(FETCH_CONCURRENCY, os.cpu_count() or 1)))
+            async with httpx.AsyncClient(http2=True, timeout=_TIMEOUT, limits=_LIMITS) as client:
+                writer_task = asyncio.create_task(writer())
+                await asyncio.gather(*(fetch_and_process(client, pool, fi) for fi in file_list))
+                await queue.put(_DONE)
+                await writer_task
+        return counts[0], counts[1]
+    
     def record_job_status(self, status: str, note: str = "", started_at: Optional[datetime] = None):
         """Record job run status in database"""
         if started_at is None:
@@ -359,31 +649,7 @@ class OISSTIngester:
             if store_grid:
                 logger.warning("Storing full grid data - this will consume significant database space!")
             
-            success_count = 0
-            error_count = 0
-            
-            for file_info in tqdm(file_list, desc="Processing OISST files"):
-                try:
-                    # Download data
-                    ds = self.download_oisst_data(file_info)
-                    if ds is None:
-                        error_count += 1
-                        continue
-                    
-                    # Process data
-                    processed_data = self.process_oisst_dataset(ds, file_info['date'])
-                    ds.close()  # Clean up
-                    
-                    # Ingest data
-                    if self.ingest_processed_data(processed_data, store_grid):
-                        success_count += 1
-                    else:
-                        error_count += 1
-                        
-                except Exception as e:
-                    error_count += 1
-                    logger.error(f"Error processing {file_info['filename']}: {e}")
-                    continue
+            success_count, error_count = self.ingest_files(file_list, store_grid)
             
             # Record final job status
             if error_count == 0:
@@ -429,30 +695,12 @@ class OISSTIngester:
             
             logger.info(f"Updating {len(file_list)} recent OISST files")
             
-            success_count = 0
-            error_count = 0
+            success_count, error_count = self.ingest_files(file_list, store_grid)
             
-            for file_info in file_list:
-                try:
-                    # Download and process
-                    ds = self.download_oisst_data(file_info)
-                    if ds is None:
-                        error_count += 1
-                        continue
-                    
-                    processed_data = self.process_oisst_dataset(ds, file_info['date'])
-                    ds.close()
-                    
-                    # Ingest
-                    if self.ingest_processed_data(processed_data, store_grid):
-                        success_count += 1
-                    else:
-                        error_count += 1
-                        
-                except Exception as e:
-                    error_count += 1
-                    logger.error(f"Error updating {file_info['filename']}: {e}")
-                    continue
+            # Roll newly ingested days up into their monthly aggregates
+            if success_count > 0:
+                monthly = self.data_manager.aggregate_new_daily_data("OISST")
+                logger.info(f"Refreshed {monthly} monthly aggregate records")
             
             # Record job status
             status = "success" if error_count == 0 else "partial" if success_count > 0 else "error"
@@ -466,6 +714,20 @@ class OISSTIngester:
             self.record_job_status("error", str(e), started_at)
 
 
+def process_oisst_source(source, target_date: date,
+                         bbox: Optional[Tuple[float, float, float, float]] = None) -> Dict[str, Any]:
+    """
+    Process one daily file, held in memory (bytes) or read over OPeNDAP (URL); runs in a worker process.
+    xarray picks the engine from the file signature (h5netcdf for in-memory NetCDF4).
+    Only sst and its coordinates are read, without CF decoding: the unused variables are
+    dropped, times are not decoded (the date comes from the file name), and sst is
+    unpacked by hand after subsetting.
+    """
+    source = io.BytesIO(source) if isinstance(source, bytes) else source
+    with xr.open_dataset(source, mask_and_scale=False, decode_times=False, drop_variables=_UNUSED_VARS) as ds:
+        return OISSTIngester._process_oisst_dataset(ds, target_date, bbox)
+
+
 def main():
     """Main entry point for OISST ingestion"""
     parser = argparse.ArgumentParser(description="OISST v2.1 temporal data ingestion")
@@ -481,6 +743,9 @@ def main():
                        help="Maximum number of days to process (for testing)")
     parser.add_argument("--lookback-days", type=int, default=30,
                        help="Lookback days for incremental updates")
+    parser.add_argument("--bbox", type=float, nargs=4, default=None,
+                       metavar=("LAT_MIN", "LAT_MAX", "LON_MIN", "LON_MAX"),
+                       help="Only read and store cells in this region (lon in -180..180)")
     parser.add_argument("--verbose", "-v", action="store_true",
                        help="Enable verbose logging")
     
@@ -497,7 +762,7 @@ def main():
     else:
         end_date = date.today() - timedelta(days=1)  # Yesterday
     
-    ingester = OISSTIngester()
+    ingester = OISSTIngester(bbox=tuple(args.bbox) if args.bbox else None)
     
     try:
         if args.mode == "backfill":
@@ -511,6 +776,8 @@ def main():
     except Exception as e:
         logger.error(f"Fatal error: {e}")
         sys.exit(1)
+    finally:
+        ingester.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: MIT
+# © 2024–2025 Mark Lindon — BlueSphere
+"""
+Web Mercator tile math shared by the tilers.
+- tile_bounds: (lon_min, lat_min, lon_max, lat_max) of tile z/x/y
+- lonlat_to_tile_xy: fractional tile coordinates of a lon/lat at zoom z
+- zoom_edges: every tile edge of a zoom level in one vectorized pass, so the
+  tilers index bounds instead of calling tile_bounds per tile
+- coverage_at: a z8 coverage bitmap (e.g. an ocean mask) resampled to zoom z,
+  so tiles outside it are skipped before any rendering
+Compiled with numba when it is installed (cache=True, so pool workers load the
+machine code instead of re-compiling); otherwise the same code runs as Python.
+"""
+from __future__ import annotations
+import math
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the functions below are plain Python then
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+@njit(cache=True)
+def tile_bounds(z, x, y):
+    n = 2.0 ** z
+    lon_min = x / n * 360.0 - 180.0
+    lon_max = (x + 1) / n * 360.0 - 180.0
+    lat_min = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    lat_max = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    return lon_min, lat_min, lon_max, lat_max
+
+@njit(cache=True)
+def lonlat_to_tile_xy(lon, lat, z):
+    n = 2.0 ** z
+    x = (lon + 180.0) / 360.0 * n
+    y = (1.0 - math.log(math.tan(math.radians(lat)) + 1 / math.cos(math.radians(lat))) / math.pi) / 2.0 * n
+    return x, y
+
+def zoom_edges(z):
+    """
+    (lon_edges, lat_edges) for zoom z, n+1 floats each: tile x/y spans
+    lon_edges[x]..lon_edges[x+1] and lat_edges[y+1]..lat_edges[y] (north first).
+    """
+    t = np.arange(2 ** z + 1) / 2 ** z
+    lon_edges = t * 360.0 - 180.0
+    lat_edges = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * t))))
+    return lon_edges.tolist(), lat_edges.tolist()
+
+# Coverage bitmaps are (256, 256) booleans indexed [y, x] at this zoom
+COVERAGE_ZOOM = 8
+
+def pop_coverage_arg(argv: list[str]) -> np.ndarray|None:
+    """Remove '--coverage <mask.npy>' from argv and return the z8 bitmap, or None to render every tile"""
+    if "--coverage" not in argv:
+        return None
+    i = argv.index("--coverage")
+    mask = np.load(argv[i + 1]).astype(bool)
+    del argv[i:i + 2]
+    n = 2 ** COVERAGE_ZOOM
+    if mask.shape != (n, n):
+        raise ValueError(f"coverage mask must be {n}x{n} (zoom {COVERAGE_ZOOM}), got {mask.shape}")
+    return mask
+
+def coverage_at(mask: np.ndarray, z: int) -> np.ndarray:
+    """
+    The bitmap at zoom z, indexed [y, x]: below z8 a tile is covered if any of
+    its z8 children is, above z8 it inherits its z8 ancestor.
+    """
+    if z <= COVERAGE_ZOOM:
+        n, f = 2 ** z, 2 ** (COVERAGE_ZOOM - z)
+        return mask.reshape(n, f, n, f).any(axis=(1, 3))
+    f = 2 ** (z - COVERAGE_ZOOM)
+    return mask.repeat(f, axis=0).repeat(f, axis=1)
@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: MIT
+# © 2024–2025 Mark Lindon — BlueSphere
+"""
+Tile output shared by the tilers (make_currents_mvt, make_sst_tiles).
+- write_tile_file: {z}/{x}/{y} file written to a sibling temp name, then renamed
+  into place, so a reader or an interrupted run never sees a partial tile
+- MBTilesWriter: every tile in one MBTiles (SQLite) container, one transaction
+  per zoom level, selected with --mbtiles <path> on the tiler command line
+No fsync per tile; callers flush once with os.sync() after the batch.
+"""
+from __future__ import annotations
+import os, sqlite3
+
+def write_tile_file(fp: str, data: bytes) -> None:
+    tmp = fp + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+    os.replace(tmp, fp)
+
+_MBTILES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (name TEXT, value TEXT);
+CREATE UNIQUE INDEX IF NOT EXISTS metadata_name ON metadata (name);
+CREATE TABLE IF NOT EXISTS tiles (zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB);
+CREATE UNIQUE INDEX IF NOT EXISTS tile_index ON tiles (zoom_level, tile_column, tile_row);
+"""
+
+def pop_mbtiles_arg(argv: list[str]) -> str|None:
+    """Remove '--mbtiles <path>' from argv and return the path, or None for file output"""
+    if "--mbtiles" not in argv:
+        return None
+    i = argv.index("--mbtiles")
+    path = argv[i + 1]
+    del argv[i:i + 2]
+    return path
+
+class MBTilesWriter:
+    """Writes XYZ tiles into an MBTiles file; rows are flipped to TMS as the spec requires"""
+
+    def __init__(self, path: str, name: str, fmt: str):
+        self.con = sqlite3.connect(path)
+        self.con.executescript(_MBTILES_SCHEMA)
+        # The file is rebuilt on failure, so skip the per-commit disk sync
+        self.con.execute("PRAGMA synchronous=OFF")
+        self.con.executemany("INSERT OR REPLACE INTO metadata (name, value) VALUES (?, ?)",
+                             [("name", name), ("format", fmt)])
+        self.con.commit()
+
+    def existing(self, z: int) -> set[tuple[int, int]]:
+        """(x, y) of the tiles already stored at zoom z"""
+        n = 2 ** z
+        rows = self.con.execute("SELECT tile_column, tile_row FROM tiles WHERE zoom_level = ?", (z,))
+        return {(x, n - 1 - row) for x, row in rows}
+
+    def put(self, z: int, x: int, y: int, data: bytes) -> None:
+        self.con.execute(
+            "INSERT OR REPLACE INTO tiles (zoom_level, tile_column, tile_row, tile_data) VALUES (?, ?, ?, ?)",
+            (z, x, 2 ** z - 1 - y, data),
+        )
+
+    def commit(self) -> None:
+        self.con.commit()
+
+    def close(self) -> None:
+        self.con.commit()
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
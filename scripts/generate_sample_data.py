@@ -34,7 +34,8 @@ from backend.models import (
     ClimateBaseline,
     TemperatureAnomaly,
     MarineHeatwave,
-    JobRun
+    JobRun,
+    SST_CENTI
 )
 
 # Configure logging
@@ -217,7 +218,7 @@ class SampleDataGenerator:
                             'date': target_date,
                             'lat': float(lat),
                             'lon': float(lon),
-                            'sst_c': sst_val,
+                            'sst_centi_c': round(sst_val * SST_CENTI),
                             'dataset': 'ERSST_SAMPLE',
                             'resolution': f'{spatial_resolution:.1f}x{spatial_resolution:.1f}',
                             'quality_flag': 0,
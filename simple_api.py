@@ -80,7 +80,8 @@ def root():
 def live_stations():
     """Get real-time data from most recently updated stations"""
     try:
-        from backend.real_time_stations import global_stations
+        from backend.real_time_stations import get_global_stations
+        global_stations = get_global_stations()
         import random
         global_stations.update_real_time_data()  # Force real-time update
         
@@ -101,7 +102,8 @@ def live_stations():
 def stations_by_region(region: str):
     """Get stations by ocean region"""
     try:
-        from backend.real_time_stations import global_stations
+        from backend.real_time_stations import get_global_stations
+        global_stations = get_global_stations()
         regional_data = global_stations.get_regional_stations(region=region)
         return regional_data
     except ImportError:
@@ -111,7 +113,8 @@ def stations_by_region(region: str):
 def current_temperatures():
     """Get current temperature readings from all active stations"""
     try:
-        from backend.real_time_stations import global_stations
+        from backend.real_time_stations import get_global_stations
+        global_stations = get_global_stations()
         active_stations = [s for s in global_stations.stations if s['active']]
         
         temp_data = []
@@ -139,7 +142,8 @@ def current_temperatures():
 def marine_heatwave_alerts():
     """Detect and return active marine heatwave alerts"""
     try:
-        from backend.real_time_stations import global_stations
+        from backend.real_time_stations import get_global_stations
+        global_stations = get_global_stations()
         import statistics
         
         active_stations = [s for s in global_stations.stations if s['active']]
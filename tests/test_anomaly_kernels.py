@@ -0,0 +1,64 @@
+# SPDX-License-Identifier: MIT
+# © 2024–2025 Mark Lindon — BlueSphere
+"""Numba anomaly and marine heatwave kernels, on small hand-built series"""
+import numpy as np
+import pytest
+
+from ingestion.anomaly_kernels import compute_anomaly, detect_heatwave_runs
+
+nan = np.nan
+
+
+def _runs(temp, min_duration, threshold=20.0):
+    temp = np.asarray(temp, np.float64)
+    starts, ends, peak, mean, cumulative = detect_heatwave_runs(
+        temp, np.full(temp.size, threshold), min_duration)
+    return list(zip(starts.tolist(), ends.tolist())), peak, mean, cumulative
+
+
+def test_compute_anomaly():
+    avg = np.array([20.5, 18.0, nan, -1.5])
+    clim = np.array([20.0, 19.0, 15.0, -1.0])
+    out = np.empty_like(avg)
+    compute_anomaly(avg, clim, out)
+    np.testing.assert_allclose(out, [0.5, -1.0, nan, -0.5])
+
+
+def test_run_statistics():
+    runs, peak, mean, cumulative = _runs([19, 21, 23, 22, 19], min_duration=3)
+    assert runs == [(1, 3)]
+    np.testing.assert_allclose(peak, [3.0])
+    np.testing.assert_allclose(mean, [2.0])
+    np.testing.assert_allclose(cumulative, [6.0])
+
+
+@pytest.mark.parametrize("temp", [[], [21.0], [21.0, 21.0]])
+def test_series_shorter_than_min_duration(temp):
+    assert _runs(temp, min_duration=5)[0] == []
+
+
+def test_run_at_end_of_series_is_closed():
+    runs, peak, _, cumulative = _runs([19, 19, 21, 22, 21], min_duration=3)
+    assert runs == [(2, 4)]
+    np.testing.assert_allclose(peak, [2.0])
+    np.testing.assert_allclose(cumulative, [4.0])
+
+
+def test_whole_series_is_one_run():
+    assert _runs([21, 21, 21], min_duration=3)[0] == [(0, 2)]
+
+
+def test_nan_gap_splits_runs():
+    temp = [21, 21, 21, nan, 21, 21, 21, 19, 21, 21, 21]
+    assert _runs(temp, min_duration=3)[0] == [(0, 2), (4, 6), (8, 10)]
+    # Joined across the gap the runs would be long enough; split, they are not
+    assert _runs([21, 21, nan, 21, 21], min_duration=3)[0] == []
+
+
+def test_run_one_day_short_is_dropped():
+    assert _runs([19, 21, 21, 21, 21, 19], min_duration=5)[0] == []
+    assert _runs([19, 21, 21, 21, 21, 21, 19], min_duration=5)[0] == [(1, 5)]
+
+
+def test_threshold_is_exclusive():
+    assert _runs([20, 20, 20, 20], min_duration=1)[0] == []
@@ -0,0 +1,59 @@
+# SPDX-License-Identifier: MIT
+# © 2024–2025 Mark Lindon — BlueSphere
+"""NDBC realtime2 parsing, against an excerpt of a station file"""
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+
+import ingestion.ndbc_parser as ndbc_parser
+from ingestion.ndbc_parser import aiter_realtime2, parse_realtime2
+
+_FIXTURE = Path(__file__).parent / "data" / "ndbc_41001_realtime2.txt"
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_parse_realtime2_file():
+    rows = parse_realtime2(_FIXTURE.read_text(), "41001")
+    # 7 observations, one with WTMP missing (MM); the units line is a comment
+    assert [(r["time"], r["sst_c"]) for r in rows] == [
+        (_utc(2024, 5, 1, 12, 50), 26.3),
+        (_utc(2024, 5, 1, 12, 40), 26.3),
+        (_utc(2024, 5, 1, 12, 30), 26.2),
+        (_utc(2024, 5, 1, 12, 10), 26.2),
+        (_utc(2024, 5, 1, 12, 0), 26.2),
+        (_utc(2024, 5, 1, 11, 50), 26.1),
+    ]
+    assert {r["station_id"] for r in rows} == {"41001"}
+    assert {r["source"] for r in rows} == {"NDBC"}
+    # No position columns in realtime2 files
+    assert {(r["lat"], r["lon"]) for r in rows} == {(0.0, 0.0)}
+
+
+def test_parse_realtime2_without_wtmp():
+    text = "#YY  MM DD hh mm WDIR WSPD\n2024 05 01 12 50 110  6.0\n"
+    assert parse_realtime2(text, "X") == []
+
+
+def test_parse_realtime2_blocks_match_whole(monkeypatch):
+    whole = parse_realtime2(_FIXTURE.read_text(), "41001")
+    monkeypatch.setattr(ndbc_parser, "_BLOCK_LINES", 2)
+    assert parse_realtime2(_FIXTURE.read_text(), "41001") == whole
+
+
+def test_aiter_realtime2_matches_parse(monkeypatch):
+    whole = parse_realtime2(_FIXTURE.read_text(), "41001")
+    monkeypatch.setattr(ndbc_parser, "_BLOCK_LINES", 3)
+
+    async def lines():
+        for line in _FIXTURE.read_text().splitlines():
+            yield line
+
+    async def collect():
+        return [block async for block in aiter_realtime2(lines(), "41001")]
+
+    blocks = asyncio.run(collect())
+    assert len(blocks) > 1
+    assert [row for block in blocks for row in block] == whole
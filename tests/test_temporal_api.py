@@ -0,0 +1,111 @@
+# SPDX-License-Identifier: MIT
+# © 2024–2025 Mark Lindon — BlueSphere
+"""Temporal API request handling, with the database replaced by a stub data manager"""
+from datetime import date
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import backend.temporal_api as temporal_api
+
+_URL = "/temporal/temperatures?start_date=2020-01-01&end_date=2020-02-01"
+
+
+class StubDataManager:
+    """Stands in for TemporalDataManager; counts close() calls"""
+
+    def __init__(self, records=(), error=None):
+        self.records = list(records)
+        self.error = error
+        self.closed = 0
+
+    def iter_temperature_data(self, **kwargs):
+        self.kwargs = kwargs
+        if self.error:
+            raise self.error
+        yield from self.records
+
+    def close(self):
+        self.closed += 1
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(temporal_api, "CACHE_ENABLED", False)
+    app = FastAPI()
+    app.include_router(temporal_api.router)
+    return app, TestClient(app)
+
+
+def _use(app, manager):
+    app.dependency_overrides[temporal_api.get_streaming_data_manager] = lambda: manager
+    return manager
+
+
+def test_temperatures_streams_and_closes_session(client):
+    app, http = client
+    record = {"id": "a", "date": "2020-01-05", "lat": 1.0, "lon": 2.0, "dataset": "OISST"}
+    manager = _use(app, StubDataManager([record]))
+    response = http.get(_URL)
+    assert response.status_code == 200
+    body = orjson.loads(response.content)
+    assert body["count"] == 1 and body["data"][0]["id"] == "a"
+    assert manager.closed == 1
+
+
+@pytest.mark.parametrize("query, status", [
+    ("start_date=2020-03-01&end_date=2020-02-01", 400),  # start after end
+    ("start_date=2020-13-01&end_date=2020-02-01", 400),  # not a date
+    ("start_date=2020-01-01&end_date=2020-02-01&bbox=1,2,3", 400),
+    ("start_date=2020-01-01&end_date=2020-02-01&cursor=garbage", 400),
+    ("start_date=2020-01-01&end_date=2020-02-01&cursor=2024-01-01|abc", 400),  # id not a UUID
+])
+def test_temperatures_rejects_bad_input_and_closes_session(client, query, status):
+    app, http = client
+    manager = _use(app, StubDataManager())
+    response = http.get(f"/temporal/temperatures?{query}")
+    assert response.status_code == status
+    assert manager.closed == 1
+
+
+def test_temperatures_query_error_is_500_not_truncated_body(client):
+    app, http = client
+    manager = _use(app, StubDataManager(error=RuntimeError("connection lost")))
+    response = http.get(_URL)
+    assert response.status_code == 500
+    assert "connection lost" in response.json()["detail"]
+    assert manager.closed == 1
+
+
+def test_cursor_round_trip():
+    record = {"id": "a0000000-0000-0000-0000-000000000001", "date": date(2020, 1, 5)}
+    cursor = temporal_api._next_cursor(record, count=10, limit=10)
+    assert cursor == "2020-01-05|a0000000-0000-0000-0000-000000000001"
+    assert temporal_api._parse_cursor(cursor) == (date(2020, 1, 5), record["id"])
+
+
+def test_no_cursor_after_last_page():
+    assert temporal_api._next_cursor({"id": "a", "date": date(2020, 1, 5)}, count=3, limit=10) is None
+    assert temporal_api._next_cursor(None, count=0, limit=10) is None
+
+
+@pytest.mark.parametrize("cursor", [
+    "garbage", "2020-01-05", "2020-13-05|a", "|a", "05/01/2020|a",
+    "2024-01-01|abc", "2024-01-01|",  # date fine, id not a UUID
+])
+def test_malformed_cursor_rejected(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        temporal_api._parse_cursor(cursor)
+
+
+def test_temperatures_pages_by_cursor(client):
+    app, http = client
+    record_id = "b0000000-0000-0000-0000-000000000002"
+    record = {"id": record_id, "date": date(2020, 1, 5), "lat": 1.0, "lon": 2.0, "dataset": "OISST"}
+    manager = _use(app, StubDataManager([record]))
+    body = http.get(f"{_URL}&limit=1").json()
+    assert body["next_cursor"] == f"2020-01-05|{record_id}"
+    http.get(f"{_URL}&limit=1&cursor={body['next_cursor']}")
+    assert manager.kwargs["cursor"] == (date(2020, 1, 5), record_id)
@@ -0,0 +1,65 @@
+# SPDX-License-Identifier: MIT
+# © 2024–2025 Mark Lindon — BlueSphere
+"""Keyset pagination of the prebuilt temperature reads, on an in-memory SQLite grid table"""
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, insert
+
+from backend.models import TemporalTemperatureGrid
+from backend.temporal_api import _next_cursor, _parse_cursor
+from backend.temporal_db import _TEMPERATURE_QUERIES, _query_params
+
+
+@pytest.fixture
+def grid_engine():
+    engine = create_engine("sqlite://")
+    TemporalTemperatureGrid.__table__.create(engine)
+    # Three rows per day, so pages split inside a date and ties break on id
+    rows = [{
+        "id": str(uuid.UUID(int=(0xA << 124) + i)),
+        "date": date(2020, 1, 1) + timedelta(days=i // 3),
+        "lat": 0.0, "lon": float(i), "sst_centi_c": 2000 + i,
+        "dataset": "OISST", "resolution": "0.25x0.25", "quality_flag": 0,
+        "created_at": datetime(2020, 1, 1),
+    } for i in range(10)]
+    with engine.begin() as conn:
+        conn.execute(insert(TemporalTemperatureGrid), rows)
+    return engine
+
+
+def _page(conn, limit, cursor=None, offset=0):
+    query = _TEMPERATURE_QUERIES[("grid", False, False, cursor is not None)]
+    params = _query_params(date(2020, 1, 1), date(2020, 12, 31), None, None, limit, offset, cursor)
+    return [dict(row._mapping) for row in conn.execute(query, params)]
+
+
+def test_cursor_pages_cover_every_row_once(grid_engine):
+    with grid_engine.connect() as conn:
+        everything = _page(conn, limit=100)
+        pages, cursor = [], None
+        while True:
+            page = _page(conn, limit=4, cursor=cursor)
+            pages.append(page)
+            next_cursor = _next_cursor(page[-1] if page else None, len(page), 4)
+            if next_cursor is None:
+                break
+            cursor = _parse_cursor(next_cursor)
+    assert [len(p) for p in pages] == [4, 4, 2]
+    assert [r["id"] for p in pages for r in p] == [r["id"] for r in everything]
+    # Newest first, ties on date by id descending
+    assert [(r["date"], r["id"]) for r in everything] == sorted(((r["date"], r["id"]) for r in everything), reverse=True)
+
+
+def test_cursor_pages_match_offset_pages(grid_engine):
+    with grid_engine.connect() as conn:
+        first = _page(conn, limit=4)
+        cursor = _parse_cursor(_next_cursor(first[-1], len(first), 4))
+        assert _page(conn, limit=4, cursor=cursor) == _page(conn, limit=4, offset=4)
+
+
+def test_grid_sst_served_in_degrees(grid_engine):
+    with grid_engine.connect() as conn:
+        row = _page(conn, limit=1)[0]
+    assert row["sst_c"] == pytest.approx(20.09)
@@ -0,0 +1,43 @@
+# SPDX-License-Identifier: MIT
+# © 2024–2025 Mark Lindon — BlueSphere
+"""Tile endpoints serving an MBTiles file written by the tilers' MBTilesWriter"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import backend.tiles_cached as tiles_cached
+from ingestion.tile_store import MBTilesWriter
+
+
+@pytest.fixture
+def http():
+    app = FastAPI()
+    app.include_router(tiles_cached.router)
+    return TestClient(app)
+
+
+def test_mbtiles_tile_flips_tms_rows(tmp_path):
+    path = str(tmp_path / "t.mbtiles")
+    with MBTilesWriter(path, name="t", fmt="png") as db:
+        db.put(2, 1, 0, b"top")
+        db.put(2, 1, 3, b"bottom")
+    assert tiles_cached.mbtiles_tile(path, 2, 1, 0) == b"top"
+    assert tiles_cached.mbtiles_tile(path, 2, 1, 3) == b"bottom"
+    assert tiles_cached.mbtiles_tile(path, 2, 0, 0) is None
+
+
+def test_endpoints_serve_configured_mbtiles(tmp_path, monkeypatch, http):
+    sst, currents = str(tmp_path / "sst.mbtiles"), str(tmp_path / "currents.mbtiles")
+    with MBTilesWriter(sst, name="sst", fmt="png") as db:
+        db.put(1, 0, 1, b"png-bytes")
+    with MBTilesWriter(currents, name="currents", fmt="pbf") as db:
+        db.put(1, 1, 0, b"mvt-bytes")
+    monkeypatch.setattr(tiles_cached, "SST_MBTILES", sst)
+    monkeypatch.setattr(tiles_cached, "CURRENTS_MBTILES", currents)
+
+    response = http.get("/tiles/sst/1/0/1.png")
+    assert response.status_code == 200 and response.content == b"png-bytes"
+    response = http.get("/tiles/currents/1/1/0.mvt")
+    assert response.status_code == 200 and response.content == b"mvt-bytes"
+    assert response.headers["content-type"] == "application/vnd.mapbox-vector-tile"
+    assert http.get("/tiles/currents/1/0/0.mvt").status_code == 204